@@ -25,14 +25,31 @@ logging.getLogger("primp").setLevel(logging.WARNING)  # Added for DuckDuckGo
 logging.getLogger("google").setLevel(logging.WARNING)  # Added for Google API
 
 # Now import the rest
-from rag_retriever.main import process_url, search_content
-from rag_retriever.vectorstore.store import clean_vectorstore, VectorStore
+from rag_retriever.main import (
+    ingest_github_repository,
+    ingest_local_documents,
+    process_url,
+    refresh_source,
+    resume_ingest_job,
+    search_content,
+    search_query_file,
+)
+from rag_retriever.vectorstore.store import (
+    SOURCE_MATCH_EXACT,
+    SOURCE_MATCH_MODES,
+    clean_vectorstore,
+    migrate_to_shared_store,
+    remove_per_collection_dirs,
+    VectorStore,
+)
+from rag_retriever.vectorstore.embedding_cache import (
+    EmbeddingCache,
+    DEFAULT_MAX_ENTRIES,
+)
 from rag_retriever.utils.system_validation import validate_system_dependencies, SystemValidationError
 from rag_retriever.document_processor import (
-    LocalDocumentLoader,
     ImageLoader,
     ConfluenceDocumentLoader,
-    GitHubLoader,
 )
 from rag_retriever.utils.config import initialize_user_files, config
 from rag_retriever.utils.windows import suppress_asyncio_warnings
@@ -42,6 +59,17 @@ logger = logging.getLogger(__name__)
 logger.debug("Log level set to: %s", log_level)
 
 
+def json_filter(value: str) -> dict:
+    """Parse a JSON object given as a search filter argument."""
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise argparse.ArgumentTypeError(f"invalid JSON filter: {e}")
+    if not isinstance(parsed, dict):
+        raise argparse.ArgumentTypeError("filter must be a JSON object")
+    return parsed
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create command line argument parser."""
     parser = argparse.ArgumentParser(
@@ -79,6 +107,59 @@ def create_parser() -> argparse.ArgumentParser:
         help="List all available collections and their metadata",
     )
 
+    parser.add_argument(
+        "--embedding-cache-stats",
+        action="store_true",
+        help="Show embedding cache size and hit/miss statistics",
+    )
+
+    parser.add_argument(
+        "--prune-embedding-cache",
+        type=int,
+        metavar="MAX_ENTRIES",
+        help="Prune the embedding cache to the given number of most recently used entries (0 clears it)",
+    )
+
+    parser.add_argument(
+        "--migrate-store",
+        action="store_true",
+        help="Copy per-directory collections into a single shared Chroma store (no re-embedding)",
+    )
+
+    parser.add_argument(
+        "--export-collection",
+        type=str,
+        metavar="PATH",
+        help="Export the collection selected with --collection to a snapshot directory (Parquet records + .npy vectors)",
+    )
+
+    parser.add_argument(
+        "--import-collection",
+        type=str,
+        metavar="PATH",
+        help="Import a collection snapshot without re-embedding (into --collection, or the snapshot's original collection)",
+    )
+
+    parser.add_argument(
+        "--migrate-collection",
+        type=str,
+        metavar="NAME",
+        help="Re-embed a collection's stored chunks with the configured embedding model, resuming any interrupted migration (searches keep working meanwhile; adding documents to the collection fails until it completes)",
+    )
+
+    parser.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="Split the collection selected with --collection across N shards, each searched by its own worker process; creates the collection if needed and rebalances existing chunks (0 or 1 turns sharding off)",
+    )
+
+    parser.add_argument(
+        "--shard-stats",
+        action="store_true",
+        help="Show chunk count, disk size and worker process of each shard of the collection selected with --collection",
+    )
+
     parser.add_argument(
         "--fetch-url",
         type=str,
@@ -98,6 +179,15 @@ def create_parser() -> argparse.ArgumentParser:
         help="Search query to find relevant content",
     )
 
+    parser.add_argument(
+        "--query-file",
+        type=str,
+        metavar="PATH",
+        help="Run a batch of searches from a JSONL file ('-' for stdin) with one "
+        'query per line, as a string or {"query": ..., "id": ...}; writes one '
+        "JSON result line per query",
+    )
+
     parser.add_argument(
         "--limit",
         type=int,
@@ -110,6 +200,38 @@ def create_parser() -> argparse.ArgumentParser:
         help="Minimum relevance score threshold",
     )
 
+    parser.add_argument(
+        "--search-mode",
+        choices=["vector", "lexical", "hybrid"],
+        help="Search mode: vector (semantic), lexical (keyword, no API call) or hybrid (both fused). Defaults to search.default_mode",
+    )
+
+    parser.add_argument(
+        "--rerank",
+        action="store_true",
+        default=None,
+        help="Rerank search results with a local cross-encoder (requires rag-retriever[local]). Defaults to search.rerank.enabled",
+    )
+
+    parser.add_argument(
+        "--merge-chunks",
+        action="store_true",
+        default=None,
+        help="Merge overlapping or adjacent chunks of the same source into single passages. Defaults to search.merge.enabled",
+    )
+
+    parser.add_argument(
+        "--where",
+        type=json_filter,
+        help='Metadata filter applied before ranking, as a JSON object (e.g. \'{"source_type": "pdf"}\')',
+    )
+
+    parser.add_argument(
+        "--where-document",
+        type=json_filter,
+        help='Document text filter applied before ranking, as a JSON object (e.g. \'{"$contains": "max_retries"}\')',
+    )
+
     parser.add_argument(
         "--truncate",
         action="store_true",
@@ -128,6 +250,27 @@ def create_parser() -> argparse.ArgumentParser:
         help="Clean (delete) the vector store. Use with --collection to delete a specific collection.",
     )
 
+    parser.add_argument(
+        "--delete-source",
+        type=str,
+        metavar="SOURCE",
+        help="Delete one source's chunks (URL or file path) from --collection without touching the rest",
+    )
+
+    parser.add_argument(
+        "--source-match",
+        choices=SOURCE_MATCH_MODES,
+        default=SOURCE_MATCH_EXACT,
+        help="How --delete-source matches sources: exact, prefix (e.g. a site or directory) or glob (e.g. 'https://docs.example.com/v1/*')",
+    )
+
+    parser.add_argument(
+        "--refresh-source",
+        type=str,
+        metavar="SOURCE",
+        help="Reload one web page or local file and re-embed only its changed chunks in --collection",
+    )
+
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -229,6 +372,19 @@ def create_parser() -> argparse.ArgumentParser:
         help="Specific file extensions to load (e.g., .py .md .js)",
     )
 
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="JOB_ID",
+        help="Resume an interrupted or failed ingestion job",
+    )
+
+    parser.add_argument(
+        "--list-jobs",
+        action="store_true",
+        help="List recent ingestion jobs and their progress",
+    )
+
     parser.add_argument(
         "--collection",
         type=str,
@@ -347,6 +503,7 @@ def main():
     if args.list_collections:
         store = VectorStore()
         collections = store.list_collections()
+        store.close()
         if not collections:
             print("\nNo collections found.")
             return 0
@@ -358,10 +515,229 @@ def main():
             print(f"  Last Modified: {collection['last_modified']}")
             print(f"  Documents: {collection['document_count']}")
             print(f"  Total Chunks: {collection['total_chunks']}")
+            if collection.get("shard_count"):
+                print(f"  Shards: {collection['shard_count']}")
             if collection.get("description"):
                 print(f"  Description: {collection['description']}")
         return 0
 
+    if args.embedding_cache_stats or args.prune_embedding_cache is not None:
+        cache_settings = config.vector_store.get("embedding_cache", {})
+        cache = EmbeddingCache(
+            max_entries=cache_settings.get("max_entries", DEFAULT_MAX_ENTRIES)
+        )
+        try:
+            if args.prune_embedding_cache is not None:
+                if args.prune_embedding_cache < 0:
+                    logger.error("--prune-embedding-cache must be 0 or greater")
+                    return 1
+                removed = cache.prune(args.prune_embedding_cache)
+                print(f"\nRemoved {removed} entries from the embedding cache.")
+
+            stats = cache.stats()
+            if args.json:
+                print(json.dumps(stats, indent=2))
+            else:
+                print("\nEmbedding cache:")
+                print(f"  Path: {stats['path']}")
+                print(f"  Entries: {stats['entries']} (max {stats['max_entries']})")
+                print(f"  Size: {stats['size_bytes'] / (1024 * 1024):.1f} MB")
+                print(f"  Hits: {stats['hits']}")
+                print(f"  Misses: {stats['misses']}")
+                print(f"  Hit Rate: {stats['hit_rate']:.1%}")
+                for model in stats["models"]:
+                    print(
+                        f"  Model: {model['model']} ({model['dimensions']} dims) - "
+                        f"{model['entries']} entries"
+                    )
+        finally:
+            cache.close()
+        return 0
+
+    if args.migrate_store:
+        print("\nCopying per-directory collections into the shared store...")
+        migrated = migrate_to_shared_store()
+        if not migrated:
+            print("No per-directory collections found.")
+            return 0
+        for name, count in migrated.items():
+            print(f"  {name}: {count} chunks")
+
+        response = input(
+            "\nAll collections verified. Delete the original per-directory copies? (y/N): "
+        )
+        if response.lower() == "y":
+            remove_per_collection_dirs(list(migrated))
+            print("Original collection directories removed.")
+        print(
+            "\nSet 'storage_layout: shared' under vector_store in your config "
+            "to use the migrated store."
+        )
+        return 0
+
+    if args.export_collection:
+        try:
+            store = VectorStore()
+            manifest = store.export_collection(
+                args.collection or "default", args.export_collection
+            )
+            store.close()
+            print(
+                f"\nExported {manifest['count']} chunks from collection "
+                f"'{manifest['collection']}' to {args.export_collection}"
+            )
+            return 0
+        except Exception as e:
+            logger.error(f"Error exporting collection: {str(e)}")
+            return 1
+
+    if args.import_collection:
+        try:
+            store = VectorStore()
+            count = store.import_collection(
+                args.import_collection, collection_name=args.collection
+            )
+            store.close()
+            print(f"\nImported {count} chunks from {args.import_collection}")
+            return 0
+        except Exception as e:
+            logger.error(f"Error importing collection: {str(e)}")
+            return 1
+
+    if args.migrate_collection:
+        try:
+            store = VectorStore()
+            result = store.migrate_collection(args.migrate_collection)
+            store.close()
+        except KeyboardInterrupt:
+            print(
+                "\nMigration interrupted. Progress was saved; run the same "
+                "command again to resume."
+            )
+            return 1
+        except Exception as e:
+            logger.error(f"Error migrating collection: {str(e)}")
+            return 1
+        if result["status"] == "current":
+            print(
+                f"\nCollection '{args.migrate_collection}' already uses "
+                f"{store.embedding_spec} embeddings"
+            )
+        else:
+            print(
+                f"\nMigrated {result['total']} chunks of collection "
+                f"'{args.migrate_collection}' to {store.embedding_spec} embeddings"
+            )
+        return 0
+
+    if args.shards is not None:
+        collection_name = args.collection or "default"
+        try:
+            store = VectorStore()
+            result = store.reshard_collection(collection_name, args.shards)
+            store.close()
+        except Exception as e:
+            logger.error(f"Error resharding collection: {str(e)}")
+            return 1
+        if result["status"] == "current":
+            print(
+                f"\nCollection '{collection_name}' already has "
+                f"{result['shards']} shards"
+            )
+        else:
+            print(
+                f"\nCollection '{collection_name}' now has {result['shards']} "
+                f"shards ({result['chunks']} chunks)"
+            )
+        return 0
+
+    if args.shard_stats:
+        collection_name = args.collection or "default"
+        try:
+            store = VectorStore()
+            stats = store.get_shard_stats(collection_name)
+            store.close()
+        except Exception as e:
+            logger.error(f"Error reading shard stats: {str(e)}")
+            return 1
+        print(f"\nShards of collection '{collection_name}':")
+        for shard in stats:
+            print(
+                f"  Shard {shard['shard']}: {shard['chunks']} chunks, "
+                f"{shard['size_bytes'] / 1024 / 1024:.1f} MB, worker pid {shard['pid']}"
+            )
+        return 0
+
+    if args.delete_source:
+        print(
+            f"\nWARNING: This will delete the chunks of sources matching "
+            f"'{args.delete_source}' ({args.source_match}) from collection "
+            f"'{args.collection or 'default'}'."
+        )
+        response = input("Are you sure you want to proceed? (y/N): ")
+        if response.lower() != "y":
+            logger.info("Operation cancelled")
+            return 0
+        try:
+            store = VectorStore(collection_name=args.collection)
+            result = store.delete_source(args.delete_source, match=args.source_match)
+            store.close()
+            print(
+                f"\nDeleted {result['chunks']} chunks from {result['sources']} sources"
+            )
+            return 0
+        except Exception as e:
+            logger.error(f"Error deleting source: {str(e)}")
+            return 1
+
+    if args.refresh_source:
+        try:
+            result = refresh_source(args.refresh_source, collection_name=args.collection)
+            print(
+                f"\nRefreshed {args.refresh_source}: {result['chunks']} chunks stored "
+                f"({result['embedded']} embedded), {result['deleted']} deleted"
+            )
+            return 0
+        except Exception as e:
+            logger.error(f"Error refreshing source: {str(e)}")
+            return 1
+
+    if args.list_jobs:
+        store = VectorStore()
+        jobs = store.ingest_journal.list_jobs()
+        store.close()
+        if not jobs:
+            print("\nNo ingestion jobs found")
+            return 0
+        print("\nIngestion jobs:")
+        for job in jobs:
+            print(
+                f"  {job['id']}  {job['status']:<11}  {job['kind']:<9}  "
+                f"{job['target']}"
+            )
+            print(
+                f"      Collection: {job['collection']}, sources stored: "
+                f"{job['stored_sources']}/{job['sources']}, batches stored: "
+                f"{job['stored_batches']}, attempts: {job['attempts']}, "
+                f"updated: {job['updated_at']}"
+            )
+            if job["error"]:
+                print(f"      Error: {job['error']}")
+        return 0
+
+    if args.resume:
+        try:
+            return resume_ingest_job(args.resume, verbose=args.verbose)
+        except KeyboardInterrupt:
+            print(
+                f"\nIngestion interrupted. Run 'rag-retriever --resume "
+                f"{args.resume}' to continue."
+            )
+            return 1
+        except Exception as e:
+            logger.error(f"Error resuming ingestion job: {str(e)}")
+            return 1
+
     if args.clean:
         if args.collection:
             clean_vectorstore(collection_name=args.collection)
@@ -431,6 +807,7 @@ def main():
                     return 1
 
             store.add_documents(documents)
+            store.close()
             logger.info(f"Successfully ingested {len(documents)} image(s)")
             return 0
 
@@ -441,19 +818,10 @@ def main():
     # Handle local document ingestion
     if args.ingest_file or args.ingest_directory:
         try:
-            loader = LocalDocumentLoader(
-                config=config._config, show_progress=True, use_multithreading=True
+            ingest_local_documents(
+                args.ingest_file or args.ingest_directory,
+                collection_name=args.collection,
             )
-            store = VectorStore(collection_name=args.collection)
-
-            if args.ingest_file:
-                logger.info(f"Loading file: {args.ingest_file}")
-                documents = loader.load_file(args.ingest_file)
-            else:
-                logger.info(f"Loading directory: {args.ingest_directory}")
-                documents = loader.load_directory(args.ingest_directory)
-
-            store.add_documents(documents)
             logger.info("Successfully ingested local documents")
             return 0
 
@@ -470,6 +838,7 @@ def main():
                 space_key=args.space_key, parent_id=args.parent_id
             )
             store.add_documents(documents)
+            store.close()
             logger.info("Successfully loaded Confluence content")
             return 0
 
@@ -480,25 +849,13 @@ def main():
     # Handle GitHub repository loading
     if args.github_repo:
         try:
-            loader = GitHubLoader(config=config._config)
-            store = VectorStore(collection_name=args.collection)
-
-            # Create file filter if extensions specified
-            file_filter = None
-            if args.file_extensions:
-                file_filter = lambda x: any(
-                    x.endswith(ext) for ext in args.file_extensions
-                )
-
-            logger.info(f"Loading GitHub repository: {args.github_repo}")
-            documents = loader.load_repository(
-                repo_url=args.github_repo, branch=args.branch, file_filter=file_filter
-            )
-
-            store.add_documents(documents)
-            logger.info(
-                f"Successfully loaded {len(documents)} documents from repository"
+            chunks = ingest_github_repository(
+                args.github_repo,
+                branch=args.branch,
+                file_extensions=args.file_extensions,
+                collection_name=args.collection,
             )
+            logger.info(f"Successfully loaded repository ({chunks} chunks)")
             return 0
 
         except Exception as e:
@@ -519,6 +876,21 @@ def main():
                 collection_name=args.collection,
             )
 
+        if args.query_file:
+            return search_query_file(
+                args.query_file,
+                limit=args.limit,
+                score_threshold=args.score_threshold,
+                full_content=not args.truncate,
+                collection_name=args.collection,
+                search_all_collections=args.search_all_collections,
+                search_mode=args.search_mode,
+                rerank=args.rerank,
+                where=args.where,
+                where_document=args.where_document,
+                merge=args.merge_chunks,
+            )
+
         if args.query:
             return search_content(
                 args.query,
@@ -529,6 +901,11 @@ def main():
                 verbose=args.verbose,
                 collection_name=args.collection,
                 search_all_collections=args.search_all_collections,
+                search_mode=args.search_mode,
+                rerank=args.rerank,
+                where=args.where,
+                where_document=args.where_document,
+                merge=args.merge_chunks,
             )
 
         # No command specified, show help
@@ -3,7 +3,7 @@
 import time
 import logging
 import asyncio
-from typing import List, Set, Dict, Any
+from typing import AsyncIterator, List, Set, Dict, Any
 from urllib.parse import urljoin, urlparse
 
 from langchain_core.documents import Document
@@ -135,20 +135,22 @@ class Crawl4AICrawler:
             logger.error(f"Error in crawl_page: {str(e)}")
             raise
 
-    async def crawl_website(self, base_url: str, max_depth: int = 2, max_pages: int = 50) -> List[Document]:
+    async def iter_crawl_website(
+        self, base_url: str, max_depth: int = 2, max_pages: int = 50
+    ) -> AsyncIterator[Document]:
         """
-        Crawl a website recursively and return a list of Documents.
-        
-        This method matches the PlaywrightCrawler interface for easy replacement.
+        Crawl a website recursively, yielding each page as a Document when it is crawled.
+
+        The iterator can be passed to ``VectorStore.aadd_documents`` so pages
+        are indexed while the crawl continues.
         """
         logger.info(f"Starting website crawl: {base_url} (max_depth: {max_depth})")
         
-        documents = []
         config = self._create_crawler_config(max_depth=max_depth)
+        page_count = 0
         
         try:
             async with AsyncWebCrawler() as crawler:
-                page_count = 0
                 async for result in await crawler.arun(base_url, config=config):
                     if page_count >= max_pages:
                         logger.info(f"Reached max pages limit: {max_pages}")
@@ -170,29 +172,37 @@ class Crawl4AICrawler:
                                 "depth": getattr(result, 'depth', 0) or 0  # If available
                             }
                             
-                            document = Document(
-                                page_content=content,
-                                metadata=metadata
-                            )
-                            documents.append(document)
                             self.visited_urls.add(result.url)
                             page_count += 1
-                            
+                            self._total_chunks = page_count
                             logger.info(f"✓ Crawled: {result.url} ({len(content)} chars)")
+                            
+                            yield Document(
+                                page_content=content,
+                                metadata=metadata
+                            )
                         else:
                             logger.warning(f"✗ No content: {result.url}")
                     else:
                         logger.error(f"✗ Failed: {result.url}")
             
-            self._total_chunks = len(documents)
-            logger.info(f"Website crawl completed: {len(documents)} pages")
-            
-            return documents
+            logger.info(f"Website crawl completed: {page_count} pages")
             
         except Exception as e:
             logger.error(f"Error in crawl_website: {str(e)}")
             raise CrawlerError(f"Website crawl failed: {str(e)}")
 
+    async def crawl_website(self, base_url: str, max_depth: int = 2, max_pages: int = 50) -> List[Document]:
+        """
+        Crawl a website recursively and return a list of Documents.
+        
+        This method matches the PlaywrightCrawler interface for easy replacement.
+        """
+        return [
+            document
+            async for document in self.iter_crawl_website(base_url, max_depth, max_pages)
+        ]
+
     def get_stats(self) -> Dict[str, Any]:
         """Get crawler statistics."""
         return {
@@ -5,7 +5,7 @@ import random
 import logging
 import asyncio
 import platform
-from typing import List, Set, Dict, Any
+from typing import AsyncIterator, List, Set, Dict, Any
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
@@ -277,22 +277,21 @@ class PlaywrightCrawler:
                 await page.close()
             raise PageLoadError(f"Failed to load page {url}: {str(e)}")
 
-    async def _crawl_recursive(
+    async def _iter_recursive(
         self, url: str, current_depth: int, max_depth: int
-    ) -> List[Document]:
-        """Recursively crawl URLs up to max_depth."""
+    ) -> AsyncIterator[Document]:
+        """Recursively crawl URLs up to max_depth, yielding pages as they load."""
         logger.debug(f"Crawling {url} at depth {current_depth}/{max_depth}")
 
         if current_depth > max_depth:
             logger.debug(f"Reached max depth at {url}")
-            return []
+            return
 
         if url in self.visited_urls:
             logger.debug(f"Already visited {url}")
-            return []
+            return
 
         self.visited_urls.add(url)
-        documents = []
 
         try:
             content = await self.get_page_content(url)
@@ -301,56 +300,67 @@ class PlaywrightCrawler:
                 links = self._extract_links(content, url)
 
             cleaned_text = self.content_cleaner.clean(content)
-
-            if cleaned_text.strip():
-                doc = Document(
-                    page_content=cleaned_text,
-                    metadata={
-                        "source": url,
-                        "depth": current_depth,
-                    },
-                )
-                documents.append(doc)
-                logger.info(f"Processed document: {url}")
-
-                if current_depth < max_depth and links:
-                    logger.debug(f"Following {len(links)} links from {url}")
-                    for link in links:
-                        sub_docs = await self._crawl_recursive(
-                            link, current_depth + 1, max_depth
-                        )
-                        documents.extend(sub_docs)
-
-            return documents
-
         except (PageLoadError, ContentExtractionError) as e:
             logger.error(f"Error crawling {url}: {str(e)}")
-            return documents
+            return
         except Exception as e:
             logger.error(f"Unexpected error crawling {url}: {str(e)}")
-            return documents
+            return
+
+        if cleaned_text.strip():
+            logger.info(f"Processed document: {url}")
+            yield Document(
+                page_content=cleaned_text,
+                metadata={
+                    "source": url,
+                    "depth": current_depth,
+                },
+            )
 
-    async def crawl(self, url: str, max_depth: int = 2) -> List[Document]:
-        """Crawl a URL and its linked pages up to max_depth."""
+            if current_depth < max_depth and links:
+                logger.debug(f"Following {len(links)} links from {url}")
+                for link in links:
+                    async for doc in self._iter_recursive(
+                        link, current_depth + 1, max_depth
+                    ):
+                        yield doc
+
+    async def _crawl_recursive(
+        self, url: str, current_depth: int, max_depth: int
+    ) -> List[Document]:
+        """Recursively crawl URLs up to max_depth."""
+        return [
+            doc async for doc in self._iter_recursive(url, current_depth, max_depth)
+        ]
+
+    async def _close_browser(self) -> None:
+        """Close the browser if one is open."""
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+            self._context = None
+
+    async def iter_crawl(self, url: str, max_depth: int = 2) -> AsyncIterator[Document]:
+        """Crawl a URL and its linked pages, yielding each page as it is crawled.
+
+        The iterator can be passed to ``VectorStore.aadd_documents`` so pages
+        are indexed while the crawl continues.
+        """
         logger.info(f"Starting crawl of {url}")
         self.visited_urls.clear()
 
+        count = 0
         try:
-            documents = await self._crawl_recursive(url, 0, max_depth)
-            logger.info(f"Completed crawl: processed {len(documents)} documents")
-
-            if self._browser:
-                await self._browser.close()
-                self._browser = None
-                self._context = None
+            async for doc in self._iter_recursive(url, 0, max_depth):
+                count += 1
+                yield doc
+            logger.info(f"Completed crawl: processed {count} documents")
+        finally:
+            await self._close_browser()
 
-            return documents
-        except Exception as e:
-            if self._browser:
-                await self._browser.close()
-                self._browser = None
-                self._context = None
-            raise e
+    async def crawl(self, url: str, max_depth: int = 2) -> List[Document]:
+        """Crawl a URL and its linked pages up to max_depth."""
+        return [doc async for doc in self.iter_crawl(url, max_depth)]
 
     def run_crawl(self, url: str, max_depth: int = 2) -> List[Document]:
         """Synchronous wrapper for the async crawl method."""
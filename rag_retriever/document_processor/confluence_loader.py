@@ -66,6 +66,9 @@ class ConfluenceDocumentLoader:
                 ocr_languages="eng",  # Default to English for any image processing
             )
 
+            for document in documents:
+                document.metadata["source_type"] = "confluence"
+
             logger.info(f"Successfully loaded {len(documents)} Confluence pages")
             return documents
 
@@ -2,7 +2,7 @@
 
 import logging
 import tempfile
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Iterator, List, Optional, Callable
 from pathlib import Path
 
 from git import Repo
@@ -73,21 +73,24 @@ class GitHubLoader:
         )  # Convert to bytes
         self.default_branch = self.config.get("default_branch", "main")
 
-    def load_repository(
+    def lazy_load_repository(
         self,
         repo_url: str,
         branch: Optional[str] = None,
         file_filter: Optional[Callable[[str], bool]] = None,
-    ) -> List[Document]:
-        """Load documents from a GitHub repository.
+    ) -> Iterator[Document]:
+        """Load documents from a GitHub repository one file at a time.
+
+        The repository is cloned into a temporary directory that is removed
+        once the iterator is exhausted or closed.
 
         Args:
             repo_url (str): URL of the GitHub repository.
             branch (str, optional): Branch to clone. Defaults to the value in config.
             file_filter (callable, optional): Function to filter files. Defaults to None.
 
-        Returns:
-            List[Document]: List of documents from the repository.
+        Yields:
+            Document: Documents from the repository.
         """
         logger.info(f"Loading GitHub repository: {repo_url}")
 
@@ -125,11 +128,8 @@ class GitHubLoader:
                     repo_path=temp_dir, branch=target_branch, file_filter=file_filter
                 )
 
-                # Load and process documents
-                documents = loader.load()
-
-                # Update metadata for each document
-                for doc in documents:
+                # Load documents lazily and update their metadata
+                for doc in loader.lazy_load():
                     doc.metadata.update(
                         {
                             "source": repo_url,
@@ -137,9 +137,26 @@ class GitHubLoader:
                             "file_path": doc.metadata.get("file_path", "unknown"),
                         }
                     )
-
-                return documents
+                    yield doc
 
         except Exception as e:
             logger.error(f"Error loading GitHub repository: {str(e)}")
             raise
+
+    def load_repository(
+        self,
+        repo_url: str,
+        branch: Optional[str] = None,
+        file_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[Document]:
+        """Load documents from a GitHub repository.
+
+        Args:
+            repo_url (str): URL of the GitHub repository.
+            branch (str, optional): Branch to clone. Defaults to the value in config.
+            file_filter (callable, optional): Function to filter files. Defaults to None.
+
+        Returns:
+            List[Document]: List of documents from the repository.
+        """
+        return list(self.lazy_load_repository(repo_url, branch, file_filter))
@@ -1,7 +1,7 @@
 """Module for loading local documents into the vector store."""
 
 from pathlib import Path
-from typing import List, Optional, Iterator, Dict, Any, Tuple
+from typing import List, Optional, Iterator, Dict, Any, Set, Tuple
 import logging
 import os
 import tempfile
@@ -373,18 +373,26 @@ class LocalDocumentLoader:
 
         raise ValueError(f"Unhandled file type: {suffix}")
 
-    def load_directory(
-        self, directory_path: str, glob_pattern: str = "**/*.[mp][dt][fd]"
-    ) -> List[Document]:
-        """Load all supported documents from a directory.
+    def lazy_load_directory(
+        self,
+        directory_path: str,
+        glob_pattern: str = "**/*.[mp][dt][fd]",
+        exclude: Optional[Set[str]] = None,
+    ) -> Iterator[Document]:
+        """Load supported documents from a directory one file at a time.
+
+        Files are discovered and loaded as the iterator is consumed, so the
+        result can be passed straight to ``VectorStore.add_documents`` without
+        holding the whole directory in memory.
 
         Args:
             directory_path: Path to the directory to load files from
             glob_pattern: Pattern to match files against. Default matches .md, .txt, and .pdf files.
-                        Use "**/*.txt" for text files, "**/*.pdf" for PDFs, or "**/*.md" for markdown.
+            exclude: Optional file paths to skip without loading them, as they
+                     appear in the ``source`` metadata of their documents
 
-        Returns:
-            List of Document objects
+        Yields:
+            Document objects
 
         Raises:
             FileNotFoundError: If the directory doesn't exist
@@ -395,26 +403,40 @@ class LocalDocumentLoader:
 
         logger.info(f"Loading documents from directory: {directory_path}")
 
-        # First check if there are any matching files
-        matching_files = list(path.glob(glob_pattern))
-        if not matching_files:
-            logger.warning(
-                f"No matching files found in {directory_path} using pattern {glob_pattern}"
-            )
-            return []
-
-        logger.debug(
-            f"Found {len(matching_files)} matching files: {[f.name for f in matching_files]}"
-        )
-
         # Process each file individually to handle different loaders
-        documents = []
-        for file_path in matching_files:
+        file_count = 0
+        for file_path in path.glob(glob_pattern):
+            file_count += 1
+            if exclude and str(file_path) in exclude:
+                logger.debug(f"Skipping excluded file: {file_path.name}")
+                continue
+            logger.debug(f"Loading matching file: {file_path.name}")
             try:
                 file_docs = self.load_file(str(file_path))
-                documents.extend(file_docs)
             except Exception as e:
                 logger.error(f"Error loading file {file_path}: {str(e)}")
                 continue
+            yield from file_docs
 
-        return documents
+        if not file_count:
+            logger.warning(
+                f"No matching files found in {directory_path} using pattern {glob_pattern}"
+            )
+
+    def load_directory(
+        self, directory_path: str, glob_pattern: str = "**/*.[mp][dt][fd]"
+    ) -> List[Document]:
+        """Load all supported documents from a directory.
+
+        Args:
+            directory_path: Path to the directory to load files from
+            glob_pattern: Pattern to match files against. Default matches .md, .txt, and .pdf files.
+                        Use "**/*.txt" for text files, "**/*.pdf" for PDFs, or "**/*.md" for markdown.
+
+        Returns:
+            List of Document objects
+
+        Raises:
+            FileNotFoundError: If the directory doesn't exist
+        """
+        return list(self.lazy_load_directory(directory_path, glob_pattern))
@@ -9,6 +9,8 @@ import platform
 from pathlib import Path
 from datetime import datetime
 import asyncio
+import itertools
+import sys
 import warnings
 
 from playwright.async_api import Error as PlaywrightError
@@ -22,7 +24,17 @@ try:
 except ImportError:
     CRAWL4AI_AVAILABLE = False
 from rag_retriever.search.searcher import Searcher
-from rag_retriever.vectorstore.store import VectorStore, get_vectorstore_path
+from rag_retriever.vectorstore.store import (
+    VectorStore,
+    get_vectorstore_path,
+    infer_source_type,
+)
+from rag_retriever.vectorstore.ingest_journal import JOB_FAILED, JOB_RUNNING, IngestJob
+from rag_retriever.document_processor import (
+    GitHubLoader,
+    ImageLoader,
+    LocalDocumentLoader,
+)
 from rag_retriever.utils.config import (
     config,
     mask_api_key,
@@ -99,14 +111,19 @@ def process_url(
     max_depth: int = 2,
     verbose: bool = True,
     collection_name: Optional[str] = None,
+    job: Optional[IngestJob] = None,
 ) -> int:
     """Process a URL, extracting and indexing its content.
 
+    Indexing is recorded as an ingestion job, so an interrupted run can be
+    resumed with :func:`resume_ingest_job`.
+
     Args:
         url: URL to process
         max_depth: Maximum depth for recursive crawling
         verbose: Whether to show verbose output
         collection_name: Optional name of collection to use (defaults to 'default')
+        job: Optional job being resumed (a new job is started otherwise)
     """
     # Configure asyncio debug mode and logging
     logging.getLogger("asyncio").setLevel(logging.DEBUG)
@@ -245,7 +262,14 @@ def process_url(
                             )
 
                     logger.info("\nIndexing documents...")
-                    store.add_documents(documents)
+                    ingest_job = job or store.ingest_journal.start_job(
+                        "url",
+                        url,
+                        store.current_collection,
+                        {"max_depth": max_depth},
+                    )
+                    with ingest_job:
+                        store.add_documents(documents, job=ingest_job)
                     logger.info("Indexing complete.")
 
                     return 0
@@ -288,6 +312,8 @@ def process_url(
             return 1
 
         finally:
+            if "store" in locals():
+                store.close()
             if "crawler" in locals():
                 logger.debug("Cleaning up browser resources...")
                 if verbose:
@@ -311,6 +337,224 @@ def process_url(
     return _process()
 
 
+def ingest_local_documents(
+    path: str,
+    collection_name: Optional[str] = None,
+    job: Optional[IngestJob] = None,
+) -> int:
+    """Load a local file or directory and index its documents.
+
+    Indexing is recorded as an ingestion job. When a directory job is
+    resumed, files it already stored are skipped without loading them.
+
+    Args:
+        path: Path of the file or directory to ingest
+        collection_name: Optional name of collection to use (defaults to 'default')
+        job: Optional job being resumed (a new job is started otherwise)
+
+    Returns:
+        Number of chunks stored
+    """
+    loader = LocalDocumentLoader(
+        config=config._config, show_progress=True, use_multithreading=True
+    )
+    store = VectorStore(collection_name=collection_name)
+    kind = "directory" if Path(path).is_dir() else "file"
+    job = job or store.ingest_journal.start_job(kind, path, store.current_collection)
+
+    try:
+        with job:
+            if kind == "file":
+                logger.info(f"Loading file: {path}")
+                documents = loader.load_file(path)
+            else:
+                logger.info(f"Loading directory: {path}")
+                documents = loader.lazy_load_directory(
+                    path, exclude=job.stored_sources
+                )
+                if job.stored_sources:
+                    first = next(documents, None)
+                    if first is None:
+                        logger.info("All files were stored by an earlier run")
+                        return 0
+                    documents = itertools.chain([first], documents)
+            return store.add_documents(documents, job=job)
+    finally:
+        store.close()
+
+
+def ingest_github_repository(
+    repo_url: str,
+    branch: Optional[str] = None,
+    file_extensions: Optional[List[str]] = None,
+    collection_name: Optional[str] = None,
+    job: Optional[IngestJob] = None,
+) -> int:
+    """Clone a GitHub repository and index its files.
+
+    Indexing is recorded as an ingestion job. A resumed job loads the
+    repository again, but only embeds chunks that were not stored yet.
+
+    Args:
+        repo_url: URL of the repository
+        branch: Optional branch to load
+        file_extensions: Optional file extensions to load (e.g. [".py", ".md"])
+        collection_name: Optional name of collection to use (defaults to 'default')
+        job: Optional job being resumed (a new job is started otherwise)
+
+    Returns:
+        Number of chunks stored
+    """
+    loader = GitHubLoader(config=config._config)
+    store = VectorStore(collection_name=collection_name)
+    job = job or store.ingest_journal.start_job(
+        "github",
+        repo_url,
+        store.current_collection,
+        {"branch": branch, "file_extensions": file_extensions},
+    )
+
+    file_filter = None
+    if file_extensions:
+        file_filter = lambda x: any(x.endswith(ext) for ext in file_extensions)
+
+    try:
+        with job:
+            logger.info(f"Loading GitHub repository: {repo_url}")
+            documents = loader.lazy_load_repository(
+                repo_url=repo_url, branch=branch, file_filter=file_filter
+            )
+            return store.add_documents(documents, job=job)
+    finally:
+        store.close()
+
+
+def resume_ingest_job(job_id: str, verbose: bool = True) -> int:
+    """Run an interrupted or failed ingestion job again.
+
+    Sources the job already stored are skipped, and chunks stored by the
+    batches it committed are not embedded again.
+
+    Args:
+        job_id: Id of the job to resume
+        verbose: Whether to show verbose output
+
+    Returns:
+        0 if the job completed, 1 otherwise
+
+    Raises:
+        ValueError: If the job does not exist or has already completed
+    """
+    store = VectorStore()
+    journal = store.ingest_journal
+    store.close()
+    job = journal.resume_job(job_id)
+    logger.info(
+        "Resuming %s ingestion of %s into collection '%s' "
+        "(%d sources already stored)",
+        job.kind,
+        job.target,
+        job.collection,
+        len(job.stored_sources),
+    )
+
+    try:
+        if job.kind == "url":
+            result = process_url(
+                job.target,
+                max_depth=job.options.get("max_depth", 2),
+                verbose=verbose,
+                collection_name=job.collection,
+                job=job,
+            )
+        elif job.kind in ("file", "directory"):
+            ingest_local_documents(
+                job.target, collection_name=job.collection, job=job
+            )
+            result = 0
+        elif job.kind == "github":
+            ingest_github_repository(
+                job.target,
+                branch=job.options.get("branch"),
+                file_extensions=job.options.get("file_extensions"),
+                collection_name=job.collection,
+                job=job,
+            )
+            result = 0
+        else:
+            raise ValueError(f"Unknown ingestion job kind: {job.kind}")
+    finally:
+        # The job is still running if it failed before indexing started
+        if journal.get_job(job_id)["status"] == JOB_RUNNING:
+            journal.set_job_status(job_id, JOB_FAILED, "Failed before indexing")
+
+    if result == 0 and job.failed_batches:
+        return 1
+    return result
+
+
+def refresh_source(
+    source: str,
+    collection_name: Optional[str] = None,
+) -> Dict[str, int]:
+    """Reload a single source and update its stored chunks.
+
+    Web pages are fetched again (without following links), and local files
+    and images are reloaded from disk. A local file that no longer exists is
+    deleted from the collection. Only new or changed chunks are embedded.
+
+    Args:
+        source: Source to refresh, as stored in chunk metadata (URL or file path)
+        collection_name: Optional name of collection to use (defaults to 'default')
+
+    Returns:
+        Dictionary with the number of chunks stored, embedded and deleted
+
+    Raises:
+        ValueError: If the source is not in the collection, cannot be
+                    reloaded on its own (GitHub and Confluence content) or
+                    returned no content
+    """
+    store = VectorStore(collection_name=collection_name)
+    try:
+        metadata = store.get_source_metadata(source)
+        if metadata is None:
+            raise ValueError(
+                f"Source '{source}' not found in collection "
+                f"'{store.current_collection}'"
+            )
+
+        source_type = infer_source_type(metadata)
+        if source_type in ("github", "confluence"):
+            raise ValueError(
+                "GitHub and Confluence content cannot be refreshed page by page; "
+                "re-run its ingestion instead, which only re-embeds changed chunks"
+            )
+
+        is_url = source.startswith(("http://", "https://"))
+        missing = not is_url and not Path(source).exists()
+        if missing:
+            logger.info("Source '%s' no longer exists, deleting it", source)
+            documents = []
+        elif source_type == "image":
+            image_loader = ImageLoader(config=config._config, show_progress=False)
+            image = image_loader.load_image(source)
+            documents = [image] if image else []
+        elif is_url:
+            documents = get_crawler().run_crawl(source, max_depth=0)
+        else:
+            loader = LocalDocumentLoader(config=config._config, show_progress=False)
+            documents = loader.load_file(source)
+
+        # Keep stored chunks when a source that still exists returned nothing
+        if not documents and not missing:
+            raise ValueError(f"No content could be loaded from '{source}'")
+
+        return store.refresh_source(source, documents)
+    finally:
+        store.close()
+
+
 def search_content(
     query: str,
     limit: Optional[int] = None,
@@ -320,6 +564,11 @@ def search_content(
     verbose: bool = False,
     collection_name: Optional[str] = None,
     search_all_collections: bool = False,
+    search_mode: Optional[str] = None,
+    rerank: Optional[bool] = None,
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, Any]] = None,
+    merge: Optional[bool] = None,
 ) -> int:
     """Search indexed content.
 
@@ -332,6 +581,11 @@ def search_content(
         verbose: Whether to show verbose output
         collection_name: Optional name of collection to search in (defaults to 'default')
         search_all_collections: Whether to search across all collections
+        search_mode: Optional search mode ("vector", "lexical" or "hybrid")
+        rerank: Whether to rerank results with a cross-encoder (defaults to search.rerank.enabled)
+        where: Optional Chroma metadata filter, e.g. {"source_type": "pdf"}
+        where_document: Optional Chroma document filter, e.g. {"$contains": "retry"}
+        merge: Whether to merge adjacent chunks of the same source (defaults to search.merge.enabled)
     """
     # Use default values from config if not specified
     if limit is None:
@@ -356,6 +610,7 @@ def search_content(
     logger.debug("- API key: %s", mask_api_key(api_key if api_key else ""))
     logger.debug("- Config file: %s", config.config_path)
 
+    searcher = None
     try:
         logger.info("\nStarting content search...")
         searcher = Searcher(collection_name=collection_name)
@@ -364,6 +619,15 @@ def search_content(
             limit=limit,
             score_threshold=score_threshold,
             search_all_collections=search_all_collections,
+            mode=search_mode,
+            rerank=rerank,
+            where=where,
+            where_document=where_document,
+            merge=merge,
+        )
+        logger.debug(
+            "Search timings (ms): %s",
+            ", ".join(f"{k}={v:.1f}" for k, v in searcher.last_timings.items()),
         )
 
         if not results:
@@ -385,3 +649,97 @@ def search_content(
     except Exception as e:
         logger.error("Error searching content: %s", str(e))
         return 1
+    finally:
+        if searcher is not None:
+            searcher.close()
+
+
+def search_query_file(
+    path: str,
+    limit: Optional[int] = None,
+    score_threshold: Optional[float] = None,
+    full_content: bool = True,
+    collection_name: Optional[str] = None,
+    search_all_collections: bool = False,
+    search_mode: Optional[str] = None,
+    rerank: Optional[bool] = None,
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, Any]] = None,
+    merge: Optional[bool] = None,
+) -> int:
+    """Run a batch of searches from a JSONL file, printing JSONL results.
+
+    Each input line is a JSON string or an object with a ``query`` and an
+    optional ``id``. Each output line holds the ``id`` (the line number when
+    not given), the ``query`` and its ``results``, in input order. All
+    queries are embedded in a single request and searched concurrently.
+    The remaining arguments are as for :func:`search_content` and apply to
+    every query.
+
+    Args:
+        path: Path of the JSONL file, or "-" to read standard input
+        full_content: Whether to return full content (otherwise the first
+                      200 characters of each result)
+    """
+    searcher = None
+    try:
+        if path == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = Path(path).read_text(encoding="utf-8").splitlines()
+
+        ids, queries = [], []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, str):
+                entry = {"query": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("query"), str):
+                raise ValueError(
+                    f"Line {number}: expected a query string or an object with a "
+                    "'query' string"
+                )
+            ids.append(entry.get("id", number))
+            queries.append(entry["query"])
+
+        searcher = Searcher(collection_name=collection_name)
+        all_results = searcher.search_many(
+            queries,
+            limit=limit,
+            score_threshold=score_threshold,
+            search_all_collections=search_all_collections,
+            mode=search_mode,
+            rerank=rerank,
+            where=where,
+            where_document=where_document,
+            merge=merge,
+        )
+        logger.info(
+            "Searched %d queries in %.1f ms",
+            len(queries),
+            searcher.last_timings.get("total_ms", 0.0),
+        )
+        cache_stats = searcher.result_cache_stats()
+        if cache_stats["enabled"]:
+            logger.info(
+                "Result cache: %d hits, %d misses, %.1f ms saved",
+                cache_stats["hits"],
+                cache_stats["misses"],
+                cache_stats["saved_ms"],
+            )
+
+        for id_, query, results in zip(ids, queries, all_results):
+            formatted = [searcher.format_result_json(r) for r in results]
+            if not full_content:
+                for item in formatted:
+                    if len(item["content"]) > 200:
+                        item["content"] = item["content"][:200] + "..."
+            print(json.dumps({"id": id_, "query": query, "results": formatted}))
+        return 0
+    except Exception as e:
+        logger.error("Error running batch search: %s", str(e))
+        return 1
+    finally:
+        if searcher is not None:
+            searcher.close()
@@ -18,7 +18,7 @@ from starlette.applications import Starlette
 from starlette.routing import Mount, Route
 import uvicorn
 
-from rag_retriever.main import search_content, process_url
+from rag_retriever.main import search_content, process_url, refresh_source
 from rag_retriever.vectorstore.store import VectorStore
 from rag_retriever.search import web_search as search_module
 from rag_retriever.search.searcher import Searcher
@@ -103,6 +103,7 @@ def register_tools(mcp_server: FastMCP) -> None:
             # Create a VectorStore instance to access collection information
             store = VectorStore()
             collections = store.list_collections()
+            store.close()
             
             if not collections:
                 return [types.TextContent(type="text", text="No collections found in the vector store.")]
@@ -194,7 +195,7 @@ def register_tools(mcp_server: FastMCP) -> None:
 
     @mcp_server.tool(
         name="vector_search",
-        description="Search indexed content using semantic similarity. Takes a query string, optional result limit (default 8), optional score threshold (default 0.3), optional collection name (defaults to 'default'), and optional search_all_collections flag. Returns relevant documents with scores and source information.",
+        description="Search indexed content using semantic similarity. Takes a query string, optional result limit (default 8), optional score threshold (default 0.3), optional collection name (defaults to 'default'), optional search_all_collections flag, and optional search_mode ('vector', 'lexical' for exact keywords/identifiers, or 'hybrid'), optional rerank flag to reorder results with a cross-encoder, optional merge_chunks flag to combine neighbouring chunks of a page, and optional where/where_document filters (e.g. {\"source_type\": \"pdf\"}) applied before ranking. Returns relevant documents with scores and source information.",
     )
     async def query(
         query_text: str = Field(description="The search query text"),
@@ -218,6 +219,26 @@ def register_tools(mcp_server: FastMCP) -> None:
             description="Whether to search across all collections",
             default=False,
         ),
+        search_mode: Optional[str] = Field(
+            description="Search mode: 'vector' (semantic), 'lexical' (keyword match for exact identifiers, error codes or config keys) or 'hybrid' (both fused)",
+            default=None,
+        ),
+        rerank: Optional[bool] = Field(
+            description="Whether to rerank results with a local cross-encoder for higher precision (defaults to the configured setting)",
+            default=None,
+        ),
+        where: Optional[Dict] = Field(
+            description="Metadata filter applied before ranking, using Chroma syntax, e.g. {\"source_type\": \"pdf\"} or {\"ingested_at\": {\"$gte\": 1735689600}}",
+            default=None,
+        ),
+        where_document: Optional[Dict] = Field(
+            description="Document text filter applied before ranking, e.g. {\"$contains\": \"max_retries\"}",
+            default=None,
+        ),
+        merge_chunks: Optional[bool] = Field(
+            description="Whether to merge overlapping or adjacent chunks of the same source into single passages, returning more distinct content per result (defaults to the configured setting)",
+            default=None,
+        ),
     ) -> list[types.TextContent]:
         """Search the vector store for relevant content."""
         try:
@@ -263,6 +284,11 @@ def register_tools(mcp_server: FastMCP) -> None:
                     verbose=True,
                     collection_name=collection_name,
                     search_all_collections=search_all_collections,
+                    search_mode=search_mode,
+                    rerank=rerank,
+                    where=where,
+                    where_document=where_document,
+                    merge=merge_chunks,
                 )
                 logger.debug("search_content function completed")
             finally:
@@ -336,6 +362,123 @@ def register_tools(mcp_server: FastMCP) -> None:
             logger.error(f"Error in query: {e}", exc_info=True)
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
+    @mcp_server.tool(
+        name="vector_search_batch",
+        description="Run several searches in one call, e.g. to answer multiple sub-questions or evaluate a set of queries. All queries are embedded in a single request and searched concurrently, which is much faster than calling vector_search once per query. Takes a list of query strings and the same optional settings as vector_search (limit, score_threshold, collection_name, search_all_collections, search_mode, rerank, merge_chunks, where, where_document), applied to every query. Returns the results of each query under its own heading.",
+    )
+    async def query_batch(
+        queries: List[str] = Field(description="The search query texts"),
+        limit: Optional[int] = Field(
+            description="Maximum number of results to return per query",
+            default=None,
+            ge=1,
+        ),
+        score_threshold: Optional[float] = Field(
+            description="Minimum score threshold for results",
+            default=None,
+            ge=0.0,
+            le=1.0,
+        ),
+        collection_name: Optional[str] = Field(
+            description="Name of collection to search in (defaults to 'default')",
+            default=None,
+        ),
+        search_all_collections: bool = Field(
+            description="Whether to search across all collections",
+            default=False,
+        ),
+        search_mode: Optional[str] = Field(
+            description="Search mode: 'vector' (semantic), 'lexical' (keyword match) or 'hybrid' (both fused)",
+            default=None,
+        ),
+        rerank: Optional[bool] = Field(
+            description="Whether to rerank results with a local cross-encoder (defaults to the configured setting)",
+            default=None,
+        ),
+        where: Optional[Dict] = Field(
+            description="Metadata filter applied before ranking, using Chroma syntax, e.g. {\"source_type\": \"pdf\"}",
+            default=None,
+        ),
+        where_document: Optional[Dict] = Field(
+            description="Document text filter applied before ranking, e.g. {\"$contains\": \"max_retries\"}",
+            default=None,
+        ),
+        merge_chunks: Optional[bool] = Field(
+            description="Whether to merge overlapping or adjacent chunks of the same source into single passages (defaults to the configured setting)",
+            default=None,
+        ),
+    ) -> list[types.TextContent]:
+        """Search the vector store for each of several queries."""
+        searcher = None
+        try:
+            logger.debug(f"Batch search of {len(queries)} queries")
+            searcher = Searcher(collection_name=collection_name)
+            all_results = await asyncio.to_thread(
+                searcher.search_many,
+                queries,
+                limit=limit,
+                score_threshold=score_threshold,
+                search_all_collections=search_all_collections,
+                mode=search_mode,
+                rerank=rerank,
+                where=where,
+                where_document=where_document,
+                merge=merge_chunks,
+            )
+
+            sections = []
+            for query_text, results in zip(queries, all_results):
+                section = [f"## Query: {query_text}"]
+                if not results:
+                    section.append("\nNo results found matching this query.")
+                for i, result in enumerate(results, 1):
+                    section.append(f"\n### Result {i} (Score: {result.score:.2f})")
+                    section.append(f"\n**Source:** {result.source}")
+                    if result.metadata.get("collection"):
+                        section.append(
+                            f"\n**Collection:** {result.metadata['collection']}"
+                        )
+                    section.append(f"\n{result.content}")
+                    section.append("\n---")
+                sections.append("\n".join(section))
+
+            markdown = "# Batch Search Results\n\n" + "\n\n".join(sections)
+            return [types.TextContent(type="text", text=markdown)]
+
+        except Exception as e:
+            logger.error(f"Error in batch query: {e}", exc_info=True)
+            return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+        finally:
+            if searcher is not None:
+                searcher.close()
+
+    @mcp_server.tool(
+        name="search_cache_stats",
+        description="Show hit rates of the search caches in this server: the query embedding cache, and the semantic result cache that answers paraphrased queries with earlier results (with the search time it saved). Takes no arguments.",
+    )
+    def search_cache_stats() -> list[types.TextContent]:
+        """Report query embedding and result cache statistics."""
+        try:
+            searcher = Searcher()
+            try:
+                stats = {
+                    "query_cache": searcher.query_cache_stats(),
+                    "result_cache": searcher.result_cache_stats(),
+                }
+            finally:
+                searcher.close()
+            return [
+                types.TextContent(
+                    type="text",
+                    text="# Search Cache Statistics\n\n```json\n"
+                    + json.dumps(stats, indent=2)
+                    + "\n```",
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error reading cache stats: {e}", exc_info=True)
+            return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+
     @mcp_server.tool(
         name="crawl_and_index_url",
         description="Crawl a website and index its content for semantic search. Takes a URL, optional max_depth for recursive crawling (default 2), and optional collection_name (defaults to 'default'). Processes web pages, extracts text, and stores in vector database. Returns confirmation when crawling starts.",
@@ -413,6 +556,75 @@ def register_tools(mcp_server: FastMCP) -> None:
                 types.TextContent(type="text", text=f"Error processing URL: {str(e)}")
             ]
 
+    @mcp_server.tool(
+        name="delete_source",
+        description="Delete the indexed content of one or more sources from a collection without dropping the collection. Takes a source (URL or file path as stored in chunk metadata), optional collection_name (defaults to 'default'), and optional match mode ('exact', 'prefix' to delete e.g. every page under a URL, or 'glob' for shell-style patterns). Returns the number of sources and chunks deleted.",
+    )
+    async def delete_source(
+        source: str = Field(description="Source, URL prefix or glob pattern to delete"),
+        collection_name: Optional[str] = Field(
+            description="Name of collection to delete from (defaults to 'default')",
+            default=None,
+        ),
+        match: str = Field(
+            description="How to match sources: 'exact', 'prefix' or 'glob'",
+            default="exact",
+        ),
+    ) -> list[types.TextContent]:
+        """Delete the chunks of matching sources from a collection."""
+        try:
+            logger.debug(f"Deleting source {source} (match={match})")
+            store = VectorStore(collection_name=collection_name)
+            deleted = await asyncio.to_thread(
+                store.delete_source, source, collection_name, match
+            )
+            store.close()
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"# Source Deleted\n\n"
+                    f"Deleted {deleted['chunks']} chunks from {deleted['sources']} "
+                    f"sources matching '{source}' in collection "
+                    f"'{collection_name or store.current_collection}'.",
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error deleting source: {e}", exc_info=True)
+            return [
+                types.TextContent(type="text", text=f"Error deleting source: {str(e)}")
+            ]
+
+    @mcp_server.tool(
+        name="refresh_source",
+        description="Re-fetch a single indexed source (web page, local file or image) and update its content in place. Only new or changed chunks are re-embedded and chunks the source no longer produces are removed. Takes a source (URL or file path as stored in chunk metadata) and optional collection_name (defaults to 'default').",
+    )
+    async def refresh_source_tool(
+        source: str = Field(description="URL or file path of the source to refresh"),
+        collection_name: Optional[str] = Field(
+            description="Name of collection containing the source (defaults to 'default')",
+            default=None,
+        ),
+    ) -> list[types.TextContent]:
+        """Reload a source and update its stored chunks."""
+        try:
+            logger.debug(f"Refreshing source {source}")
+            stats = await asyncio.to_thread(refresh_source, source, collection_name)
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"# Source Refreshed\n\n"
+                    f"Source: {source}\n\n"
+                    f"- Chunks: {stats['chunks']}\n"
+                    f"- Re-embedded: {stats['embedded']}\n"
+                    f"- Deleted: {stats['deleted']}\n",
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error refreshing source: {e}", exc_info=True)
+            return [
+                types.TextContent(type="text", text=f"Error refreshing source: {str(e)}")
+            ]
+
 
 def run_sse_server(port: int = 8000) -> None:
     """Run the server in SSE mode using FastMCP's built-in SSE support."""
@@ -0,0 +1,82 @@
+"""Cross-encoder reranking of search results."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+# Loaded models are shared by every reranker in the process
+_models: Dict[Tuple[str, str], Any] = {}
+_models_lock = threading.Lock()
+
+
+def get_cross_encoder(model_name: str, device: str = "cpu") -> Any:
+    """Load a cross-encoder model once per process."""
+    key = (model_name, device)
+    with _models_lock:
+        if key not in _models:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError as e:
+                raise ImportError(
+                    "Reranking requires sentence-transformers. "
+                    'Install it with: pip install "rag-retriever[local]"'
+                ) from e
+
+            logger.info("Loading cross-encoder model %s", model_name)
+            _models[key] = CrossEncoder(model_name, device=device)
+        return _models[key]
+
+
+class CrossEncoderReranker:
+    """Rescore (query, passage) pairs with a small CPU cross-encoder."""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANK_MODEL,
+        device: str = "cpu",
+        batch_size: int = 16,
+        max_workers: int = 2,
+    ):
+        """Initialize the reranker.
+
+        Args:
+            model_name: sentence-transformers cross-encoder model name or path
+            device: Device to run the model on
+            batch_size: Pairs scored per forward pass
+            max_workers: Batches scored concurrently
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        """Score how well each passage answers the query (higher is better)."""
+        if not passages:
+            return []
+
+        model = get_cross_encoder(self.model_name, self.device)
+        pairs = [(query, passage) for passage in passages]
+        batches = [
+            pairs[i : i + self.batch_size] for i in range(0, len(pairs), self.batch_size)
+        ]
+
+        def predict(batch: List[Tuple[str, str]]) -> List[float]:
+            return [float(s) for s in model.predict(batch, show_progress_bar=False)]
+
+        if len(batches) == 1 or self.max_workers == 1:
+            scored = [predict(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(batches)),
+                thread_name_prefix="rerank",
+            ) as executor:
+                scored = list(executor.map(predict, batches))
+
+        return [score for batch_scores in scored for score in batch_scores]
@@ -0,0 +1,220 @@
+"""In-process cache of search results, matched on query-vector similarity."""
+
+import copy
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from rag_retriever.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_RESULT_CACHE_ENTRIES = 256
+DEFAULT_RESULT_CACHE_TTL = 600
+DEFAULT_MAX_DISTANCE = 0.05
+
+_result_cache: Optional["SemanticResultCache"] = None
+_result_cache_lock = threading.Lock()
+
+
+class _Entry:
+    """A cached result list with the query vector and generation it belongs to."""
+
+    __slots__ = ("key", "generation", "vector", "results", "search_ms", "created")
+
+    def __init__(
+        self,
+        key: Hashable,
+        generation: Hashable,
+        vector: np.ndarray,
+        results: List[Any],
+        search_ms: float,
+    ):
+        self.key = key
+        self.generation = generation
+        self.vector = vector
+        self.results = results
+        self.search_ms = search_ms
+        self.created = time.monotonic()
+
+
+class SemanticResultCache:
+    """LRU cache of search results served for similar query vectors.
+
+    Entries are grouped by a key holding every search option that affects
+    results (collection, mode, limit, filters and so on, plus the query text
+    where ranking depends on it). Results are copied in and out, so callers
+    never share objects with the cache. A lookup is a hit
+    when an entry with the same key was stored for the same collection
+    generation and its query vector is within ``max_distance`` cosine
+    distance of the new query's vector, so paraphrased queries share results.
+    Entries of an older generation are dropped on lookup, which invalidates
+    them as soon as the collection is written.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESULT_CACHE_ENTRIES,
+        max_distance: float = DEFAULT_MAX_DISTANCE,
+        ttl_seconds: float = DEFAULT_RESULT_CACHE_TTL,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of result lists kept
+            max_distance: Largest cosine distance (1 - cosine similarity)
+                          between query vectors that is served from the cache
+            ttl_seconds: Seconds an entry stays valid (0 disables expiry)
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        # Search time avoided by hits, net of the time the lookups took
+        self.saved_ms = 0.0
+        self._lookup_ms = 0.0
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_key: Dict[Hashable, List[int]] = {}
+
+    @property
+    def _max_age(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds else float("inf")
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def get(
+        self, key: Hashable, generation: Hashable, vector: List[float]
+    ) -> Optional[List[Any]]:
+        """Return cached results for a similar query, or None on a miss.
+
+        Args:
+            key: Search options the results depend on
+            generation: Current generation of the searched collections
+            vector: Embedding of the query
+        """
+        started = time.perf_counter()
+        query = self._normalize(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            best: Optional[_Entry] = None
+            best_id = -1
+            best_distance = self.max_distance
+            for entry_id in list(self._by_key.get(key, ())):
+                entry = self._entries[entry_id]
+                stale = entry.generation != generation
+                if stale or now - entry.created > self._max_age:
+                    if stale:
+                        self.invalidated += 1
+                    self._remove(entry_id)
+                    continue
+                distance = 1.0 - float(np.dot(entry.vector, query))
+                if distance <= best_distance:
+                    best, best_distance, best_id = entry, distance, entry_id
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._lookup_ms += elapsed_ms
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.saved_ms += max(0.0, best.search_ms - elapsed_ms)
+        logger.debug(f"Search results served from cache (distance {best_distance:.4f})")
+        # Callers may modify results, so never hand out the cached objects
+        return copy.deepcopy(best.results)
+
+    def put(
+        self,
+        key: Hashable,
+        generation: Hashable,
+        vector: List[float],
+        results: List[Any],
+        search_ms: float,
+    ) -> None:
+        """Cache the results of a search.
+
+        Args:
+            key: Search options the results depend on
+            generation: Generation of the searched collections before searching
+            vector: Embedding of the query
+            results: Search results
+            search_ms: Milliseconds the search took, credited to later hits
+        """
+        entry = _Entry(
+            key, generation, self._normalize(vector), copy.deepcopy(results), search_ms
+        )
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = entry
+            self._by_key.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        entry = self._entries.pop(entry_id)
+        ids = self._by_key[entry.key]
+        ids.remove(entry_id)
+        if not ids:
+            del self._by_key[entry.key]
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._by_key.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidated = 0
+            self.saved_ms = 0.0
+            self._lookup_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics for the current process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidated": self.invalidated,
+                "saved_ms": self.saved_ms,
+                "avg_lookup_ms": self._lookup_ms / lookups if lookups else 0.0,
+            }
+
+
+def get_result_cache() -> Optional[SemanticResultCache]:
+    """Get the process-wide search result cache, or None if disabled."""
+    global _result_cache
+
+    settings = config.search.get("result_cache", {})
+    if not settings.get("enabled", False):
+        return None
+
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = SemanticResultCache(
+                max_entries=settings.get("max_entries", DEFAULT_RESULT_CACHE_ENTRIES),
+                max_distance=settings.get("max_distance", DEFAULT_MAX_DISTANCE),
+                ttl_seconds=settings.get("ttl_seconds", DEFAULT_RESULT_CACHE_TTL),
+            )
+        return _result_cache
@@ -2,15 +2,25 @@
 
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 from statistics import mean
 
+from langchain_core.documents import Document
+
+from rag_retriever.search.reranker import DEFAULT_RERANK_MODEL, CrossEncoderReranker
+from rag_retriever.search.result_cache import get_result_cache
 from rag_retriever.utils.config import config
 from rag_retriever.vectorstore.store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+# Whitespace the text splitter may trim between consecutive chunks
+MAX_MERGE_GAP = 32
+
 
 @dataclass
 class SearchResult:
@@ -22,6 +32,156 @@ class SearchResult:
     metadata: Dict[str, Any]
 
 
+def reciprocal_rank_fusion(
+    rankings: List[List[Tuple[Document, float]]], limit: int, k: int = 60
+) -> List[Tuple[Document, float]]:
+    """Fuse ranked result lists with reciprocal rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the lists it appears in.
+    Chunks are matched by collection, source and content. Fused scores are
+    scaled so a document ranked first in every list scores 1.0.
+
+    Args:
+        rankings: Ranked (document, score) lists, best first
+        limit: Maximum number of fused results
+        k: RRF constant damping the weight of top ranks
+
+    Returns:
+        List of (document, fused score) tuples, best first
+    """
+    fused: Dict[Tuple[Any, Any, str], List[Any]] = {}
+    for ranking in rankings:
+        for rank, (doc, _) in enumerate(ranking, 1):
+            key = (
+                doc.metadata.get("collection"),
+                doc.metadata.get("source"),
+                doc.page_content,
+            )
+            entry = fused.setdefault(key, [doc, 0.0])
+            entry[1] += 1.0 / (k + rank)
+
+    best_possible = len(rankings) / (k + 1)
+    ordered = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)
+    return [(doc, score / best_possible) for doc, score in ordered[:limit]]
+
+
+def _span(doc: Document) -> Optional[Tuple[int, int]]:
+    """Get a chunk's character span within its document, if recorded."""
+    start = doc.metadata.get("start_index")
+    if start is None or start < 0:
+        return None
+    return start, start + len(doc.page_content)
+
+
+def merge_adjacent_chunks(
+    results: List[Tuple[Document, float]], max_passage_chars: int = 0
+) -> List[Tuple[Document, float]]:
+    """Coalesce overlapping or adjacent chunks of the same source into passages.
+
+    Chunks are merged when they share a collection, source and loaded
+    document (``document_index``, or ``page`` for chunks stored before it was
+    recorded), their ``start_index`` spans overlap or are separated only by trimmed whitespace,
+    and their overlapping text agrees (so chunks from an older ingestion of a
+    changed source are never stitched together). The overlap is kept once.
+
+    A passage scores its best chunk's score and takes that chunk's place in
+    the ranking. Its metadata is the first chunk's, with ``start_index``,
+    ``end_index`` and ``merged_chunks`` describing the passage. Chunks without
+    a recorded span are returned unchanged.
+
+    Args:
+        results: Ranked (document, score) tuples, best first
+        max_passage_chars: Stop growing a passage beyond this many characters
+                           (0 = no limit)
+
+    Returns:
+        List of (document, score) tuples in ranked order
+    """
+    groups: Dict[Tuple[Any, ...], List[Tuple[int, Document, float]]] = {}
+    passages: List[Tuple[int, Document, float]] = []
+    for rank, (doc, score) in enumerate(results):
+        if _span(doc) is None:
+            passages.append((rank, doc, score))
+        else:
+            key = (
+                doc.metadata.get("collection"),
+                doc.metadata.get("source"),
+                # Offsets restart at 0 in every document of a multi-page source
+                doc.metadata.get("document_index", doc.metadata.get("page")),
+            )
+            groups.setdefault(key, []).append((rank, doc, score))
+
+    for hits in groups.values():
+        hits.sort(key=lambda hit: _span(hit[1]))
+        current: Optional[List[Any]] = None
+        for rank, doc, score in hits:
+            start, end = _span(doc)
+            if current is not None:
+                merged = _stitch(current, doc, start, end, max_passage_chars)
+                if merged is not None:
+                    current[1] = merged
+                    current[2] = max(current[2], end)
+                    current[3] = min(current[3], rank)
+                    current[4] = max(current[4], score)
+                    current[5] += 1
+                    continue
+                passages.append(_passage(current))
+            current = [doc, doc.page_content, end, rank, score, 1]
+        passages.append(_passage(current))
+
+    passages.sort(key=lambda passage: passage[0])
+    return [(doc, score) for _, doc, score in passages]
+
+
+def _stitch(
+    current: List[Any], doc: Document, start: int, end: int, max_chars: int
+) -> Optional[str]:
+    """Append a chunk to a passage, or return None if it does not continue it."""
+    text, current_end = current[1], current[2]
+    if start > current_end + MAX_MERGE_GAP:
+        return None
+    if start == current_end:
+        merged = text + doc.page_content
+    elif start > current_end:
+        merged = f"{text}\n{doc.page_content}"
+    else:
+        # Offsets are taken from the end of the passage, which stays aligned
+        # with the source even after whitespace gaps were joined
+        offset = len(text) - (current_end - start)
+        overlap = min(current_end, end) - start
+        if offset < 0 or text[offset : offset + overlap] != doc.page_content[:overlap]:
+            return None
+        merged = text + doc.page_content[overlap:]
+    if max_chars and len(merged) > max_chars and len(merged) > len(text):
+        return None
+    return merged
+
+
+def _passage(current: List[Any]) -> Tuple[int, Document, float]:
+    """Build a ranked passage from merge state."""
+    first, text, end, rank, score, count = current
+    if count == 1:
+        return rank, first, score
+    metadata = {
+        **first.metadata,
+        "end_index": end,
+        "merged_chunks": count,
+    }
+    return rank, Document(page_content=text, metadata=metadata), score
+
+
+def _filters(
+    where: Optional[Dict[str, Any]], where_document: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build the filter keyword arguments for store searches."""
+    filters = {}
+    if where:
+        filters["where"] = where
+    if where_document:
+        filters["where_document"] = where_document
+    return filters
+
+
 class Searcher:
     """Handle search operations and result formatting."""
 
@@ -34,6 +194,145 @@ class Searcher:
         self.store = VectorStore(collection_name=collection_name)
         self.default_limit = config.search["default_limit"]
         self.default_score_threshold = config.search["default_score_threshold"]
+        self.default_mode = config.search.get("default_mode", "vector")
+        self.rerank_settings = config.search.get("rerank", {})
+        self.merge_settings = config.search.get("merge", {})
+        self._reranker: Optional[CrossEncoderReranker] = None
+        self.result_cache = get_result_cache()
+        # Milliseconds spent in each stage of the most recent search
+        self.last_timings: Dict[str, float] = {}
+
+    @property
+    def reranker(self) -> CrossEncoderReranker:
+        """Get the cross-encoder reranker, creating it on first use."""
+        if self._reranker is None:
+            self._reranker = CrossEncoderReranker(
+                model_name=self.rerank_settings.get("model", DEFAULT_RERANK_MODEL),
+                device=self.rerank_settings.get("device", "cpu"),
+                batch_size=self.rerank_settings.get("batch_size", 16),
+                max_workers=self.rerank_settings.get("max_workers", 2),
+            )
+        return self._reranker
+
+    def _retrieve(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        score_threshold: float,
+        search_all_collections: bool,
+        filters: Dict[str, Any],
+        vector_results: Optional[List[Tuple[Document, float]]] = None,
+        query_vector: Optional[List[float]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Run the first-stage retrieval for a search mode.
+
+        Args:
+            vector_results: Vector search results already retrieved for the
+                            query by a batch search, used instead of searching
+            query_vector: Optional embedding of the query, so the vector
+                          search does not embed it again
+        """
+        vector_kwargs = dict(filters)
+        if query_vector is not None:
+            vector_kwargs["query_vector"] = query_vector
+        if mode == "vector":
+            if vector_results is not None:
+                return vector_results
+            return self.store.search(
+                query,
+                limit=limit,
+                score_threshold=score_threshold,
+                search_all_collections=search_all_collections,
+                **vector_kwargs,
+            )
+        if mode == "lexical":
+            return self.store.lexical_search(
+                query,
+                limit=limit,
+                search_all_collections=search_all_collections,
+                **filters,
+            )
+
+        hybrid_settings = config.search.get("hybrid", {})
+        candidates = self._vector_candidates(mode, limit)
+        if vector_results is None:
+            vector_results = self.store.search(
+                query,
+                limit=candidates,
+                score_threshold=score_threshold,
+                search_all_collections=search_all_collections,
+                **vector_kwargs,
+            )
+        return reciprocal_rank_fusion(
+            [
+                vector_results,
+                self.store.lexical_search(
+                    query,
+                    limit=candidates,
+                    search_all_collections=search_all_collections,
+                    **filters,
+                ),
+            ],
+            limit=limit,
+            k=hybrid_settings.get("rrf_k", 60),
+        )
+
+    def _vector_candidates(self, mode: str, limit: int) -> int:
+        """Get how many vector results a search mode retrieves for ``limit``."""
+        if mode == "hybrid":
+            return max(limit, config.search.get("hybrid", {}).get("candidates", 50))
+        return limit
+
+    def _rerank(
+        self, query: str, results: List[Tuple[Document, float]], limit: int
+    ) -> List[Tuple[Document, float]]:
+        """Reorder candidates by cross-encoder score and keep the best ``limit``.
+
+        The first-stage score is kept in each document's metadata as
+        ``retrieval_score``.
+        """
+        scores = self.reranker.score(query, [doc.page_content for doc, _ in results])
+        reranked = []
+        for (doc, retrieval_score), score in zip(results, scores):
+            doc.metadata["retrieval_score"] = retrieval_score
+            reranked.append((doc, score))
+        reranked.sort(key=lambda item: item[1], reverse=True)
+        return reranked[:limit]
+
+    def _apply_budget(
+        self, results: List[Tuple[Document, float]]
+    ) -> List[Tuple[Document, float]]:
+        """Keep the best results that fit search.merge.max_chars/max_tokens.
+
+        The first result is always returned, cut to the character budget if
+        it exceeds it on its own.
+        """
+        max_chars = self.merge_settings.get("max_chars", 0)
+        max_tokens = self.merge_settings.get("max_tokens", 0)
+        if not (max_chars or max_tokens) or not results:
+            return results
+
+        kept: List[Tuple[Document, float]] = []
+        chars = tokens = 0
+        for doc, score in results:
+            chars += len(doc.page_content)
+            if max_tokens:
+                tokens += self.store.token_counter.count(doc.page_content)
+            if kept and (
+                (max_chars and chars > max_chars)
+                or (max_tokens and tokens > max_tokens)
+            ):
+                break
+            kept.append((doc, score))
+
+        doc, score = kept[0]
+        if max_chars and len(doc.page_content) > max_chars:
+            kept[0] = (
+                Document(page_content=doc.page_content[:max_chars], metadata=doc.metadata),
+                score,
+            )
+        return kept
 
     def search(
         self,
@@ -41,36 +340,362 @@ class Searcher:
         limit: int | None = None,
         score_threshold: float | None = None,
         search_all_collections: bool = False,
+        mode: str | None = None,
+        rerank: bool | None = None,
+        where: Dict[str, Any] | None = None,
+        where_document: Dict[str, Any] | None = None,
+        merge: bool | None = None,
     ) -> List[SearchResult]:
         """Search for documents matching query.
 
         Args:
             query: Search query string
             limit: Maximum number of results to return
-            score_threshold: Minimum similarity score threshold
+            score_threshold: Minimum similarity score threshold (vector results only)
             search_all_collections: Whether to search across all collections
+            mode: "vector" (semantic similarity), "lexical" (BM25 keyword match,
+                  no embedding call) or "hybrid" (both fused with reciprocal
+                  rank fusion). Defaults to search.default_mode.
+            rerank: Whether to rescore the top search.rerank.candidates results
+                    with a cross-encoder before returning the best ``limit``.
+                    Defaults to search.rerank.enabled.
+            where: Optional Chroma metadata filter applied before ranking, e.g.
+                   ``{"source_type": "pdf"}``. Ingested chunks carry
+                   ``source``, ``source_type`` and ``ingested_at`` fields.
+            where_document: Optional Chroma document filter applied before
+                            ranking, e.g. ``{"$contains": "max_retries"}``
+            merge: Whether to coalesce overlapping or adjacent chunks of the
+                   same source into single passages, retrieving
+                   search.merge.candidates results so merged passages still
+                   fill ``limit``, and to trim results to the configured
+                   character or token budget. Defaults to search.merge.enabled.
 
         Returns:
             List of search results sorted by relevance
+
+        Raises:
+            ValueError: If mode is not a supported search mode
         """
-        # Use default values if not specified
-        if limit is None:
-            limit = self.default_limit
-        if score_threshold is None:
-            score_threshold = self.default_score_threshold
+        limit, score_threshold, mode, rerank, merge = self._resolve_options(
+            limit, score_threshold, mode, rerank, merge
+        )
 
         logger.debug(f"Searching with query: {query}")
+        logger.debug(f"Search mode: {mode}")
         logger.debug(f"Result limit: {limit}")
         logger.debug(f"Score threshold: {score_threshold}")
 
-        # Get raw results from vector store
-        raw_results = self.store.search(
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        cache_key = generation = query_vector = None
+        if self.result_cache is not None and mode != "lexical":
+            query_vector = self.store.embed_queries([query])[0]
+            timings["embedding_ms"] = (time.perf_counter() - started) * 1000
+            cache_key = self._result_cache_key(
+                query,
+                mode,
+                limit,
+                score_threshold,
+                search_all_collections,
+                rerank,
+                merge,
+                where,
+                where_document,
+            )
+            generation = self.store.collection_generation(
+                search_all_collections=search_all_collections
+            )
+            if generation is not None:
+                cached = self.result_cache.get(cache_key, generation, query_vector)
+                if cached is not None:
+                    timings["total_ms"] = (time.perf_counter() - started) * 1000
+                    self.last_timings = timings
+                    return cached
+
+        search_started = time.perf_counter()
+        raw_results = self._retrieve(
             query,
-            limit=limit,
-            score_threshold=score_threshold,
-            search_all_collections=search_all_collections,
+            mode,
+            self._candidates(limit, rerank, merge),
+            score_threshold,
+            search_all_collections,
+            _filters(where, where_document),
+            query_vector=query_vector,
+        )
+        timings["retrieval_ms"] = (time.perf_counter() - search_started) * 1000
+        raw_results = self._postprocess(
+            query, raw_results, limit, rerank, merge, timings
+        )
+        results = self._to_results(raw_results)
+        if generation is not None:
+            self.result_cache.put(
+                cache_key,
+                generation,
+                query_vector,
+                results,
+                (time.perf_counter() - search_started) * 1000,
+            )
+
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        self.last_timings = timings
+        logger.debug(
+            "Search timings: "
+            + ", ".join(f"{stage}={ms:.1f}" for stage, ms in timings.items())
+        )
+        return results
+
+    def search_many(
+        self,
+        queries: List[str],
+        limit: int | None = None,
+        score_threshold: float | None = None,
+        search_all_collections: bool = False,
+        mode: str | None = None,
+        rerank: bool | None = None,
+        where: Dict[str, Any] | None = None,
+        where_document: Dict[str, Any] | None = None,
+        merge: bool | None = None,
+    ) -> List[List[SearchResult]]:
+        """Search for documents matching each of several queries.
+
+        Vector and hybrid searches embed all queries in a single embeddings
+        request, and queries answered by the result cache are not searched.
+        Retrieval, reranking and merging then run for the remaining queries
+        concurrently on up to search.max_parallel_queries threads. Arguments
+        are as for :meth:`search` and apply to every query.
+
+        Returns:
+            One list of search results per query, in query order
+
+        Raises:
+            ValueError: If mode is not a supported search mode
+        """
+        limit, score_threshold, mode, rerank, merge = self._resolve_options(
+            limit, score_threshold, mode, rerank, merge
+        )
+        if not queries:
+            return []
+        logger.debug(f"Searching {len(queries)} queries in {mode} mode")
+
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        results: List[Any] = [None] * len(queries)
+        pending = list(range(len(queries)))
+        query_vectors = None
+        generation = None
+        if self.result_cache is not None and mode != "lexical":
+            query_vectors = self.store.embed_queries(queries)
+            timings["embedding_ms"] = (time.perf_counter() - started) * 1000
+            cache_keys = [
+                self._result_cache_key(
+                    query,
+                    mode,
+                    limit,
+                    score_threshold,
+                    search_all_collections,
+                    rerank,
+                    merge,
+                    where,
+                    where_document,
+                )
+                for query in queries
+            ]
+            generation = self.store.collection_generation(
+                search_all_collections=search_all_collections
+            )
+            if generation is not None:
+                pending = []
+                for index, vector in enumerate(query_vectors):
+                    results[index] = self.result_cache.get(
+                        cache_keys[index], generation, vector
+                    )
+                    if results[index] is None:
+                        pending.append(index)
+
+        if pending:
+            search_started = time.perf_counter()
+            found = self._search_batch(
+                [queries[index] for index in pending],
+                mode,
+                limit,
+                score_threshold,
+                search_all_collections,
+                rerank,
+                merge,
+                _filters(where, where_document),
+                [query_vectors[index] for index in pending] if query_vectors else None,
+                timings,
+            )
+            search_ms = (time.perf_counter() - search_started) * 1000
+            for index, query_results in zip(pending, found):
+                results[index] = query_results
+                if generation is not None:
+                    self.result_cache.put(
+                        cache_keys[index],
+                        generation,
+                        query_vectors[index],
+                        query_results,
+                        search_ms / len(pending),
+                    )
+
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        self.last_timings = timings
+        logger.debug(
+            "Batch search timings: "
+            + ", ".join(f"{stage}={ms:.1f}" for stage, ms in timings.items())
+        )
+        return results
+
+    def _search_batch(
+        self,
+        queries: List[str],
+        mode: str,
+        limit: int,
+        score_threshold: float,
+        search_all_collections: bool,
+        rerank: bool,
+        merge: bool,
+        filters: Dict[str, Any],
+        query_vectors: Optional[List[List[float]]],
+        timings: Dict[str, float],
+    ) -> List[List[SearchResult]]:
+        """Search several queries, with one vector search for all of them."""
+        started = time.perf_counter()
+        candidates = self._candidates(limit, rerank, merge)
+        vector_results: List[Any] = [None] * len(queries)
+        if mode in ("vector", "hybrid"):
+            vector_kwargs = dict(filters)
+            if query_vectors is not None:
+                vector_kwargs["query_vectors"] = query_vectors
+            vector_results = self.store.search_many(
+                queries,
+                limit=self._vector_candidates(mode, candidates),
+                score_threshold=score_threshold,
+                search_all_collections=search_all_collections,
+                **vector_kwargs,
+            )
+            timings["vector_ms"] = (time.perf_counter() - started) * 1000
+
+        def search_one(index: int) -> List[SearchResult]:
+            query = queries[index]
+            raw_results = self._retrieve(
+                query,
+                mode,
+                candidates,
+                score_threshold,
+                search_all_collections,
+                filters,
+                vector_results[index],
+            )
+            return self._to_results(
+                self._postprocess(query, raw_results, limit, rerank, merge, {})
+            )
+
+        max_workers = min(len(queries), config.search.get("max_parallel_queries", 8))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return list(executor.map(search_one, range(len(queries))))
+
+    def _result_cache_key(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        score_threshold: float,
+        search_all_collections: bool,
+        rerank: bool,
+        merge: bool,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]],
+    ) -> Tuple[Any, ...]:
+        """Build the result cache key from every option that affects results.
+
+        BM25 ranking and cross-encoder scores depend on the query text, not
+        only its embedding, so hybrid and reranked searches also key on the
+        exact query and are only served for repeats of the same query.
+        """
+        return (
+            query if mode != "vector" or rerank else None,
+            self.store.embedding_spec,
+            self.store.current_collection,
+            mode,
+            limit,
+            score_threshold,
+            search_all_collections,
+            rerank,
+            merge,
+            json.dumps(where, sort_keys=True),
+            json.dumps(where_document, sort_keys=True),
         )
 
+    def _resolve_options(
+        self,
+        limit: int | None,
+        score_threshold: float | None,
+        mode: str | None,
+        rerank: bool | None,
+        merge: bool | None,
+    ) -> Tuple[int, float, str, bool, bool]:
+        """Fill in configured defaults for unset search options.
+
+        Raises:
+            ValueError: If mode is not a supported search mode
+        """
+        if limit is None:
+            limit = self.default_limit
+        if score_threshold is None:
+            score_threshold = self.default_score_threshold
+        if mode is None:
+            mode = self.default_mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(
+                f"Invalid search mode '{mode}'. Expected one of: {', '.join(SEARCH_MODES)}"
+            )
+        if rerank is None:
+            rerank = self.rerank_settings.get("enabled", False)
+        if merge is None:
+            merge = self.merge_settings.get("enabled", False)
+        return limit, score_threshold, mode, rerank, merge
+
+    def _candidates(self, limit: int, rerank: bool, merge: bool) -> int:
+        """Get how many first-stage results to retrieve for ``limit`` results."""
+        candidates = limit
+        if rerank:
+            candidates = max(candidates, self.rerank_settings.get("candidates", 30))
+        if merge:
+            candidates = max(candidates, self.merge_settings.get("candidates", 2 * limit))
+        return candidates
+
+    def _postprocess(
+        self,
+        query: str,
+        raw_results: List[Tuple[Document, float]],
+        limit: int,
+        rerank: bool,
+        merge: bool,
+        timings: Dict[str, float],
+    ) -> List[Tuple[Document, float]]:
+        """Rerank and merge first-stage results, recording stage timings."""
+        if rerank and raw_results:
+            rerank_started = time.perf_counter()
+            raw_results = self._rerank(
+                query, raw_results, len(raw_results) if merge else limit
+            )
+            timings["rerank_ms"] = (time.perf_counter() - rerank_started) * 1000
+
+        if merge:
+            merged = merge_adjacent_chunks(
+                raw_results, self.merge_settings.get("max_passage_chars", 0)
+            )
+            logger.debug(
+                f"Merged {len(raw_results)} chunks into {len(merged)} passages"
+            )
+            raw_results = self._apply_budget(merged[:limit])
+        return raw_results
+
+    def _to_results(
+        self, raw_results: List[Tuple[Document, float]]
+    ) -> List[SearchResult]:
+        """Convert (document, score) tuples to search results."""
         scores = [score for _, score in raw_results]
         logger.debug(f"Number of results found: {len(raw_results)}")
         if scores:
@@ -93,6 +718,32 @@ class Searcher:
 
         return results
 
+    def query_cache_stats(self) -> Dict[str, Any]:
+        """Get hit-rate statistics for the query embedding cache.
+
+        Returns:
+            Dictionary of cache statistics, with ``enabled`` set to False
+            when the cache is turned off.
+        """
+        if self.store.query_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.store.query_cache.stats()}
+
+    def close(self) -> None:
+        """Close the collection handles opened by this searcher."""
+        self.store.close()
+
+    def result_cache_stats(self) -> Dict[str, Any]:
+        """Get hit-rate and time-saved statistics for the search result cache.
+
+        Returns:
+            Dictionary of cache statistics, with ``enabled`` set to False
+            when the cache is turned off.
+        """
+        if self.result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.result_cache.stats()}
+
     def format_result(self, result: SearchResult, show_full: bool = False) -> str:
         """Format a search result for display.
 
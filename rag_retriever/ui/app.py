@@ -1,7 +1,8 @@
 """Streamlit UI for RAG Retriever."""
 
 import streamlit as st
-from rag_retriever.vectorstore.store import VectorStore
+from rag_retriever.vectorstore.store import VectorStore, SOURCE_MATCH_MODES
+from rag_retriever.main import refresh_source
 from rag_retriever.search.searcher import Searcher
 from typing import Dict, Any
 import pandas as pd
@@ -226,6 +227,14 @@ def edit_collection_description(collection_name: str, new_description: str) -> N
     store._save_collection_metadata()
 
 
+def delete_collection_source(
+    collection_name: str, source: str, match: str = "exact"
+) -> Dict[str, int]:
+    """Delete the chunks of matching sources from a collection."""
+    store = VectorStore()
+    return store.delete_source(source, collection_name, match=match)
+
+
 def get_collection_stats(collection_name: str) -> Dict[str, Any]:
     """Get detailed collection statistics."""
     store = VectorStore()
@@ -563,6 +572,10 @@ def display_collections():
             st.divider()
             show_edit_description()
 
+        # Sources Section
+        st.divider()
+        show_manage_sources(selected_collection)
+
         # Statistics Section
         st.divider()
         st.subheader("Collection Statistics")
@@ -597,6 +610,76 @@ def display_collections():
         show_collection_comparison()
 
 
+def show_manage_sources(collection_name: str):
+    """Show controls to refresh or delete individual sources of a collection."""
+    st.subheader("Manage Sources")
+
+    store = VectorStore()
+    sources = store.get_collection_sources(collection_name)
+    if sources:
+        chunk_counts = {s["source"]: s["chunk_count"] for s in sources}
+        selected_source = st.selectbox(
+            "Select source",
+            options=list(chunk_counts),
+            format_func=lambda source: f"{source} ({chunk_counts[source]} chunks)",
+            help="Sources ingested into this collection",
+            key="manage_source",
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(
+                "Refresh Source",
+                type="secondary",
+                use_container_width=True,
+                help="Re-fetch this source and re-embed only changed chunks",
+            ):
+                try:
+                    with st.spinner(f"Refreshing {selected_source}..."):
+                        stats = refresh_source(selected_source, collection_name)
+                    st.success(
+                        f"Refreshed '{selected_source}': {stats['chunks']} chunks, "
+                        f"{stats['embedded']} re-embedded, {stats['deleted']} deleted"
+                    )
+                except Exception as e:
+                    st.error(f"Error refreshing source: {str(e)}")
+        with col2:
+            if st.button(
+                "Delete Source",
+                type="secondary",
+                use_container_width=True,
+                help="Remove this source's chunks from the collection",
+            ):
+                try:
+                    deleted = delete_collection_source(collection_name, selected_source)
+                    st.success(f"Deleted {deleted['chunks']} chunks of '{selected_source}'")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error deleting source: {str(e)}")
+    else:
+        st.info("No recorded sources in this collection.")
+
+    with st.expander("Delete by pattern"):
+        pattern = st.text_input(
+            "Source prefix or pattern",
+            help="A URL or path prefix, or a glob such as */docs/*.md",
+            key="delete_source_pattern",
+        )
+        match = st.radio(
+            "Match",
+            options=[m for m in SOURCE_MATCH_MODES if m != "exact"],
+            horizontal=True,
+            key="delete_source_match",
+        )
+        if st.button("Delete Matching Sources", disabled=not pattern):
+            try:
+                deleted = delete_collection_source(collection_name, pattern, match)
+                st.success(
+                    f"Deleted {deleted['chunks']} chunks from {deleted['sources']} sources"
+                )
+            except Exception as e:
+                st.error(f"Error deleting sources: {str(e)}")
+
+
 def handle_edit_description(collection_name: str, collections: list):
     """Handle edit description button click."""
     current_desc = next(
@@ -178,7 +178,8 @@ class Config:
             # Add default batch processing settings if not present
             config["batch_processing"] = {
                 "batch_size": 50,
-                "delay_between_batches": 1.0,
+                "max_concurrent_batches": 4,
+                "delay_between_batches": 0.0,
                 "max_retries": 3,
                 "retry_delay": 5.0,
             }
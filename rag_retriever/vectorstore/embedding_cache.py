@@ -0,0 +1,481 @@
+"""Persistent content-addressed cache for chunk embeddings."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag_retriever.utils.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Constants
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 500_000
+DEFAULT_QUERY_CACHE_ENTRIES = 1024
+DEFAULT_QUERY_CACHE_TTL = 3600
+
+
+def get_embedding_cache_path() -> str:
+    """Get the embedding cache database path using OS-specific locations.
+
+    The cache lives outside the vector store directory so that cleaning and
+    re-ingesting a collection can still reuse previously computed embeddings.
+    """
+    if "EMBEDDING_CACHE_PATH" in os.environ:
+        cache_path = Path(os.environ["EMBEDDING_CACHE_PATH"])
+        logger.debug(f"Using embedding cache path from environment variable: {cache_path}")
+    else:
+        cache_path = get_data_dir() / EMBEDDING_CACHE_FILE
+        logger.debug(f"Using default embedding cache path: {cache_path}")
+
+    os.makedirs(cache_path.parent, exist_ok=True)
+    return str(cache_path)
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest used to address a chunk's content."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different spellings share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache keyed by (model, dimensions, content hash).
+
+    Entries are evicted least-recently-used first once the cache grows past
+    ``max_entries``. Hit and miss counters are kept for the current process and
+    accumulated on disk so they can be inspected from the CLI.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            path: Optional path to the SQLite database (defaults to the user data dir)
+            max_entries: Maximum number of cached vectors before LRU eviction
+        """
+        self.path = path or get_embedding_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._entry_count = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+
+    def _create_tables(self) -> None:
+        """Create cache tables if they don't exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, dimensions, content_hash)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used "
+                "ON embeddings (last_used)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    query_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, dimensions, query_hash)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_embeddings_created_at "
+                "ON query_embeddings (created_at)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+                """
+            )
+
+    def get_many(
+        self, model: str, dimensions: int, texts: List[str]
+    ) -> List[Optional[List[float]]]:
+        """Look up cached vectors for texts.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Chunk texts to look up
+
+        Returns:
+            List aligned with texts containing a vector or None for each miss
+        """
+        hashes = [content_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                chunk = unique[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND dimensions = ? AND content_hash IN ({placeholders})",
+                    [model, dimensions, *chunk],
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? "
+                        "WHERE model = ? AND dimensions = ? AND content_hash = ?",
+                        [(now, model, dimensions, digest) for digest in found],
+                    )
+
+            results = [found.get(digest) for digest in hashes]
+            hits = sum(1 for vector in results if vector is not None)
+            self._record(hits, len(results) - hits)
+
+        return results
+
+    def put_many(
+        self,
+        model: str,
+        dimensions: int,
+        texts: List[str],
+        vectors: List[List[float]],
+    ) -> None:
+        """Store vectors for texts, evicting old entries if over capacity."""
+        now = time.time()
+        rows = [
+            (
+                model,
+                dimensions,
+                content_hash(text),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                now,
+                now,
+            )
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings "
+                    "(model, dimensions, content_hash, vector, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._entry_count += self._conn.total_changes - before
+
+            if self.max_entries and self._entry_count > self.max_entries:
+                self._evict(self._entry_count - self.max_entries)
+
+    def get_query(
+        self, model: str, dimensions: int, query: str, max_age: float
+    ) -> Optional[List[float]]:
+        """Look up a persisted query embedding no older than max_age seconds."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM query_embeddings "
+                "WHERE model = ? AND dimensions = ? AND query_hash = ? AND created_at >= ?",
+                (model, dimensions, content_hash(query), time.time() - max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def put_query(
+        self,
+        model: str,
+        dimensions: int,
+        query: str,
+        vector: List[float],
+        max_age: float,
+    ) -> None:
+        """Persist a query embedding and drop entries older than max_age seconds."""
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings "
+                    "(model, dimensions, query_hash, vector, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        model,
+                        dimensions,
+                        content_hash(query),
+                        np.asarray(vector, dtype=np.float32).tobytes(),
+                        now,
+                    ),
+                )
+                self._conn.execute(
+                    "DELETE FROM query_embeddings WHERE created_at < ?",
+                    (now - max_age,),
+                )
+
+    def _evict(self, count: int) -> int:
+        """Remove the least recently used entries. Caller must hold the lock."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (count,),
+            )
+        removed = cursor.rowcount
+        self._entry_count -= removed
+        logger.debug("Evicted %d entries from embedding cache", removed)
+        return removed
+
+    def prune(self, max_entries: Optional[int] = None) -> int:
+        """Shrink the cache to at most max_entries, removing LRU entries first.
+
+        Args:
+            max_entries: Number of entries to keep (defaults to the configured maximum).
+                         Use 0 to clear the cache entirely.
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_entries if max_entries is None else max_entries
+        with self._lock:
+            excess = self._entry_count - limit
+            removed = self._evict(excess) if excess > 0 else 0
+            if removed and limit == 0:
+                # Reclaim disk space when the cache is cleared
+                self._conn.execute("VACUUM")
+        return removed
+
+    def _record(self, hits: int, misses: int) -> None:
+        """Update process and persistent hit/miss counters. Caller must hold the lock."""
+        self.hits += hits
+        self.misses += misses
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [("hits", hits), ("misses", misses)],
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            counters = dict(
+                self._conn.execute("SELECT name, value FROM counters").fetchall()
+            )
+            models = self._conn.execute(
+                "SELECT model, dimensions, COUNT(*) FROM embeddings "
+                "GROUP BY model, dimensions"
+            ).fetchall()
+
+        total_hits = counters.get("hits", 0)
+        total_misses = counters.get("misses", 0)
+        lookups = total_hits + total_misses
+        return {
+            "path": self.path,
+            "entries": self._entry_count,
+            "max_entries": self.max_entries,
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_rate": total_hits / lookups if lookups else 0.0,
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+            "models": [
+                {"model": model, "dimensions": dims, "entries": count}
+                for model, dims, count in models
+            ],
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the wrapped provider."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        model: str,
+        dimensions: int,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            embeddings: Underlying embeddings provider
+            cache: Embedding cache to consult before calling the provider
+            model: Embedding model name used as part of the cache key
+            dimensions: Embedding dimensions used as part of the cache key
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, serving previously seen chunks from the cache."""
+        vectors = self.cache.get_many(self.model, self.dimensions, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        logger.debug(
+            "Embedding cache: %d hits, %d misses",
+            len(texts) - len(missing),
+            len(missing),
+        )
+
+        if missing:
+            # Embed each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            new_vectors = self.embeddings.embed_documents(unique_texts)
+            self.cache.put_many(self.model, self.dimensions, unique_texts, new_vectors)
+            by_text = dict(zip(unique_texts, new_vectors))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped provider."""
+        return self.embeddings.embed_query(text)
+
+
+class QueryEmbeddingCache:
+    """In-process LRU cache of query embeddings with a time-to-live.
+
+    Entries are keyed by embedding model, dimensions and normalized query
+    text. When given an EmbeddingCache, entries are also persisted so that
+    repeated queries stay local across restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_QUERY_CACHE_ENTRIES,
+        ttl_seconds: float = DEFAULT_QUERY_CACHE_TTL,
+        persistent: Optional[EmbeddingCache] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of query vectors kept in memory
+            ttl_seconds: Seconds a query vector stays valid (0 disables expiry)
+            persistent: Optional on-disk cache used as a second level
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int, str], Tuple[float, List[float]]]" = (
+            OrderedDict()
+        )
+
+    @property
+    def _max_age(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds else float("inf")
+
+    def get(self, model: str, dimensions: int, query: str) -> Optional[List[float]]:
+        """Return the cached vector for a query, or None if missing or expired."""
+        key = (model, dimensions, normalize_query(query))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self._max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+        vector = None
+        if self.persistent is not None:
+            try:
+                vector = self.persistent.get_query(model, dimensions, key[2], self._max_age)
+            except Exception as e:
+                logger.debug(f"Persistent query cache lookup failed: {e}")
+
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, vector)
+        return vector
+
+    def put(self, model: str, dimensions: int, query: str, vector: List[float]) -> None:
+        """Cache the vector for a query."""
+        key = (model, dimensions, normalize_query(query))
+        with self._lock:
+            self._store(key, vector)
+
+        if self.persistent is not None:
+            try:
+                self.persistent.put_query(model, dimensions, key[2], vector, self._max_age)
+            except Exception as e:
+                logger.debug(f"Persistent query cache write failed: {e}")
+
+    def _store(self, key: Tuple[str, int, str], vector: List[float]) -> None:
+        """Insert an entry and evict the least recently used. Caller must hold the lock."""
+        self._entries[key] = (time.monotonic(), vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics for the current process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self.persistent is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
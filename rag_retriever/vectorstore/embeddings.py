@@ -0,0 +1,162 @@
+"""Embedding provider selection for the vector store."""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from rag_retriever.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PROVIDER_OPENAI = "openai"
+PROVIDER_LOCAL = "local"
+EMBEDDING_PROVIDERS = (PROVIDER_OPENAI, PROVIDER_LOCAL)
+DEFAULT_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_LOCAL_DIMENSIONS = 384
+
+
+@dataclass(frozen=True)
+class EmbeddingSpec:
+    """Identifies the provider, model and dimensions that produce embeddings."""
+
+    provider: str
+    model: str
+    dimensions: int
+
+    def __str__(self) -> str:
+        return f"{self.provider}/{self.model} ({self.dimensions} dims)"
+
+
+def get_embedding_spec() -> EmbeddingSpec:
+    """Get the embedding provider, model and dimensions from the configuration."""
+    provider = config.vector_store.get("embedding_provider", PROVIDER_OPENAI)
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(
+            f"Invalid vector_store.embedding_provider '{provider}'. "
+            f"Expected one of: {', '.join(EMBEDDING_PROVIDERS)}"
+        )
+
+    if provider == PROVIDER_LOCAL:
+        settings = config.vector_store.get("local_embeddings", {})
+        return EmbeddingSpec(
+            provider=provider,
+            model=settings.get("model", DEFAULT_LOCAL_MODEL),
+            dimensions=settings.get("dimensions", DEFAULT_LOCAL_DIMENSIONS),
+        )
+
+    return EmbeddingSpec(
+        provider=provider,
+        model=config.vector_store["embedding_model"],
+        dimensions=config.vector_store["embedding_dimensions"],
+    )
+
+
+def create_local_embeddings(spec: EmbeddingSpec) -> "LocalEmbeddings":
+    """Create local embeddings configured from ``vector_store.local_embeddings``."""
+    settings = config.vector_store.get("local_embeddings", {})
+    return LocalEmbeddings(
+        model_name=spec.model,
+        dimensions=spec.dimensions,
+        device=settings.get("device", "cpu"),
+        backend=settings.get("backend", "torch"),
+        batch_size=settings.get("batch_size", 64),
+        num_threads=settings.get("num_threads"),
+    )
+
+
+class LocalEmbeddings(Embeddings):
+    """CPU embeddings computed in-process with a sentence-transformers model.
+
+    The model is loaded on first use, so creating a VectorStore for
+    listing or deleting collections does not pay the load cost. Requires the
+    ``local`` extra: ``pip install "rag-retriever[local]"``.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LOCAL_MODEL,
+        dimensions: int = DEFAULT_LOCAL_DIMENSIONS,
+        device: str = "cpu",
+        backend: str = "torch",
+        batch_size: int = 64,
+        num_threads: Optional[int] = None,
+    ):
+        """Initialize local embeddings.
+
+        Args:
+            model_name: sentence-transformers model name or local path
+            dimensions: Expected embedding dimensions of the model
+            device: Device to run the model on
+            backend: Inference backend ("torch" or "onnx")
+            batch_size: Number of texts encoded per forward pass
+            num_threads: Optional number of CPU threads used for inference
+        """
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.device = device
+        self.backend = backend
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self._model: Any = None
+        self._model_lock = threading.Lock()
+
+    def _get_model(self) -> Any:
+        """Load the model on first use."""
+        with self._model_lock:
+            if self._model is not None:
+                return self._model
+
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "The local embedding provider requires sentence-transformers. "
+                    'Install it with: pip install "rag-retriever[local]"'
+                ) from e
+
+            if self.num_threads:
+                import torch
+
+                torch.set_num_threads(self.num_threads)
+
+            logger.info(
+                "Loading local embedding model %s (%s backend)",
+                self.model_name,
+                self.backend,
+            )
+            kwargs = {"device": self.device}
+            if self.backend != "torch":
+                kwargs["backend"] = self.backend
+            model = SentenceTransformer(self.model_name, **kwargs)
+
+            model_dimensions = model.get_sentence_embedding_dimension()
+            if model_dimensions != self.dimensions:
+                raise ValueError(
+                    f"Local embedding model {self.model_name} produces "
+                    f"{model_dimensions}-dimensional embeddings, but "
+                    f"local_embeddings.dimensions is {self.dimensions}"
+                )
+
+            self._model = model
+            return model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches on the local model."""
+        if not texts:
+            return []
+        vectors = self._get_model().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query on the local model."""
+        return self.embed_documents([text])[0]
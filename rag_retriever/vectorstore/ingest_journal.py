@@ -0,0 +1,463 @@
+"""SQLite journal of ingestion jobs, so interrupted ingestions can be resumed."""
+
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Constants
+INGEST_JOURNAL_FILE = "ingest_journal.sqlite3"
+
+# Job states
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_INTERRUPTED = "interrupted"
+
+# Source states, in the order a source moves through them
+SOURCE_EXTRACTED = "extracted"
+SOURCE_SPLIT = "split"
+SOURCE_STORED = "stored"
+SOURCE_FAILED = "failed"
+
+# Batch states
+BATCH_EMBEDDING = "embedding"
+BATCH_STORED = "stored"
+BATCH_FAILED = "failed"
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class IngestJournal:
+    """Ingestion jobs and their progress, kept in a SQLite database in WAL mode.
+
+    A job records what was ingested (the loader kind, target and options) so
+    it can be run again by id. While it runs, every source is recorded as it
+    is extracted, split and stored, and every batch with its chunk ids as it
+    is embedded and stored.
+    """
+
+    def __init__(self, persist_directory: str):
+        """Open the journal.
+
+        Args:
+            persist_directory: Vector store directory holding the database
+        """
+        directory = Path(persist_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / INGEST_JOURNAL_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        """Create journal tables if they don't exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_sources (
+                    job_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    chunks INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (job_id, source)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_batches (
+                    job_id TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    batch INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    chunk_ids TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    error TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (job_id, attempt, batch)
+                )
+                """
+            )
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        """Run a write statement in its own transaction."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(sql, params)
+
+    def start_job(
+        self,
+        kind: str,
+        target: str,
+        collection: str,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> "IngestJob":
+        """Record a new ingestion job.
+
+        Args:
+            kind: Loader the job runs ("url", "file", "directory" or "github")
+            target: URL, path or repository being ingested
+            collection: Collection the job writes to
+            options: Loader options needed to run the job again
+
+        Returns:
+            The running job
+        """
+        job_id = uuid.uuid4().hex[:12]
+        now = _now()
+        self._execute(
+            "INSERT INTO jobs (id, kind, target, collection, options, status, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                kind,
+                target,
+                collection,
+                json.dumps(options or {}),
+                JOB_RUNNING,
+                now,
+                now,
+            ),
+        )
+        logger.info("Started ingestion job %s", job_id)
+        return IngestJob(self, self.get_job(job_id))
+
+    def resume_job(self, job_id: str) -> "IngestJob":
+        """Mark an unfinished job as running again.
+
+        Raises:
+            ValueError: If the job does not exist or has already completed
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Ingestion job '{job_id}' not found")
+        if job["status"] == JOB_COMPLETED:
+            raise ValueError(f"Ingestion job '{job_id}' has already completed")
+        self._execute(
+            "UPDATE jobs SET status = ?, attempts = attempts + 1, error = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (JOB_RUNNING, _now(), job_id),
+        )
+        job = self.get_job(job_id)
+        logger.info("Resuming ingestion job %s (attempt %d)", job_id, job["attempts"])
+        return IngestJob(self, job, self.get_sources(job_id, SOURCE_STORED))
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its source and batch counts."""
+        jobs = self._select_jobs("WHERE id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """List the most recently updated jobs."""
+        return self._select_jobs("ORDER BY updated_at DESC LIMIT ?", (limit,))
+
+    def _select_jobs(self, clause: str, params: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, target, collection, options, status, attempts, "
+                "error, created_at, updated_at, "
+                "(SELECT COUNT(*) FROM job_sources s WHERE s.job_id = jobs.id "
+                "AND s.state = 'stored'), "
+                "(SELECT COUNT(*) FROM job_sources s WHERE s.job_id = jobs.id), "
+                "(SELECT COUNT(*) FROM job_batches b WHERE b.job_id = jobs.id "
+                "AND b.state = 'stored') "
+                f"FROM jobs {clause}",
+                params,
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "kind": row[1],
+                "target": row[2],
+                "collection": row[3],
+                "options": json.loads(row[4]),
+                "status": row[5],
+                "attempts": row[6],
+                "error": row[7],
+                "created_at": row[8],
+                "updated_at": row[9],
+                "stored_sources": row[10],
+                "sources": row[11],
+                "stored_batches": row[12],
+            }
+            for row in rows
+        ]
+
+    def get_sources(self, job_id: str, state: Optional[str] = None) -> Set[str]:
+        """Get the sources of a job, optionally only those in one state."""
+        sql = "SELECT source FROM job_sources WHERE job_id = ?"
+        params: tuple = (job_id,)
+        if state is not None:
+            sql += " AND state = ?"
+            params += (state,)
+        with self._lock:
+            return {row[0] for row in self._conn.execute(sql, params)}
+
+    def get_batches(self, job_id: str) -> List[Dict[str, Any]]:
+        """Get the batches of a job in the order they were started."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT attempt, batch, state, chunk_ids, tokens, error "
+                "FROM job_batches WHERE job_id = ? ORDER BY attempt, batch",
+                (job_id,),
+            ).fetchall()
+        return [
+            {
+                "attempt": attempt,
+                "batch": batch,
+                "state": state,
+                "chunk_ids": json.loads(chunk_ids),
+                "tokens": tokens,
+                "error": error,
+            }
+            for attempt, batch, state, chunk_ids, tokens, error in rows
+        ]
+
+    def set_source_state(
+        self, job_id: str, source: str, state: str, chunks: int
+    ) -> None:
+        """Record the state of one source of a job."""
+        self._execute(
+            "INSERT INTO job_sources (job_id, source, state, chunks, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (job_id, source) DO UPDATE SET "
+            "state = excluded.state, chunks = excluded.chunks, "
+            "updated_at = excluded.updated_at",
+            (job_id, source, state, chunks, _now()),
+        )
+
+    def set_batch_state(
+        self,
+        job_id: str,
+        attempt: int,
+        batch: int,
+        state: str,
+        chunk_ids: Optional[List[str]] = None,
+        tokens: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record a new batch of a job, or a change of its state."""
+        if chunk_ids is not None:
+            self._execute(
+                "INSERT OR REPLACE INTO job_batches (job_id, attempt, batch, state, "
+                "chunk_ids, tokens, error, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    attempt,
+                    batch,
+                    state,
+                    json.dumps(chunk_ids),
+                    tokens,
+                    error,
+                    _now(),
+                ),
+            )
+        else:
+            self._execute(
+                "UPDATE job_batches SET state = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ? AND attempt = ? AND batch = ?",
+                (state, error, _now(), job_id, attempt, batch),
+            )
+
+    def set_job_status(
+        self, job_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        """Record the outcome of a job."""
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status, error, _now(), job_id),
+        )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class IngestJob:
+    """One run of an ingestion job, recording its progress in the journal.
+
+    ``VectorStore.add_documents`` reports documents, chunks and batches to
+    the job as they move through the pipeline. A source is recorded as
+    stored once the loader has moved on to another source and every chunk
+    queued for it has been written. Use the job as a context manager to
+    record whether the run completed, failed or was interrupted.
+    """
+
+    def __init__(
+        self,
+        journal: IngestJournal,
+        job: Dict[str, Any],
+        stored_sources: Optional[Set[str]] = None,
+    ):
+        self.journal = journal
+        self.id: str = job["id"]
+        self.kind: str = job["kind"]
+        self.target: str = job["target"]
+        self.collection: str = job["collection"]
+        self.options: Dict[str, Any] = job["options"]
+        self.attempt: int = job["attempts"]
+        # Sources stored by earlier runs of the job
+        self.stored_sources: Set[str] = set(stored_sources or ())
+        self.failed_batches = 0
+        self._current: Optional[str] = None
+        self._chunks: Dict[str, int] = {}
+        # Chunks queued for each source that are not stored yet
+        self._outstanding: Dict[str, int] = {}
+        self._failed: Set[str] = set()
+        self._batches: Dict[int, List[Optional[str]]] = {}
+
+    def skip_stored(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Drop documents of sources that earlier runs of the job stored."""
+        skipped: Set[str] = set()
+        for document in documents:
+            source = document.metadata.get("source")
+            if source in self.stored_sources:
+                if source not in skipped:
+                    skipped.add(source)
+                    logger.debug("Skipping source stored by an earlier run: %s", source)
+                continue
+            yield document
+        if skipped:
+            logger.info("Skipped %d sources stored by an earlier run", len(skipped))
+
+    def document_loaded(self, source: Optional[str]) -> None:
+        """Record that a document of a source has been extracted."""
+        if source == self._current:
+            return
+        self._finish_source()
+        self._current = source
+        if source is not None and source not in self._chunks:
+            self._chunks[source] = 0
+            self.journal.set_source_state(self.id, source, SOURCE_EXTRACTED, 0)
+
+    def document_split(self, source: Optional[str], chunks: int, queued: int) -> None:
+        """Record a document's chunk count and how many of them need embedding."""
+        if source is None:
+            return
+        self._chunks[source] = self._chunks.get(source, 0) + chunks
+        self._outstanding[source] = self._outstanding.get(source, 0) + queued
+
+    def _finish_source(self) -> None:
+        """Record that the loader has moved past the current source."""
+        source = self._current
+        self._current = None
+        if source is not None:
+            self.journal.set_source_state(
+                self.id, source, SOURCE_SPLIT, self._chunks.get(source, 0)
+            )
+            self._check_stored(source)
+
+    def _check_stored(self, source: str) -> None:
+        """Record a source as stored once nothing is pending for it."""
+        if (
+            source == self._current
+            or source in self._failed
+            or self._outstanding.get(source, 0) > 0
+        ):
+            return
+        self._outstanding.pop(source, None)
+        self.journal.set_source_state(
+            self.id, source, SOURCE_STORED, self._chunks.pop(source, 0)
+        )
+
+    def batch_started(self, batch: int, chunks: List[Document], tokens: int) -> None:
+        """Record a batch submitted for embedding."""
+        self._batches[batch] = [chunk.metadata.get("source") for chunk in chunks]
+        self.journal.set_batch_state(
+            self.id,
+            self.attempt,
+            batch,
+            BATCH_EMBEDDING,
+            chunk_ids=[chunk.id for chunk in chunks],
+            tokens=tokens,
+        )
+
+    def batch_finished(self, batch: int, error: Optional[BaseException] = None) -> None:
+        """Record a batch as stored, or as failed with its error."""
+        state = BATCH_FAILED if error is not None else BATCH_STORED
+        self.journal.set_batch_state(
+            self.id,
+            self.attempt,
+            batch,
+            state,
+            error=str(error) if error is not None else None,
+        )
+        sources = set()
+        for source in self._batches.pop(batch, []):
+            if source is None:
+                continue
+            self._outstanding[source] = self._outstanding.get(source, 0) - 1
+            sources.add(source)
+        if error is not None:
+            self.failed_batches += 1
+            for source in sources:
+                self._failed.add(source)
+                self.journal.set_source_state(
+                    self.id, source, SOURCE_FAILED, self._chunks.get(source, 0)
+                )
+            return
+        for source in sources:
+            self._check_stored(source)
+
+    def finish(self, error: Optional[BaseException] = None) -> str:
+        """Record the outcome of this run.
+
+        Returns:
+            The job status
+        """
+        if error is None:
+            self._finish_source()
+        if isinstance(error, KeyboardInterrupt):
+            status, message = JOB_INTERRUPTED, "Interrupted"
+        elif error is not None:
+            status, message = JOB_FAILED, str(error)
+        elif self.failed_batches:
+            status = JOB_FAILED
+            message = f"{self.failed_batches} batches failed"
+        else:
+            status, message = JOB_COMPLETED, None
+        self.journal.set_job_status(self.id, status, message)
+        if status != JOB_COMPLETED:
+            logger.warning(
+                "Ingestion job %s %s; resume it with: rag-retriever --resume %s",
+                self.id,
+                status,
+                self.id,
+            )
+        return status
+
+    def __enter__(self) -> "IngestJob":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        self.finish(exc)
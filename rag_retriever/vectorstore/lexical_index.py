@@ -0,0 +1,331 @@
+"""SQLite FTS5 lexical index of stored chunks."""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+LEXICAL_INDEX_FILE = "lexical_index.sqlite3"
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Each whitespace-separated term becomes a quoted phrase of its word
+    tokens, so identifiers such as ``vector_store.batch_size`` or ``E1234``
+    match as written and FTS5 operators in user input are not interpreted.
+    Terms are OR-ed together and ranked by BM25.
+    """
+    phrases = []
+    for term in query.split():
+        tokens = _TOKEN_PATTERN.findall(term)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " OR ".join(phrases) if phrases else None
+
+
+_COMPARISONS = {
+    "$eq": "=",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+
+def _where_sql(where: Dict[str, Any], params: List[Any]) -> str:
+    """Translate a Chroma ``where`` filter into SQL over the metadata column."""
+    clauses = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [_where_sql(part, params) for part in condition]
+            clauses.append("(" + f" {key[1:].upper()} ".join(parts) + ")")
+            continue
+
+        field = "json_extract(metadata, ?)"
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for operator, value in condition.items():
+            params.append(f'$."{key}"')
+            if operator in _COMPARISONS:
+                clauses.append(f"{field} {_COMPARISONS[operator]} ?")
+                params.append(value)
+            elif operator in ("$in", "$nin"):
+                negate = "NOT " if operator == "$nin" else ""
+                clauses.append(f"{field} {negate}IN ({','.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                raise ValueError(f"Unsupported metadata filter operator: {operator}")
+    return " AND ".join(clauses) if clauses else "1"
+
+
+def _where_document_sql(where_document: Dict[str, Any], params: List[Any]) -> str:
+    """Translate a Chroma ``where_document`` filter into SQL over chunk text."""
+    clauses = []
+    for operator, value in where_document.items():
+        if operator in ("$and", "$or"):
+            parts = [_where_document_sql(part, params) for part in value]
+            clauses.append("(" + f" {operator[1:].upper()} ".join(parts) + ")")
+        elif operator in ("$contains", "$not_contains"):
+            negate = "= 0" if operator == "$not_contains" else "> 0"
+            clauses.append(f"instr(content, ?) {negate}")
+            params.append(value)
+        else:
+            raise ValueError(f"Unsupported document filter operator: {operator}")
+    return " AND ".join(clauses) if clauses else "1"
+
+
+class LexicalIndex:
+    """BM25 keyword index over chunk text, kept in sync with the vector store.
+
+    All collections share one SQLite database in the vector store directory.
+    Underscores are treated as part of a token so code identifiers are
+    indexed whole. FTS5 cannot index its ``chunk_id`` and ``collection``
+    columns, so an ordinary table maps each (collection, chunk id) to its
+    FTS rowid and another keeps per-collection counts, which keeps writes
+    and counts from scanning the whole index.
+    """
+
+    def __init__(self, persist_directory: str):
+        """Initialize the index.
+
+        Args:
+            persist_directory: Vector store directory holding the database
+        """
+        directory = Path(persist_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / LEXICAL_INDEX_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            upgrade = not self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'chunk_rows'"
+            ).fetchone()
+            self._conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+                    content,
+                    chunk_id UNINDEXED,
+                    collection UNINDEXED,
+                    metadata UNINDEXED,
+                    tokenize = "unicode61 tokenchars '_'"
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunk_rows (
+                    row INTEGER PRIMARY KEY,
+                    collection TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    UNIQUE (collection, chunk_id)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS collection_counts (
+                    collection TEXT PRIMARY KEY,
+                    chunks INTEGER NOT NULL
+                )
+                """
+            )
+            if upgrade:
+                self._index_existing_rows()
+
+    def _index_existing_rows(self) -> None:
+        """Fill the row and count tables of an index created before they existed.
+
+        Duplicate entries of a chunk, which older versions could leave behind,
+        are dropped. Caller must hold a transaction.
+        """
+        self._conn.execute(
+            "INSERT OR IGNORE INTO chunk_rows (row, collection, chunk_id) "
+            "SELECT rowid, collection, chunk_id FROM chunks"
+        )
+        self._conn.execute(
+            "DELETE FROM chunks WHERE rowid NOT IN (SELECT row FROM chunk_rows)"
+        )
+        self._conn.execute(
+            "INSERT INTO collection_counts (collection, chunks) "
+            "SELECT collection, COUNT(*) FROM chunk_rows GROUP BY collection"
+        )
+
+    def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        """Index chunks, replacing any existing entries with the same ids."""
+        # The last entry wins when an id is repeated within a batch
+        entries = {
+            id_: (text, json.dumps(metadata or {}))
+            for id_, text, metadata in zip(ids, texts, metadatas)
+        }
+        with self._lock:
+            with self._conn:
+                existing = self._row_ids(collection, list(entries))
+                self._delete_rows(list(existing.values()))
+                self._conn.executemany(
+                    "INSERT INTO chunk_rows (collection, chunk_id) VALUES (?, ?)",
+                    [(collection, id_) for id_ in entries if id_ not in existing],
+                )
+                rows = self._row_ids(collection, list(entries))
+                self._conn.executemany(
+                    "INSERT INTO chunks "
+                    "(rowid, content, chunk_id, collection, metadata) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (rows[id_], text, id_, collection, metadata)
+                        for id_, (text, metadata) in entries.items()
+                    ],
+                )
+                self._add_count(collection, len(entries) - len(existing))
+
+    def _row_ids(self, collection: str, ids: List[str]) -> Dict[str, int]:
+        """Look up the FTS rowids of indexed chunks. Caller must hold the lock."""
+        rows: Dict[str, int] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.update(
+                self._conn.execute(
+                    "SELECT chunk_id, row FROM chunk_rows "
+                    f"WHERE collection = ? AND chunk_id IN ({placeholders})",
+                    [collection, *chunk],
+                ).fetchall()
+            )
+        return rows
+
+    def _delete_rows(self, rows: List[int]) -> None:
+        """Delete FTS entries by rowid. Caller must hold the lock and a transaction."""
+        for i in range(0, len(rows), 500):
+            chunk = rows[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(
+                f"DELETE FROM chunks WHERE rowid IN ({placeholders})", chunk
+            )
+
+    def _add_count(self, collection: str, delta: int) -> None:
+        """Adjust a collection's chunk count. Caller must hold a transaction."""
+        if delta:
+            self._conn.execute(
+                "INSERT INTO collection_counts (collection, chunks) VALUES (?, ?) "
+                "ON CONFLICT (collection) "
+                "DO UPDATE SET chunks = chunks + excluded.chunks",
+                (collection, delta),
+            )
+
+    def delete(self, collection: str, ids: List[str]) -> None:
+        """Remove chunks from the index."""
+        with self._lock:
+            with self._conn:
+                rows = list(self._row_ids(collection, list(set(ids))).values())
+                self._delete_rows(rows)
+                for i in range(0, len(rows), 500):
+                    chunk = rows[i : i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    self._conn.execute(
+                        f"DELETE FROM chunk_rows WHERE row IN ({placeholders})", chunk
+                    )
+                self._add_count(collection, -len(rows))
+
+    def delete_collection(self, collection: str) -> None:
+        """Remove every chunk of a collection from the index."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM chunks WHERE rowid IN "
+                    "(SELECT row FROM chunk_rows WHERE collection = ?)",
+                    (collection,),
+                )
+                self._conn.execute(
+                    "DELETE FROM chunk_rows WHERE collection = ?", (collection,)
+                )
+                self._conn.execute(
+                    "DELETE FROM collection_counts WHERE collection = ?", (collection,)
+                )
+
+    def count(self, collection: str) -> int:
+        """Number of indexed chunks in a collection."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks FROM collection_counts WHERE collection = ?",
+                (collection,),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        collections: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, str, str, Dict[str, Any], float]]:
+        """Find chunks matching query terms, best BM25 match first.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            collections: Optional collections to restrict the search to
+            where: Optional Chroma-style metadata filter
+            where_document: Optional Chroma-style document text filter
+
+        Returns:
+            List of (collection, chunk id, text, metadata, score) tuples, where
+            score is the BM25 relevance mapped into [0, 1)
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT collection, chunk_id, content, metadata, bm25(chunks) AS rank "
+            "FROM chunks WHERE chunks MATCH ?"
+        )
+        params: List[Any] = [match]
+        if collections is not None:
+            sql += f" AND collection IN ({','.join('?' * len(collections))})"
+            params.extend(collections)
+        if where:
+            sql += " AND " + _where_sql(where, params)
+        if where_document:
+            sql += " AND " + _where_document_sql(where_document, params)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = []
+        for collection, chunk_id, content, metadata, rank in rows:
+            relevance = -rank  # bm25() is lower for better matches
+            results.append(
+                (
+                    collection,
+                    chunk_id,
+                    content,
+                    json.loads(metadata),
+                    relevance / (1.0 + relevance) if relevance > 0 else 0.0,
+                )
+            )
+        return results
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
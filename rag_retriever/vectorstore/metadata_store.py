@@ -0,0 +1,475 @@
+"""SQLite-backed storage for collection and per-source metadata."""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rag_retriever.vectorstore.embeddings import EmbeddingSpec
+
+logger = logging.getLogger(__name__)
+
+# Constants
+METADATA_DB_FILE = "collection_metadata.sqlite3"
+LEGACY_METADATA_FILE = "collection_metadata.json"
+
+
+class CollectionMetadata:
+    """Collection metadata storage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.created_at = datetime.now(UTC).isoformat()
+        self.last_modified = self.created_at
+        self.document_count = 0
+        self.total_chunks = 0
+        self.description = ""
+        # Embedding provider that built the collection (None until first write)
+        self.embedding_provider: Optional[str] = None
+        self.embedding_model: Optional[str] = None
+        self.embedding_dimensions: Optional[int] = None
+        # Chroma collection holding the vectors (None when it is the name)
+        self.storage_name: Optional[str] = None
+        # Number of shard worker processes (0 when the collection is not sharded)
+        self.shard_count = 0
+
+    @property
+    def embedding_spec(self) -> Optional[EmbeddingSpec]:
+        """Get the embedding spec recorded for the collection, if any."""
+        if self.embedding_provider is None:
+            return None
+        return EmbeddingSpec(
+            self.embedding_provider, self.embedding_model, self.embedding_dimensions
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metadata to dictionary."""
+        return {
+            "name": self.name,
+            "created_at": self.created_at,
+            "last_modified": self.last_modified,
+            "document_count": self.document_count,
+            "total_chunks": self.total_chunks,
+            "description": self.description,
+            "embedding_provider": self.embedding_provider,
+            "embedding_model": self.embedding_model,
+            "embedding_dimensions": self.embedding_dimensions,
+            "storage_name": self.storage_name,
+            "shard_count": self.shard_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CollectionMetadata":
+        """Create metadata instance from dictionary."""
+        instance = cls(data["name"])
+        instance.created_at = data["created_at"]
+        instance.last_modified = data["last_modified"]
+        instance.document_count = data["document_count"]
+        instance.total_chunks = data["total_chunks"]
+        instance.description = data.get("description", "")
+        instance.embedding_provider = data.get("embedding_provider")
+        instance.embedding_model = data.get("embedding_model")
+        instance.embedding_dimensions = data.get("embedding_dimensions")
+        instance.storage_name = data.get("storage_name")
+        instance.shard_count = data.get("shard_count") or 0
+        return instance
+
+
+class MetadataStore:
+    """Collection metadata kept in a SQLite database in WAL mode.
+
+    Counters are updated with single UPDATE statements, so several processes
+    (for example the CLI and the MCP server) can ingest into the same vector
+    store without overwriting each other's changes. An existing
+    ``collection_metadata.json`` file is imported on first use.
+    """
+
+    _FIELDS = (
+        "name",
+        "created_at",
+        "last_modified",
+        "document_count",
+        "total_chunks",
+        "description",
+        "embedding_provider",
+        "embedding_model",
+        "embedding_dimensions",
+        "storage_name",
+        "shard_count",
+    )
+    _COLUMNS = ", ".join(_FIELDS)
+
+    def __init__(self, persist_directory: str):
+        """Initialize the store.
+
+        Args:
+            persist_directory: Vector store directory holding the database
+        """
+        directory = Path(persist_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / METADATA_DB_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._import_legacy_file(directory / LEGACY_METADATA_FILE)
+
+    def _create_tables(self) -> None:
+        """Create metadata tables if they don't exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS collections (
+                    name TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    last_modified TEXT NOT NULL,
+                    document_count INTEGER NOT NULL DEFAULT 0,
+                    total_chunks INTEGER NOT NULL DEFAULT 0,
+                    description TEXT NOT NULL DEFAULT '',
+                    embedding_provider TEXT,
+                    embedding_model TEXT,
+                    embedding_dimensions INTEGER,
+                    storage_name TEXT,
+                    shard_count INTEGER NOT NULL DEFAULT 0,
+                    generation INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            # Add columns introduced after the table was first created
+            existing = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(collections)")
+            }
+            for column, column_type in (
+                ("embedding_provider", "TEXT"),
+                ("embedding_model", "TEXT"),
+                ("embedding_dimensions", "INTEGER"),
+                ("storage_name", "TEXT"),
+                ("shard_count", "INTEGER NOT NULL DEFAULT 0"),
+                ("generation", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE collections ADD COLUMN {column} {column_type}"
+                    )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sources (
+                    collection TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    chunk_count INTEGER NOT NULL,
+                    ingested_at TEXT NOT NULL,
+                    PRIMARY KEY (collection, source)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS migrations (
+                    collection TEXT PRIMARY KEY,
+                    shadow TEXT NOT NULL,
+                    embedding_provider TEXT NOT NULL,
+                    embedding_model TEXT NOT NULL,
+                    embedding_dimensions INTEGER NOT NULL,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER NOT NULL,
+                    started_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    def _import_legacy_file(self, json_path: Path) -> None:
+        """Import collection_metadata.json once and keep it as a backup."""
+        if not json_path.exists():
+            return
+
+        try:
+            with open(json_path, "r") as f:
+                legacy = json.load(f)
+            for data in legacy.values():
+                self.ensure_collection(CollectionMetadata.from_dict(data))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Error parsing collection metadata: {e}")
+            return
+        except OSError as e:
+            logger.error(f"Error reading metadata file: {e}")
+            return
+
+        backup_path = json_path.with_name(json_path.name + ".bak")
+        try:
+            json_path.replace(backup_path)
+            logger.info(f"Migrated collection metadata to {self.path}")
+        except OSError as e:
+            logger.warning(f"Could not move {json_path} to {backup_path}: {e}")
+
+    @staticmethod
+    def _from_row(row: tuple) -> CollectionMetadata:
+        """Build a CollectionMetadata instance from a collections row."""
+        return CollectionMetadata.from_dict(dict(zip(MetadataStore._FIELDS, row)))
+
+    def get_collection(self, name: str) -> Optional[CollectionMetadata]:
+        """Get metadata for a collection, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM collections WHERE name = ?", (name,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def list_collections(self) -> List[CollectionMetadata]:
+        """Get metadata for every collection."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM collections ORDER BY rowid"
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def get_generations(self) -> Dict[str, Tuple[str, int]]:
+        """Get each collection's creation time and write generation.
+
+        The generation is incremented by every update that records a change
+        to a collection's chunks, so together with the creation time (which
+        distinguishes a collection recreated under the same name) it
+        identifies the collection's current contents.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, created_at, generation FROM collections"
+            ).fetchall()
+        return {name: (created_at, generation) for name, created_at, generation in rows}
+
+    def ensure_collection(self, metadata: CollectionMetadata) -> CollectionMetadata:
+        """Insert a collection if it is missing and return the stored metadata."""
+        with self._lock:
+            with self._conn:
+                values = metadata.to_dict()
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO collections ({self._COLUMNS}) "
+                    f"VALUES ({', '.join('?' * len(self._FIELDS))})",
+                    [values[field] for field in self._FIELDS],
+                )
+        return self.get_collection(metadata.name)
+
+    def increment_counts(
+        self, name: str, documents: int = 0, chunks: int = 0
+    ) -> Optional[CollectionMetadata]:
+        """Atomically add to a collection's document and chunk counters."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE collections SET document_count = MAX(0, document_count + ?), "
+                    "total_chunks = MAX(0, total_chunks + ?), last_modified = ?, "
+                    "generation = generation + 1 WHERE name = ?",
+                    (documents, chunks, datetime.now(UTC).isoformat(), name),
+                )
+        return self.get_collection(name)
+
+    def set_total_chunks(self, name: str, total_chunks: int) -> Optional[CollectionMetadata]:
+        """Record the number of chunks stored in a collection."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE collections SET total_chunks = ?, last_modified = ?, "
+                    "generation = generation + 1 WHERE name = ?",
+                    (total_chunks, datetime.now(UTC).isoformat(), name),
+                )
+        return self.get_collection(name)
+
+    def set_embedding_spec(
+        self, name: str, spec: EmbeddingSpec
+    ) -> Optional[CollectionMetadata]:
+        """Record the embedding spec of a collection unless one is already recorded."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE collections SET embedding_provider = ?, embedding_model = ?, "
+                    "embedding_dimensions = ? WHERE name = ? AND embedding_provider IS NULL",
+                    (spec.provider, spec.model, spec.dimensions, name),
+                )
+        return self.get_collection(name)
+
+    def set_descriptions(self, descriptions: Dict[str, str]) -> None:
+        """Update collection descriptions."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE collections SET description = ? WHERE name = ?",
+                    [(description, name) for name, description in descriptions.items()],
+                )
+
+    def delete_collection(self, name: str) -> None:
+        """Remove a collection, its source records and any migration in progress."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM sources WHERE collection = ?", (name,))
+                self._conn.execute("DELETE FROM migrations WHERE collection = ?", (name,))
+                self._conn.execute("DELETE FROM collections WHERE name = ?", (name,))
+
+    def record_sources(self, collection: str, chunk_counts: Dict[str, int]) -> None:
+        """Record the number of chunks stored for each ingested source."""
+        now = datetime.now(UTC).isoformat()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO sources (collection, source, chunk_count, ingested_at) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(collection, source) DO UPDATE SET "
+                    "chunk_count = excluded.chunk_count, ingested_at = excluded.ingested_at",
+                    [
+                        (collection, source, count, now)
+                        for source, count in chunk_counts.items()
+                    ],
+                )
+
+    def delete_sources(self, collection: str, sources: List[str]) -> None:
+        """Forget the records of deleted sources."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM sources WHERE collection = ? AND source = ?",
+                    [(collection, source) for source in sources],
+                )
+
+    def get_sources(self, collection: str) -> List[Dict[str, Any]]:
+        """List the sources recorded for a collection."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, chunk_count, ingested_at FROM sources "
+                "WHERE collection = ? ORDER BY source",
+                (collection,),
+            ).fetchall()
+        return [
+            {"source": source, "chunk_count": count, "ingested_at": ingested_at}
+            for source, count, ingested_at in rows
+        ]
+
+    def get_migration(self, collection: str) -> Optional[Dict[str, Any]]:
+        """Get the embedding migration in progress for a collection, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT shadow, embedding_provider, embedding_model, "
+                "embedding_dimensions, processed, total, started_at, updated_at "
+                "FROM migrations WHERE collection = ?",
+                (collection,),
+            ).fetchone()
+        if row is None:
+            return None
+        shadow, provider, model, dimensions, processed, total, started, updated = row
+        return {
+            "collection": collection,
+            "shadow": shadow,
+            "embedding_spec": EmbeddingSpec(provider, model, dimensions),
+            "processed": processed,
+            "total": total,
+            "started_at": started,
+            "updated_at": updated,
+        }
+
+    def start_migration(
+        self, collection: str, shadow: str, spec: EmbeddingSpec, total: int
+    ) -> Dict[str, Any]:
+        """Record a new embedding migration, replacing any previous one."""
+        now = datetime.now(UTC).isoformat()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO migrations (collection, shadow, "
+                    "embedding_provider, embedding_model, embedding_dimensions, "
+                    "processed, total, started_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                    (
+                        collection,
+                        shadow,
+                        spec.provider,
+                        spec.model,
+                        spec.dimensions,
+                        total,
+                        now,
+                        now,
+                    ),
+                )
+        return self.get_migration(collection)
+
+    def set_migration_progress(self, collection: str, processed: int) -> None:
+        """Checkpoint the number of records a migration has re-embedded."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE migrations SET processed = ?, updated_at = ? "
+                    "WHERE collection = ?",
+                    (processed, datetime.now(UTC).isoformat(), collection),
+                )
+
+    def finish_migration(
+        self, collection: str, total_chunks: int
+    ) -> Optional[CollectionMetadata]:
+        """Switch a collection to its migrated storage in a single transaction.
+
+        The collection's storage name and embedding spec are replaced by the
+        migration's shadow and target spec, and the migration record is removed.
+        """
+        migration = self.get_migration(collection)
+        if migration is None:
+            raise ValueError(f"No migration in progress for collection '{collection}'")
+        spec = migration["embedding_spec"]
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE collections SET storage_name = ?, embedding_provider = ?, "
+                    "embedding_model = ?, embedding_dimensions = ?, total_chunks = ?, "
+                    "last_modified = ?, generation = generation + 1 WHERE name = ?",
+                    (
+                        migration["shadow"],
+                        spec.provider,
+                        spec.model,
+                        spec.dimensions,
+                        total_chunks,
+                        datetime.now(UTC).isoformat(),
+                        collection,
+                    ),
+                )
+                self._conn.execute(
+                    "DELETE FROM migrations WHERE collection = ?", (collection,)
+                )
+        return self.get_collection(collection)
+
+    def set_storage(
+        self, collection: str, storage_name: str, shard_count: int, total_chunks: int
+    ) -> Optional[CollectionMetadata]:
+        """Switch a collection to another storage and shard count in one update."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE collections SET storage_name = ?, shard_count = ?, "
+                    "total_chunks = ?, last_modified = ?, generation = generation + 1 "
+                    "WHERE name = ?",
+                    (
+                        storage_name,
+                        shard_count,
+                        total_chunks,
+                        datetime.now(UTC).isoformat(),
+                        collection,
+                    ),
+                )
+        return self.get_collection(collection)
+
+    def storage_names(self) -> Dict[str, str]:
+        """Map Chroma collections used as storage or shadows to their collection.
+
+        Collections stored under their own name are not included.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT storage_name, name FROM collections "
+                "WHERE storage_name IS NOT NULL AND storage_name != name "
+                "UNION ALL SELECT shadow, collection FROM migrations"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
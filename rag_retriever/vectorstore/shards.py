@@ -0,0 +1,451 @@
+"""Hash-partitioned collections served by one worker process per shard.
+
+A sharded collection keeps its chunks in N independent Chroma databases
+under ``_shards/<storage name>/<shard>``. Every shard is opened by exactly
+one worker process, which holds that shard's HNSW index in its own memory
+and performs all reads and writes for it. Chunks are assigned to shards by
+a hash of their id.
+
+``ShardedCollection`` implements the subset of the Chroma collection API
+used by the vector store (``count``, ``get``, ``upsert``, ``add``,
+``update``, ``delete`` and ``query``), so a sharded collection is used like any other.
+Queries are scattered to every shard in parallel and the per-shard top-k
+results are merged.
+"""
+
+import hashlib
+import heapq
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SHARDS_DIR = "_shards"
+DEFAULT_START_METHOD = "spawn"
+
+# Chroma collection served by this process when it is a shard worker
+_shard_collection: Any = None
+
+
+def shard_for(record_id: str, shard_count: int) -> int:
+    """Get the shard a record id belongs to."""
+    digest = hashlib.blake2b(record_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def shard_root(vectorstore_path: Path, storage_name: str) -> Path:
+    """Get the directory holding the shards of a collection's storage."""
+    return Path(vectorstore_path) / SHARDS_DIR / storage_name
+
+
+def delete_shards(vectorstore_path: Path, storage_name: str) -> bool:
+    """Delete the shards of a collection's storage.
+
+    Returns:
+        True if shards were found and deleted
+    """
+    root = shard_root(vectorstore_path, storage_name)
+    if not root.exists():
+        return False
+    shutil.rmtree(root)
+    return True
+
+
+def _directory_size(path: Path) -> int:
+    """Total size in bytes of the files under a directory."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _open_shard(path: str, name: str, metadata: Dict[str, Any]) -> None:
+    """Open the shard served by this worker process."""
+    global _shard_collection
+
+    import chromadb
+
+    client = chromadb.PersistentClient(path=path)
+    _shard_collection = client.get_or_create_collection(name, metadata=metadata)
+
+
+def _call_shard(method: str, kwargs: Dict[str, Any]) -> Any:
+    """Run a Chroma collection method on this worker's shard."""
+    return getattr(_shard_collection, method)(**kwargs)
+
+
+def _worker_pid() -> int:
+    """Get the process id of this worker."""
+    return os.getpid()
+
+
+class ShardedCollection:
+    """Chroma collection facade that scatters calls to shard workers."""
+
+    def __init__(self, client: "ShardedClient"):
+        self._client = client
+        self.name = client.storage_name
+        self.metadata = client.metadata
+
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return self._client.shard_count
+
+    def _scatter(
+        self, calls: Dict[int, Dict[str, Any]], method: str
+    ) -> Dict[int, Any]:
+        """Call a method on several shards in parallel.
+
+        Args:
+            calls: Keyword arguments for each shard to call
+            method: Chroma collection method name
+
+        Returns:
+            Each called shard's result
+        """
+        futures = {
+            shard: self._client.submit(shard, _call_shard, method, kwargs)
+            for shard, kwargs in calls.items()
+        }
+        return {shard: future.result() for shard, future in futures.items()}
+
+    def _partition(self, ids: Sequence[str]) -> Dict[int, List[int]]:
+        """Group positions of ids by the shard each id belongs to."""
+        positions: Dict[int, List[int]] = {}
+        for position, record_id in enumerate(ids):
+            positions.setdefault(shard_for(record_id, self.shard_count), []).append(
+                position
+            )
+        return positions
+
+    def count(self) -> int:
+        """Count records across all shards."""
+        return sum(self.counts())
+
+    def counts(self) -> List[int]:
+        """Count records in each shard."""
+        shards = range(self.shard_count)
+        results = self._scatter({shard: {} for shard in shards}, "count")
+        return [results[shard] for shard in shards]
+
+    def _write(
+        self,
+        method: str,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Any]] = None,
+        documents: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """Route records to their shards with an add, upsert or update call."""
+        calls = {}
+        for shard, positions in self._partition(ids).items():
+            kwargs: Dict[str, Any] = {"ids": [ids[p] for p in positions]}
+            if embeddings is not None:
+                kwargs["embeddings"] = [embeddings[p] for p in positions]
+            if metadatas is not None:
+                kwargs["metadatas"] = [metadatas[p] for p in positions]
+            if documents is not None:
+                kwargs["documents"] = [documents[p] for p in positions]
+            calls[shard] = kwargs
+        self._scatter(calls, method)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Any]] = None,
+        documents: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """Insert or update records in their shards."""
+        self._write("upsert", ids, embeddings, metadatas, documents)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Any]] = None,
+        documents: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """Add records to their shards."""
+        self._write("add", ids, embeddings, metadatas, documents)
+
+    def update(
+        self,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Any]] = None,
+        documents: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """Update existing records in their shards."""
+        self._write("update", ids, embeddings, metadatas, documents)
+
+    def delete(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Delete records by id or filter from every shard holding them."""
+        filters = {"where": where, "where_document": where_document}
+        if ids is not None:
+            calls = {
+                shard: {"ids": [ids[p] for p in positions], **filters}
+                for shard, positions in self._partition(ids).items()
+            }
+        else:
+            calls = {shard: dict(filters) for shard in range(self.shard_count)}
+        self._scatter(calls, "delete")
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("metadatas", "documents"),
+    ) -> Dict[str, Any]:
+        """Get records from the shards.
+
+        Records are returned in shard order, so paging with limit and offset
+        over an unchanged collection visits every record once.
+        """
+        filters = {
+            "where": where,
+            "where_document": where_document,
+            "include": list(include),
+        }
+        offset = offset or 0
+
+        unfiltered = ids is None and where is None and where_document is None
+        if unfiltered and limit is not None:
+            # Translate the global page into pages of the shards it spans
+            calls = {}
+            start = 0
+            for shard, count in enumerate(self.counts()):
+                stop = start + count
+                if stop > offset and start < offset + limit:
+                    local_offset = max(0, offset - start)
+                    local_stop = min(count, offset + limit - start)
+                    calls[shard] = {
+                        "limit": local_stop - local_offset,
+                        "offset": local_offset,
+                        **filters,
+                    }
+                start = stop
+            return self._concat(self._scatter(calls, "get"), filters["include"])
+
+        if ids is not None:
+            calls = {
+                shard: {"ids": [ids[p] for p in positions], **filters}
+                for shard, positions in self._partition(ids).items()
+            }
+        else:
+            # Each shard's first offset + limit matches are enough for the page
+            prefix = None if limit is None else offset + limit
+            calls = {
+                shard: {"limit": prefix, **filters} for shard in range(self.shard_count)
+            }
+        result = self._concat(self._scatter(calls, "get"), filters["include"])
+        if offset or limit is not None:
+            stop = None if limit is None else offset + limit
+            for key, values in result.items():
+                if key != "included" and values is not None:
+                    result[key] = values[offset:stop]
+        return result
+
+    @staticmethod
+    def _concat(
+        results: Dict[int, Dict[str, Any]], include: List[str]
+    ) -> Dict[str, Any]:
+        """Concatenate get results of several shards in shard order."""
+        merged: Dict[str, Any] = {
+            "ids": [],
+            "embeddings": None,
+            "documents": None,
+            "uris": None,
+            "data": None,
+            "metadatas": None,
+            "included": include,
+        }
+        parts = [results[shard] for shard in sorted(results)]
+        for part in parts:
+            merged["ids"].extend(part["ids"])
+        for key in ("documents", "uris", "data", "metadatas"):
+            if key in include:
+                merged[key] = [value for part in parts for value in part[key] or []]
+        if "embeddings" in include:
+            vectors = [
+                np.asarray(part["embeddings"]) for part in parts if len(part["ids"])
+            ]
+            merged["embeddings"] = (
+                np.concatenate(vectors) if vectors else np.empty((0, 0), np.float32)
+            )
+        return merged
+
+    def query(
+        self,
+        query_embeddings: Any,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("metadatas", "documents", "distances"),
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Query every shard and merge their nearest neighbours.
+
+        Each shard returns its own top n_results, so the merged top
+        n_results are exact with respect to the per-shard indexes. Queries
+        must be given as embeddings.
+        """
+        if any(value is not None for value in kwargs.values()):
+            raise ValueError("Sharded collections can only be queried by embedding")
+        # A single embedding may be passed on its own, as Chroma allows
+        query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        if query_embeddings.ndim == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
+        include = list(include)
+        if "distances" not in include:
+            include.append("distances")
+        shard_kwargs = {
+            "query_embeddings": query_embeddings.tolist(),
+            "n_results": n_results,
+            "where": where,
+            "where_document": where_document,
+            "include": include,
+        }
+        results = self._scatter(
+            {shard: shard_kwargs for shard in range(self.shard_count)}, "query"
+        )
+
+        keys = ["ids"] + [key for key in include if key != "uris"]
+        merged: Dict[str, Any] = {
+            "ids": [],
+            "embeddings": None,
+            "documents": None,
+            "uris": None,
+            "data": None,
+            "metadatas": None,
+            "distances": None,
+            "included": include,
+        }
+        for key in keys:
+            if key != "ids":
+                merged[key] = []
+        for query_index in range(len(query_embeddings)):
+            candidates = [
+                (distance, shard, position)
+                for shard, result in results.items()
+                for position, distance in enumerate(result["distances"][query_index])
+            ]
+            best = heapq.nsmallest(n_results, candidates)
+            for key in keys:
+                merged[key].append(
+                    [
+                        results[shard][key][query_index][position]
+                        for _, shard, position in best
+                    ]
+                )
+        return merged
+
+
+class ShardedClient:
+    """Start and own the worker processes of one sharded collection.
+
+    Quacks like the Chroma client expected by the LangChain wrapper, which
+    only needs ``get_or_create_collection``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        storage_name: str,
+        shard_count: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        start_method: str = DEFAULT_START_METHOD,
+    ):
+        """Start one worker process per shard.
+
+        Args:
+            root: Directory holding the shards
+            storage_name: Chroma collection name used inside every shard
+            shard_count: Number of shards
+            metadata: Chroma collection metadata for new shards
+            start_method: Multiprocessing start method for the workers
+        """
+        if shard_count < 1:
+            raise ValueError("A sharded collection needs at least one shard")
+        self.root = Path(root)
+        self.storage_name = storage_name
+        self.shard_count = shard_count
+        self.metadata = {"hnsw:space": "cosine", **(metadata or {})}
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: List[Optional[ProcessPoolExecutor]] = [None] * shard_count
+        for shard in range(shard_count):
+            self._start_worker(shard)
+        self._collection = ShardedCollection(self)
+
+    def _start_worker(self, shard: int) -> ProcessPoolExecutor:
+        """Start the worker process serving a shard."""
+        path = self.root / str(shard)
+        os.makedirs(path, exist_ok=True)
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._context,
+            initializer=_open_shard,
+            initargs=(str(path), self.storage_name, self.metadata),
+        )
+        self._workers[shard] = worker
+        return worker
+
+    def submit(self, shard: int, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run a function in a shard's worker, restarting the worker if it died."""
+        worker = self._workers[shard]
+        if worker is None:
+            raise RuntimeError(f"Sharded collection '{self.storage_name}' is closed")
+        try:
+            return worker.submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning(
+                "Worker for shard %d of '%s' died, restarting it",
+                shard,
+                self.storage_name,
+            )
+            worker.shutdown(wait=False)
+            return self._start_worker(shard).submit(fn, *args)
+
+    def get_or_create_collection(self, name: str, **kwargs: Any) -> ShardedCollection:
+        """Get the sharded collection served by this client."""
+        return self._collection
+
+    def get_collection(self, name: str, **kwargs: Any) -> ShardedCollection:
+        """Get the sharded collection served by this client."""
+        return self._collection
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get the chunk count, disk size and worker process of every shard."""
+        counts = self._collection.counts()
+        pids = [self.submit(shard, _worker_pid) for shard in range(self.shard_count)]
+        return [
+            {
+                "shard": shard,
+                "chunks": counts[shard],
+                "size_bytes": _directory_size(self.root / str(shard)),
+                "pid": pids[shard].result(),
+            }
+            for shard in range(self.shard_count)
+        ]
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for shard, worker in enumerate(self._workers):
+            if worker is not None:
+                worker.shutdown(wait=True)
+                self._workers[shard] = None
@@ -0,0 +1,183 @@
+"""Portable columnar snapshots of collections.
+
+A snapshot is a directory holding:
+
+- ``records.parquet``: chunk ids, texts and JSON-encoded metadata
+- ``vectors.npy``: float32 embeddings, one row per record, memory-mappable
+- ``manifest.json``: format version, collection details and embedding spec,
+  written last so an interrupted export is never mistaken for a complete one
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+RECORDS_FILE = "records.parquet"
+VECTORS_FILE = "vectors.npy"
+DEFAULT_SNAPSHOT_BATCH_SIZE = 5000
+
+
+def _import_pyarrow() -> Tuple[Any, Any]:
+    """Import pyarrow and its parquet module."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Collection export and import require pyarrow. "
+            'Install it with: pip install "rag-retriever[export]"'
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+class SnapshotWriter:
+    """Write a snapshot incrementally, one batch of records at a time."""
+
+    def __init__(self, path: str, count: int, dimensions: int):
+        """Create the snapshot files.
+
+        Args:
+            path: Snapshot directory to create (must not exist or be empty)
+            count: Number of records that will be written
+            dimensions: Embedding dimensions
+
+        Raises:
+            FileExistsError: If path exists and is not an empty directory
+        """
+        pa, pq = _import_pyarrow()
+        self.path = Path(path)
+        if self.path.exists() and (not self.path.is_dir() or any(self.path.iterdir())):
+            raise FileExistsError(f"Snapshot path already exists: {self.path}")
+        os.makedirs(self.path, exist_ok=True)
+
+        self.count = count
+        self.dimensions = dimensions
+        self._pa = pa
+        self._schema = pa.schema(
+            [("id", pa.string()), ("text", pa.string()), ("metadata", pa.string())]
+        )
+        self._records = pq.ParquetWriter(
+            str(self.path / RECORDS_FILE), self._schema, compression="zstd"
+        )
+        self._vectors = np.lib.format.open_memmap(
+            self.path / VECTORS_FILE,
+            mode="w+",
+            dtype=np.float32,
+            shape=(count, dimensions),
+        )
+        self._written = 0
+
+    def write(
+        self,
+        ids: List[str],
+        texts: List[Optional[str]],
+        metadatas: List[Optional[Dict[str, Any]]],
+        vectors: Any,
+    ) -> None:
+        """Append a batch of records."""
+        if self._written + len(ids) > self.count:
+            raise ValueError("More records written than the snapshot was sized for")
+
+        self._records.write_table(
+            self._pa.Table.from_arrays(
+                [
+                    self._pa.array(ids, self._pa.string()),
+                    self._pa.array(texts, self._pa.string()),
+                    self._pa.array(
+                        [json.dumps(metadata or {}) for metadata in metadatas],
+                        self._pa.string(),
+                    ),
+                ],
+                schema=self._schema,
+            )
+        )
+        stop = self._written + len(ids)
+        self._vectors[self._written : stop] = np.asarray(vectors, dtype=np.float32)
+        self._written = stop
+
+    def close(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Finish the snapshot and write its manifest.
+
+        Returns:
+            The manifest as written
+        """
+        self._records.close()
+        self._vectors.flush()
+        del self._vectors
+        if self._written != self.count:
+            raise ValueError(
+                f"Snapshot expected {self.count} records but {self._written} were written"
+            )
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "count": self.count,
+            "dimensions": self.dimensions,
+            **manifest,
+        }
+        with open(self.path / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+class SnapshotReader:
+    """Read a snapshot in batches without loading it into memory."""
+
+    def __init__(self, path: str):
+        """Open a snapshot.
+
+        Args:
+            path: Snapshot directory
+
+        Raises:
+            FileNotFoundError: If the directory is not a complete snapshot
+            ValueError: If the snapshot format is not supported
+        """
+        _, pq = _import_pyarrow()
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No collection snapshot found at {self.path}")
+        with open(manifest_path, "r") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+        if self.manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot format version: {self.manifest.get('format_version')}"
+            )
+
+        self._records = pq.ParquetFile(str(self.path / RECORDS_FILE))
+        self.vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r")
+        if self._records.metadata.num_rows != len(self.vectors):
+            raise ValueError(
+                f"Snapshot at {self.path} is corrupt: record and vector counts differ"
+            )
+
+    @property
+    def count(self) -> int:
+        """Number of records in the snapshot."""
+        return len(self.vectors)
+
+    def iter_batches(
+        self, batch_size: int = DEFAULT_SNAPSHOT_BATCH_SIZE
+    ) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]], np.ndarray]]:
+        """Iterate over (ids, texts, metadatas, vectors) batches in file order."""
+        start = 0
+        for batch in self._records.iter_batches(batch_size=batch_size):
+            columns = batch.to_pydict()
+            stop = start + batch.num_rows
+            yield (
+                columns["id"],
+                columns["text"],
+                [json.loads(metadata) for metadata in columns["metadata"]],
+                np.asarray(self.vectors[start:stop]),
+            )
+            start = stop
@@ -1,17 +1,50 @@
 """Vector store management module using Chroma."""
 
+import asyncio
+import atexit
+import fnmatch
+import heapq
+import itertools
 import os
+from contextlib import contextmanager
 import shutil
+import threading
 import time
+import uuid
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime, UTC
 from pathlib import Path
 import logging
-from typing import List, Tuple, Optional, Dict, Any
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from tenacity import RetryCallState, retry, retry_if_exception
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
+import chromadb
+from chromadb.api import ClientAPI
+from chromadb.api.shared_system_client import SharedSystemClient
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from rag_retriever.utils.config import (
@@ -20,46 +53,311 @@ from rag_retriever.utils.config import (
     mask_api_key,
     get_user_friendly_config_path,
 )
+from rag_retriever.vectorstore.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    QueryEmbeddingCache,
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_QUERY_CACHE_ENTRIES,
+    DEFAULT_QUERY_CACHE_TTL,
+    content_hash,
+    normalize_query,
+)
+from rag_retriever.vectorstore.metadata_store import CollectionMetadata, MetadataStore
+from rag_retriever.vectorstore.lexical_index import LexicalIndex
+from rag_retriever.vectorstore.ingest_journal import IngestJob, IngestJournal
+from rag_retriever.vectorstore.shards import (
+    DEFAULT_START_METHOD,
+    SHARDS_DIR,
+    ShardedClient,
+    delete_shards,
+    shard_root,
+)
+from rag_retriever.vectorstore.snapshot import (
+    DEFAULT_SNAPSHOT_BATCH_SIZE,
+    SnapshotReader,
+    SnapshotWriter,
+)
+from rag_retriever.vectorstore.token_budget import (
+    MeteredEmbeddings,
+    TokenCounter,
+    TokenRateLimiter,
+    estimate_cost,
+)
+from rag_retriever.vectorstore.vector_index import (
+    DEFAULT_EXACT_MAX_CHUNKS,
+    DEFAULT_TRUNCATED_DIMENSIONS,
+    ENGINE_AUTO,
+    ENGINE_EXACT,
+    ENGINE_HNSW,
+    INDEX_DIR,
+    SEARCH_ENGINES,
+    VectorIndex,
+)
+from rag_retriever.vectorstore.embeddings import (
+    EmbeddingSpec,
+    PROVIDER_LOCAL,
+    create_local_embeddings,
+    get_embedding_spec,
+)
 
 logger = logging.getLogger(__name__)
 
 # Constants
 DEFAULT_COLLECTION = "default"
-COLLECTION_METADATA_FILE = "collection_metadata.json"
+CHROMA_DB_FILE = "chroma.sqlite3"
+STORAGE_LAYOUT_PER_COLLECTION = "per_collection"
+STORAGE_LAYOUT_SHARED = "shared"
+STORAGE_LAYOUTS = (STORAGE_LAYOUT_PER_COLLECTION, STORAGE_LAYOUT_SHARED)
+# Chroma collection names must start with an alphanumeric character, so this
+# directory can never clash with a per-collection directory.
+SHARED_STORE_DIR = "_shared_store"
+# source_type recorded on chunks for files, by extension
+SOURCE_TYPE_EXTENSIONS = {
+    ".pdf": "pdf",
+    ".md": "markdown",
+    ".txt": "text",
+    ".png": "image",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".gif": "image",
+    ".webp": "image",
+}
+RESERVED_DIRS = {SHARED_STORE_DIR, INDEX_DIR, SHARDS_DIR, "__pycache__"}
+DEFAULT_MIGRATION_BATCH_SIZE = 500
+DEFAULT_RESHARD_BATCH_SIZE = 1000
+# How delete_source matches sources
+SOURCE_MATCH_EXACT = "exact"
+SOURCE_MATCH_PREFIX = "prefix"
+SOURCE_MATCH_GLOB = "glob"
+SOURCE_MATCH_MODES = (SOURCE_MATCH_EXACT, SOURCE_MATCH_PREFIX, SOURCE_MATCH_GLOB)
+# Sources deleted per Chroma request
+DELETE_SOURCES_BATCH_SIZE = 100
+
+# Reference counts of open Chroma systems, shared by all VectorStore instances
+# in the process so that closing a handle never stops a system still in use.
+_client_refcounts: Dict[str, int] = {}
+_client_refcounts_lock = threading.Lock()
+
+# Worker processes of sharded collections, keyed by shard directory and shared
+# by all VectorStore instances so that each request does not start new ones.
+_shard_clients: Dict[str, ShardedClient] = {}
+_shard_clients_lock = threading.Lock()
+
+# Query embeddings are shared by every VectorStore in the process
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def _is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an error is a provider rate limit or quota error."""
+    message = str(error).lower()
+    return "rate limit" in message or "quota" in message
+
+
+def _stop_after_configured_attempts(retry_state: RetryCallState) -> bool:
+    """Stop retrying once the configured max_retries is reached."""
+    max_retries = config.vector_store["batch_processing"]["max_retries"]
+    return retry_state.attempt_number >= max_retries
+
+
+def _wait_configured_exponential(retry_state: RetryCallState) -> float:
+    """Exponential backoff based on the configured retry_delay (1-60 seconds)."""
+    base_delay = config.vector_store["batch_processing"]["retry_delay"]
+    return min(60.0, max(1.0, base_delay * 2 ** (retry_state.attempt_number - 1)))
+
+
+# Retry rate limit errors with the configured exponential backoff
+_retry_rate_limits = retry(
+    stop=_stop_after_configured_attempts,
+    wait=_wait_configured_exponential,
+    retry=retry_if_exception(_is_rate_limit_error),
+    reraise=True,
+    before_sleep=lambda retry_state: logger.info(
+        "Rate limit error encountered. Using exponential backoff strategy:"
+        "\n  - Attempt: %d/%d"
+        "\n  - Next retry in: %.1f seconds"
+        "\n  - Base delay: %.1f seconds"
+        "\n  - Max delay: 60 seconds",
+        retry_state.attempt_number + 1,
+        config.vector_store["batch_processing"]["max_retries"],
+        retry_state.next_action.sleep,
+        config.vector_store["batch_processing"]["retry_delay"],
+    ),
+)
 
 
-class CollectionMetadata:
-    """Collection metadata storage."""
+def _get_all_ids(collection: Any, page_size: int = 5000) -> List[str]:
+    """List every record id in a Chroma collection."""
+    ids: List[str] = []
+    total = collection.count()
+    for offset in range(0, total, page_size):
+        ids.extend(collection.get(include=[], limit=page_size, offset=offset)["ids"])
+    return ids
+
+
+def _system_identifier(client: Any) -> Optional[str]:
+    """Get the identifier of the persistent Chroma system behind a client."""
+    identifier = getattr(client, "_identifier", None)
+    if not isinstance(identifier, str) or identifier == "ephemeral":
+        return None
+    return identifier
+
+
+def _retain_system(client: Any) -> None:
+    """Record that a handle is using its Chroma system."""
+    identifier = _system_identifier(client)
+    if identifier:
+        with _client_refcounts_lock:
+            _client_refcounts[identifier] = _client_refcounts.get(identifier, 0) + 1
+
+
+def _get_shard_client(
+    vectorstore_path: Path, storage_name: str, shard_count: int
+) -> ShardedClient:
+    """Get the process-wide worker pool of a sharded collection, starting it once."""
+    root = shard_root(vectorstore_path, storage_name)
+    key = str(root.resolve())
+    with _shard_clients_lock:
+        client = _shard_clients.get(key)
+        if client is not None and client.shard_count == shard_count:
+            return client
+        if client is not None:
+            client.close()
+        client = ShardedClient(
+            root,
+            storage_name,
+            shard_count,
+            start_method=config.vector_store.get("sharding", {}).get(
+                "start_method", DEFAULT_START_METHOD
+            ),
+        )
+        _shard_clients[key] = client
+        return client
+
+
+def _close_shard_client(vectorstore_path: Path, storage_name: str) -> None:
+    """Stop the worker processes of a sharded collection, if running."""
+    key = str(shard_root(vectorstore_path, storage_name).resolve())
+    with _shard_clients_lock:
+        client = _shard_clients.pop(key, None)
+    if client is not None:
+        client.close()
+
+
+@atexit.register
+def _close_shard_clients() -> None:
+    """Stop every shard worker process when the interpreter exits."""
+    with _shard_clients_lock:
+        clients = list(_shard_clients.values())
+        _shard_clients.clear()
+    for client in clients:
+        client.close()
+
+
+def _release_system(client: Any) -> None:
+    """Release a handle and stop its Chroma system once nothing uses it."""
+    identifier = _system_identifier(client)
+    if not identifier:
+        return
+    with _client_refcounts_lock:
+        remaining = _client_refcounts.get(identifier, 1) - 1
+        if remaining > 0:
+            _client_refcounts[identifier] = remaining
+            return
+        _client_refcounts.pop(identifier, None)
+        system = SharedSystemClient._identifier_to_system.pop(identifier, None)
+    if system is not None:
+        try:
+            system.stop()
+        except Exception as e:
+            logger.debug(f"Error stopping Chroma system for {identifier}: {e}")
 
-    def __init__(self, name: str):
-        self.name = name
-        self.created_at = datetime.now(UTC).isoformat()
-        self.last_modified = self.created_at
-        self.document_count = 0
-        self.total_chunks = 0
-        self.description = ""
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert metadata to dictionary."""
-        return {
-            "name": self.name,
-            "created_at": self.created_at,
-            "last_modified": self.last_modified,
-            "document_count": self.document_count,
-            "total_chunks": self.total_chunks,
-            "description": self.description,
-        }
+def get_query_cache() -> Optional[QueryEmbeddingCache]:
+    """Get the process-wide query embedding cache, or None if disabled."""
+    global _query_cache
+
+    settings = config.search.get("query_cache", {})
+    if not settings.get("enabled", True):
+        return None
+
+    with _query_cache_lock:
+        if _query_cache is None:
+            persistent = None
+            if settings.get("persist", False):
+                try:
+                    persistent = EmbeddingCache(
+                        max_entries=config.vector_store.get("embedding_cache", {}).get(
+                            "max_entries", DEFAULT_MAX_ENTRIES
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Persistent query cache unavailable, using memory only: {e}"
+                    )
+            _query_cache = QueryEmbeddingCache(
+                max_entries=settings.get("max_entries", DEFAULT_QUERY_CACHE_ENTRIES),
+                ttl_seconds=settings.get("ttl_seconds", DEFAULT_QUERY_CACHE_TTL),
+                persistent=persistent,
+            )
+        return _query_cache
+
+
+def get_storage_layout() -> str:
+    """Get the configured storage layout ('per_collection' or 'shared')."""
+    layout = config.vector_store.get("storage_layout", STORAGE_LAYOUT_PER_COLLECTION)
+    if layout not in STORAGE_LAYOUTS:
+        raise ValueError(
+            f"Invalid vector_store.storage_layout '{layout}'. "
+            f"Expected one of: {', '.join(STORAGE_LAYOUTS)}"
+        )
+    return layout
+
+
+def _open_shared_client(vectorstore_path: Path) -> ClientAPI:
+    """Open the persistent client that stores every collection in the shared layout."""
+    shared_path = vectorstore_path / SHARED_STORE_DIR
+    os.makedirs(shared_path, exist_ok=True)
+    return chromadb.PersistentClient(path=str(shared_path))
+
+
+def _is_collection_dir(path: Path) -> bool:
+    """Check whether a directory holds a per-collection Chroma database."""
+    return (
+        path.is_dir()
+        and path.name not in RESERVED_DIRS
+        and (path / CHROMA_DB_FILE).is_file()
+    )
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "CollectionMetadata":
-        """Create metadata instance from dictionary."""
-        instance = cls(data["name"])
-        instance.created_at = data["created_at"]
-        instance.last_modified = data["last_modified"]
-        instance.document_count = data["document_count"]
-        instance.total_chunks = data["total_chunks"]
-        instance.description = data.get("description", "")
-        return instance
+
+def chunk_id(source: Optional[str], text: str) -> str:
+    """Derive a deterministic chunk id from its source and content.
+
+    Re-ingesting unchanged content yields the same ids, so chunks are
+    updated in place instead of duplicated.
+    """
+    return content_hash(f"{source or ''}\0{content_hash(text)}")
+
+
+def infer_source_type(metadata: Dict[str, Any]) -> str:
+    """Classify a document for filtering: web, github, image, pdf, markdown, ..."""
+    if metadata.get("source_type"):
+        return metadata["source_type"]
+    if metadata.get("type") == "image":
+        return "image"
+    if "branch" in metadata:
+        return "github"
+    if "crawler_type" in metadata or "depth" in metadata:
+        return "web"
+
+    source = str(metadata.get("source") or "")
+    suffix = Path(source.split("?", 1)[0]).suffix.lower()
+    if suffix in SOURCE_TYPE_EXTENSIONS:
+        return SOURCE_TYPE_EXTENSIONS[suffix]
+    if source.startswith(("http://", "https://")):
+        return "web"
+    return "other"
 
 
 def get_vectorstore_path() -> str:
@@ -76,30 +374,95 @@ def get_vectorstore_path() -> str:
     return str(store_path)
 
 
+def _remove_collection_records(vectorstore_path: Path, collection_name: str) -> None:
+    """Remove a collection's metadata and lexical index records."""
+    try:
+        metadata_store = MetadataStore(str(vectorstore_path))
+        try:
+            metadata_store.delete_collection(collection_name)
+        finally:
+            metadata_store.close()
+    except Exception as e:
+        logger.error(f"Error updating collection metadata: {e}")
+
+    try:
+        lexical_index = LexicalIndex(str(vectorstore_path))
+        try:
+            lexical_index.delete_collection(collection_name)
+        finally:
+            lexical_index.close()
+    except Exception as e:
+        logger.error(f"Error updating lexical index: {e}")
+
+
+def _get_storage_names(
+    vectorstore_path: Path, collection_name: str
+) -> Tuple[List[str], int]:
+    """Get the Chroma collection holding a collection, then any migration shadow.
+
+    Returns:
+        The storage names and the collection's shard count
+    """
+    storage_names = [collection_name]
+    try:
+        metadata_store = MetadataStore(str(vectorstore_path))
+        try:
+            stored = metadata_store.get_collection(collection_name)
+            migration = metadata_store.get_migration(collection_name)
+        finally:
+            metadata_store.close()
+    except Exception as e:
+        logger.error(f"Error reading collection metadata: {e}")
+        return storage_names, 0
+
+    if stored is not None and stored.storage_name:
+        storage_names = [stored.storage_name]
+    if migration is not None:
+        storage_names.append(migration["shadow"])
+    return storage_names, stored.shard_count if stored is not None else 0
+
+
 def _delete_collection_files(collection_name: Optional[str] = None) -> None:
     """Internal function to delete collection files without confirmation."""
     vectorstore_path = Path(get_vectorstore_path())
 
     if collection_name:
-        collection_path = vectorstore_path / collection_name
+        storage_names, shard_count = _get_storage_names(
+            vectorstore_path, collection_name
+        )
+        if shard_count:
+            # Shards live in their own directories whatever the storage layout
+            for storage_name in storage_names:
+                _close_shard_client(vectorstore_path, storage_name)
+                delete_shards(vectorstore_path, storage_name)
+            logger.info("Deleted shards of collection '%s'", collection_name)
+            _remove_collection_records(vectorstore_path, collection_name)
+            return
+        if get_storage_layout() == STORAGE_LAYOUT_SHARED:
+            client = _open_shared_client(vectorstore_path)
+            for shadow in storage_names[1:]:
+                try:
+                    client.delete_collection(shadow)
+                except Exception as e:
+                    logger.debug("Migration shadow not found in shared store: %s", e)
+            try:
+                client.delete_collection(storage_names[0])
+            except Exception as e:
+                logger.info("Collection not found in shared store: %s", e)
+                return
+            logger.info("Deleting collection '%s' from shared store", collection_name)
+            _remove_collection_records(vectorstore_path, collection_name)
+            logger.info("Collection deleted successfully")
+            return
+
+        for shadow in storage_names[1:]:
+            shutil.rmtree(vectorstore_path / shadow, ignore_errors=True)
+        collection_path = vectorstore_path / storage_names[0]
         if collection_path.exists():
             logger.info("Deleting collection at %s", collection_path)
             shutil.rmtree(collection_path)
 
-            # Update metadata file if it exists
-            metadata_path = vectorstore_path / COLLECTION_METADATA_FILE
-            if metadata_path.exists():
-                import json
-
-                try:
-                    with open(metadata_path, "r") as f:
-                        metadata = json.load(f)
-                    if collection_name in metadata:
-                        del metadata[collection_name]
-                        with open(metadata_path, "w") as f:
-                            json.dump(metadata, f, indent=2)
-                except Exception as e:
-                    logger.error(f"Error updating metadata file: {e}")
+            _remove_collection_records(vectorstore_path, collection_name)
 
             logger.info("Collection deleted successfully")
         else:
@@ -138,8 +501,137 @@ def clean_vectorstore(collection_name: Optional[str] = None) -> None:
     _delete_collection_files(collection_name)
 
 
+def migrate_to_shared_store(
+    persist_directory: Optional[str] = None, batch_size: int = 1000
+) -> Dict[str, int]:
+    """Copy per-directory collections into the shared client layout.
+
+    Stored ids, documents, metadata and embeddings are copied as-is, so no
+    embedding calls are made. The original directories are left in place;
+    use remove_per_collection_dirs() once the migration has been verified.
+
+    Args:
+        persist_directory: Optional vector store directory (defaults to the configured path)
+        batch_size: Number of records copied per request
+
+    Returns:
+        Mapping of collection name to number of records migrated
+
+    Raises:
+        RuntimeError: If a migrated collection has fewer records than its source
+    """
+    vectorstore_path = Path(persist_directory or get_vectorstore_path())
+    shared_client = _open_shared_client(vectorstore_path)
+    migrated: Dict[str, int] = {}
+
+    for collection_dir in sorted(vectorstore_path.iterdir()):
+        if not _is_collection_dir(collection_dir):
+            continue
+
+        name = collection_dir.name
+        source_client = chromadb.PersistentClient(path=str(collection_dir))
+        try:
+            try:
+                source = source_client.get_collection(name)
+            except Exception as e:
+                logger.warning(f"Skipping '{collection_dir}': {e}")
+                continue
+
+            target = shared_client.get_or_create_collection(
+                name, metadata=source.metadata or {"hnsw:space": "cosine"}
+            )
+            total = source.count()
+            logger.info("Migrating collection '%s' (%d records)", name, total)
+
+            for offset in range(0, total, batch_size):
+                page = source.get(
+                    include=["embeddings", "documents", "metadatas"],
+                    limit=batch_size,
+                    offset=offset,
+                )
+                if not page["ids"]:
+                    break
+                target.upsert(
+                    ids=page["ids"],
+                    embeddings=page["embeddings"],
+                    documents=page["documents"],
+                    metadatas=page["metadatas"],
+                )
+
+            if target.count() < total:
+                raise RuntimeError(
+                    f"Migration of collection '{name}' is incomplete: "
+                    f"{target.count()}/{total} records copied"
+                )
+            migrated[name] = total
+        finally:
+            # Stop the source system unless an open store is still using it
+            _retain_system(source_client)
+            _release_system(source_client)
+
+    return migrated
+
+
+def remove_per_collection_dirs(
+    collection_names: List[str], persist_directory: Optional[str] = None
+) -> None:
+    """Delete per-collection database directories after a migration."""
+    vectorstore_path = Path(persist_directory or get_vectorstore_path())
+    for name in collection_names:
+        collection_dir = vectorstore_path / name
+        if _is_collection_dir(collection_dir):
+            logger.info("Removing migrated collection directory %s", collection_dir)
+            shutil.rmtree(collection_dir)
+
+
+def _iter_documents(
+    documents: Union[Iterable[Document], AsyncIterable[Document]],
+) -> Iterator[Document]:
+    """Iterate over documents, driving async iterators on a private event loop."""
+    if not isinstance(documents, AsyncIterable):
+        yield from documents
+        return
+
+    loop = asyncio.new_event_loop()
+    iterator = aiter(documents)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(iterator))
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _pull_from_loop(
+    documents: AsyncIterable[Document], loop: asyncio.AbstractEventLoop
+) -> Iterator[Document]:
+    """Iterate from another thread over an async iterator running on loop."""
+    iterator = aiter(documents)
+
+    async def next_document() -> Document:
+        return await anext(iterator)
+
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(next_document(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
 class VectorStore:
-    """Manage vector storage and retrieval using Chroma."""
+    """Manage vector storage and retrieval using Chroma.
+
+    Collection metadata for every known collection is kept in memory, but
+    Chroma handles are only opened on first use. Open handles are kept in an
+    LRU bounded by ``vector_store.max_open_collections`` and handles idle for
+    longer than ``vector_store.collection_idle_timeout`` seconds are closed.
+
+    With ``vector_store.storage_layout: shared`` every collection lives in a
+    single Chroma client instead of one database directory per collection.
+    """
 
     def __init__(
         self,
@@ -154,9 +646,42 @@ class VectorStore:
         """
         self.persist_directory = persist_directory or get_vectorstore_path()
         logger.debug("Vector store directory: %s", self.persist_directory)
+        self.embedding_spec = get_embedding_spec()
+        self.token_counter = TokenCounter(self.embedding_spec.model)
+        # Provider wrapper counting tokens actually sent for embedding
+        self._metered_embeddings: Optional[MeteredEmbeddings] = None
         self.embeddings = self._get_embeddings()
+        # Query embeddings for collections still built with other settings
+        self._query_embeddings: Dict[EmbeddingSpec, Embeddings] = {}
+        # Token and cost report of the most recent add_documents call
+        self.last_ingest_stats: Dict[str, Any] = {}
+        self._metadata: Dict[str, CollectionMetadata] = {}
+        # Open handles in least to most recently used order
         self._collections: Dict[str, Chroma] = {}
+        self._last_used: Dict[str, float] = {}
+        self._pinned: Dict[str, int] = {}
+        self._handles_lock = threading.RLock()
+        # Notified whenever a handle stops being used
+        self._handles_released = threading.Condition(self._handles_lock)
+        self._write_lock = threading.RLock()
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._index_lock = threading.Lock()
+        # Serialize rebuilds per collection so others keep being searched
+        self._index_build_locks: Dict[str, threading.Lock] = {}
+        self._shared_client: Optional[ClientAPI] = None
+        self.query_cache = get_query_cache()
+        self.storage_layout = get_storage_layout()
+        self.max_open_collections = max(
+            1, config.vector_store.get("max_open_collections", 16)
+        )
+        self.collection_idle_timeout = config.vector_store.get(
+            "collection_idle_timeout", 600
+        )
         self.current_collection = collection_name or DEFAULT_COLLECTION
+        self.metadata_store = MetadataStore(self.persist_directory)
+        self.lexical_index = LexicalIndex(self.persist_directory)
+        self.ingest_journal = IngestJournal(self.persist_directory)
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=config.vector_store.get("chunk_size", 1000),
             chunk_overlap=config.vector_store.get("chunk_overlap", 200),
@@ -164,202 +689,658 @@ class VectorStore:
         self._load_collections()
 
     def _load_collections(self) -> None:
-        """Load existing collections and their metadata."""
-        metadata_path = Path(self.persist_directory) / COLLECTION_METADATA_FILE
-        if metadata_path.exists():
-            import json
+        """Load collection metadata without opening any collection handles."""
+        for metadata in self.metadata_store.list_collections():
+            self._apply_metadata(metadata)
 
-            try:
-                with open(metadata_path, "r") as f:
-                    metadata_dict = json.load(f)
-                    for name, data in metadata_dict.items():
-                        # Initialize collection metadata
-                        self._get_or_create_collection(
-                            name, CollectionMetadata.from_dict(data)
-                        )
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
-                logger.error(f"Error parsing collection metadata: {e}")
-                # Initialize with default collection
-                self._get_or_create_collection(DEFAULT_COLLECTION)
-            except OSError as e:
-                logger.error(f"Error reading metadata file: {e}")
-                # Initialize with default collection
-                self._get_or_create_collection(DEFAULT_COLLECTION)
-        else:
-            # Initialize with default collection
-            self._get_or_create_collection(DEFAULT_COLLECTION)
+        # Always know about the default collection
+        self._register_collection(DEFAULT_COLLECTION)
 
-    def _save_collection_metadata(self) -> None:
-        """Save collection metadata to disk."""
-        metadata_path = Path(self.persist_directory) / COLLECTION_METADATA_FILE
-        metadata_dict = {}
-        for name, collection in self._collections.items():
-            if hasattr(collection, "_collection_metadata"):
-                metadata_dict[name] = collection._collection_metadata.to_dict()
+    def _apply_metadata(self, stored: Optional[CollectionMetadata]) -> None:
+        """Refresh the cached metadata object for a collection from stored values.
+
+        The cached object is updated in place because open collection handles
+        refer to it through ``_collection_metadata``.
+        """
+        if stored is None:
+            return
+        with self._handles_lock:
+            cached = self._metadata.get(stored.name)
+            if cached is None:
+                self._metadata[stored.name] = stored
+            else:
+                cached.__dict__.update(stored.__dict__)
+
+    def _register_collection(
+        self, name: str, metadata: Optional[CollectionMetadata] = None
+    ) -> CollectionMetadata:
+        """Record metadata for a collection without opening it."""
+        with self._handles_lock:
+            if name not in self._metadata:
+                stored = self.metadata_store.ensure_collection(
+                    metadata or CollectionMetadata(name)
+                )
+                if metadata is not None:
+                    self._metadata[name] = metadata
+                self._apply_metadata(stored)
+            return self._metadata[name]
 
-        import json
+    def _save_collection_metadata(self) -> None:
+        """Save editable collection metadata (descriptions) to the metadata store.
 
-        with open(metadata_path, "w") as f:
-            json.dump(metadata_dict, f, indent=2)
+        Document and chunk counters are written as they change, so they are
+        never overwritten with cached values here.
+        """
+        with self._handles_lock:
+            descriptions = {
+                name: metadata.description for name, metadata in self._metadata.items()
+            }
+        self.metadata_store.set_descriptions(descriptions)
 
     def _get_or_create_collection(
         self, name: str, metadata: Optional[CollectionMetadata] = None
     ) -> Chroma:
-        """Get or create a collection by name."""
-        if name not in self._collections:
-            collection_dir = Path(self.persist_directory) / name
-            os.makedirs(collection_dir, exist_ok=True)
-
-            collection = Chroma(
-                persist_directory=str(collection_dir),
-                embedding_function=self.embeddings,
-                collection_name=name,
-                collection_metadata={
-                    "hnsw:space": "cosine",
-                    "description": metadata.description if metadata else "",
-                    "created_at": (
-                        metadata.created_at
-                        if metadata
-                        else datetime.now(UTC).isoformat()
-                    ),
-                },
-            )
+        """Get or create a collection by name, opening its handle if needed."""
+        with self._handles_lock:
+            if name in self._collections:
+                # Re-insert to mark as most recently used
+                self._collections[name] = self._collections.pop(name)
+                self._last_used[name] = time.monotonic()
+                return self._collections[name]
+
+            metadata = self._register_collection(name, metadata)
+            storage_name = metadata.storage_name or name
+            collection_metadata = {
+                "hnsw:space": "cosine",
+                "description": metadata.description,
+                "created_at": metadata.created_at,
+            }
+
+            if metadata.shard_count:
+                collection = Chroma(
+                    client=self._open_shards(storage_name, metadata.shard_count),
+                    embedding_function=self.embeddings,
+                    collection_name=storage_name,
+                    collection_metadata=collection_metadata,
+                )
+            elif self.storage_layout == STORAGE_LAYOUT_SHARED:
+                collection = Chroma(
+                    client=self._get_shared_client(),
+                    embedding_function=self.embeddings,
+                    collection_name=storage_name,
+                    collection_metadata=collection_metadata,
+                )
+            else:
+                collection_dir = Path(self.persist_directory) / storage_name
+                os.makedirs(collection_dir, exist_ok=True)
+
+                collection = Chroma(
+                    persist_directory=str(collection_dir),
+                    embedding_function=self.embeddings,
+                    collection_name=storage_name,
+                    collection_metadata=collection_metadata,
+                )
+            _retain_system(collection._client)
 
             # Attach our custom metadata to the collection
-            collection._collection_metadata = metadata or CollectionMetadata(name)
+            collection._collection_metadata = metadata
             self._collections[name] = collection
-            logger.debug(f"Created new collection: {name}")
+            self._last_used[name] = time.monotonic()
+            logger.debug(f"Opened collection: {name}")
 
-        return self._collections[name]
+            self._evict_collections(keep=name)
+            return collection
 
-    def list_collections(self) -> List[Dict[str, Any]]:
-        """List all available collections and their metadata."""
-        # First, scan for any collections that might exist on disk but not loaded
-        vectorstore_path = Path(self.persist_directory)
-        if vectorstore_path.exists():
-            for collection_dir in vectorstore_path.iterdir():
-                if collection_dir.is_dir() and collection_dir.name != "__pycache__":
-                    # Ensure collection is loaded
-                    self._get_or_create_collection(collection_dir.name)
-        
-        # Now return all loaded collections with their metadata
-        collections = []
-        for name, collection in self._collections.items():
+    def _open_shards(self, storage_name: str, shard_count: int) -> ShardedClient:
+        """Get the shard worker processes of a sharded collection.
+
+        Workers are shared by every store in the process and stay up until the
+        collection is deleted or the process exits.
+        """
+        return _get_shard_client(
+            Path(self.persist_directory), storage_name, shard_count
+        )
+
+    def _get_shared_client(self) -> ClientAPI:
+        """Open the shared Chroma client on first use."""
+        with self._handles_lock:
+            if self._shared_client is None:
+                self._shared_client = _open_shared_client(Path(self.persist_directory))
+                # The store holds its own reference so the client outlives handles
+                _retain_system(self._shared_client)
+            return self._shared_client
+
+    @contextmanager
+    def _use_collection(self, name: str) -> Iterator[Chroma]:
+        """Open a collection and keep its handle from being evicted while in use."""
+        with self._handles_lock:
+            collection = self._get_or_create_collection(name)
+            self._pinned[name] = self._pinned.get(name, 0) + 1
+            collection._in_use = getattr(collection, "_in_use", 0) + 1
+        try:
+            yield collection
+        finally:
+            with self._handles_lock:
+                collection._in_use -= 1
+                self._pinned[name] -= 1
+                if not self._pinned[name]:
+                    del self._pinned[name]
+                self._handles_released.notify_all()
+                self._evict_collections()
+
+    def _evict_collections(self, keep: Optional[str] = None) -> None:
+        """Close least recently used and idle handles that are not in use."""
+        with self._handles_lock:
+            now = time.monotonic()
+            for name in list(self._collections):
+                over_capacity = len(self._collections) > self.max_open_collections
+                idle = (
+                    self.collection_idle_timeout
+                    and now - self._last_used.get(name, now)
+                    > self.collection_idle_timeout
+                )
+                if not (over_capacity or idle):
+                    continue
+                if name == keep or name in self._pinned:
+                    continue
+                self._close_collection(name)
+
+    def _close_collection(self, name: str, wait: bool = False) -> None:
+        """Close an open collection handle.
+
+        Args:
+            name: Collection name
+            wait: Whether to wait for searches and writes still using the
+                  handle to finish before closing it. Callers must not be
+                  using the handle themselves. Uses that start meanwhile
+                  open a new handle.
+        """
+        with self._handles_lock:
+            collection = self._collections.pop(name, None)
+            self._last_used.pop(name, None)
+            if wait and collection is not None:
+                self._handles_released.wait_for(
+                    lambda: not getattr(collection, "_in_use", 0)
+                )
+        if collection is not None:
+            # Shard workers are process-wide and outlive collection handles
+            if not isinstance(collection._client, ShardedClient):
+                _release_system(collection._client)
+            logger.debug(f"Closed collection handle: {name}")
+
+    def close(self) -> None:
+        """Close all open collection handles."""
+        with self._handles_lock:
+            for name in list(self._collections):
+                self._close_collection(name)
+            if self._shared_client is not None:
+                _release_system(self._shared_client)
+                self._shared_client = None
+        if self._search_executor is not None:
+            self._search_executor.shutdown(wait=False)
+            self._search_executor = None
+
+    @contextmanager
+    def _open_storage(self, storage_name: str, shard_count: int = 0) -> Iterator[Any]:
+        """Open a Chroma collection by storage name without registering it.
+
+        Used for migration shadows and resharding targets, which must not
+        appear as collections.
+        """
+        if shard_count:
+            client = self._open_shards(storage_name, shard_count)
+            yield client.get_or_create_collection(storage_name)
+            return
+
+        if self.storage_layout == STORAGE_LAYOUT_SHARED:
+            yield self._get_shared_client().get_or_create_collection(
+                storage_name, metadata={"hnsw:space": "cosine"}
+            )
+            return
+
+        client = chromadb.PersistentClient(
+            path=str(Path(self.persist_directory) / storage_name)
+        )
+        _retain_system(client)
+        try:
+            yield client.get_or_create_collection(
+                storage_name, metadata={"hnsw:space": "cosine"}
+            )
+        finally:
+            _release_system(client)
+
+    def _delete_storage(self, storage_name: str, shard_count: int = 0) -> None:
+        """Delete a Chroma collection by storage name."""
+        if shard_count:
+            _close_shard_client(Path(self.persist_directory), storage_name)
+            delete_shards(Path(self.persist_directory), storage_name)
+        elif self.storage_layout == STORAGE_LAYOUT_SHARED:
             try:
-                # Get actual document count from ChromaDB
-                count = collection._collection.count()
-                metadata = collection._collection_metadata.to_dict()
-                metadata["count"] = count
-                collections.append({"name": name, **metadata})
+                self._get_shared_client().delete_collection(storage_name)
             except Exception as e:
-                logger.warning(f"Error getting metadata for collection {name}: {e}")
-                # Fallback to basic info
-                collections.append({
-                    "name": name,
-                    "count": 0,
-                    "error": str(e)
-                })
-        
+                logger.info("Collection not found in shared store: %s", e)
+        else:
+            shutil.rmtree(Path(self.persist_directory) / storage_name, ignore_errors=True)
+
+    def _discover_collections(self) -> None:
+        """Register collections that exist on disk but are missing from metadata.
+
+        Chroma collections holding another collection's vectors, such as
+        migration shadows, are skipped.
+        """
+        storage_names = self.metadata_store.storage_names()
+        if self.storage_layout == STORAGE_LAYOUT_SHARED:
+            for collection in self._get_shared_client().list_collections():
+                # Older clients return Collection objects, newer ones names
+                name = getattr(collection, "name", collection)
+                if name not in storage_names:
+                    self._register_collection(name)
+            return
+
+        vectorstore_path = Path(self.persist_directory)
+        if not vectorstore_path.exists():
+            return
+        for collection_dir in vectorstore_path.iterdir():
+            if (
+                collection_dir.name not in self._metadata
+                and collection_dir.name not in storage_names
+                and _is_collection_dir(collection_dir)
+            ):
+                self._register_collection(collection_dir.name)
+
+    def list_collections(self) -> List[Dict[str, Any]]:
+        """List all available collections and their metadata.
+
+        Counts come from the metadata store, so no collection needs to be
+        opened.
+        """
+        for metadata in self.metadata_store.list_collections():
+            self._apply_metadata(metadata)
+        self._discover_collections()
+
+        collections = []
+        for name, metadata in list(self._metadata.items()):
+            info = metadata.to_dict()
+            info["count"] = metadata.total_chunks
+            collections.append({"name": name, **info})
+
         return collections
 
     def get_collection_metadata(self, collection_name: str) -> Dict[str, Any]:
         """Get metadata for a specific collection."""
-        collection = self._get_or_create_collection(collection_name)
-        return collection._collection_metadata.to_dict()
+        self._apply_metadata(self.metadata_store.get_collection(collection_name))
+        return self._register_collection(collection_name).to_dict()
+
+    def get_collection_sources(self, collection_name: str) -> List[Dict[str, Any]]:
+        """Get the sources ingested into a collection with their chunk counts."""
+        return self.metadata_store.get_sources(collection_name)
+
+    def get_source_metadata(
+        self, source: str, collection_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the metadata of one stored chunk of a source, or None if it has none."""
+        with self._use_collection(collection_name or self.current_collection) as collection:
+            found = collection._collection.get(
+                where={"source": source}, limit=1, include=["metadatas"]
+            )
+        if not found["ids"]:
+            return None
+        return dict(found["metadatas"][0] or {})
 
     def set_current_collection(self, collection_name: str) -> None:
         """Set the current working collection."""
-        self._get_or_create_collection(collection_name)  # Ensure it exists
+        self._register_collection(collection_name)  # Ensure it exists
         self.current_collection = collection_name
         logger.debug(f"Set current collection to: {collection_name}")
 
-    def _get_embeddings(self) -> OpenAIEmbeddings:
-        """Get OpenAI embeddings instance."""
-        api_key = config.get_openai_api_key()
-        if not api_key:
-            raise ValueError(
-                f"OpenAI API key not found. Please configure it in {get_user_friendly_config_path()}"
+    def _get_embeddings(self, spec: Optional[EmbeddingSpec] = None) -> Embeddings:
+        """Get an embeddings instance, wrapped by the embedding cache if enabled.
+
+        Args:
+            spec: Embedding provider, model and dimensions (defaults to the
+                  configured ones)
+        """
+        spec = spec or self.embedding_spec
+        if spec.provider == PROVIDER_LOCAL:
+            embeddings = create_local_embeddings(spec)
+        else:
+            api_key = config.get_openai_api_key()
+            if not api_key:
+                raise ValueError(
+                    f"OpenAI API key not found. Please configure it in {get_user_friendly_config_path()}"
+                )
+
+            logger.debug("Using OpenAI API key: %s", mask_api_key(api_key))
+            embeddings = OpenAIEmbeddings(
+                model=spec.model,
+                openai_api_key=api_key,
+                dimensions=spec.dimensions,
+            )
+            # Meter tokens below the embedding cache so only API calls count
+            tokens_per_minute = config.vector_store["batch_processing"].get(
+                "tokens_per_minute", 0
+            )
+            embeddings = MeteredEmbeddings(
+                embeddings,
+                self.token_counter,
+                TokenRateLimiter(tokens_per_minute) if tokens_per_minute else None,
+            )
+            if spec == self.embedding_spec:
+                self._metered_embeddings = embeddings
+
+        cache_settings = config.vector_store.get("embedding_cache", {})
+        if not cache_settings.get("enabled", True):
+            return embeddings
+
+        try:
+            cache = EmbeddingCache(
+                max_entries=cache_settings.get("max_entries", DEFAULT_MAX_ENTRIES)
             )
+        except Exception as e:
+            logger.warning(f"Embedding cache unavailable, continuing without it: {e}")
+            return embeddings
 
-        logger.debug("Using OpenAI API key: %s", mask_api_key(api_key))
-        return OpenAIEmbeddings(
-            model=config.vector_store["embedding_model"],
-            openai_api_key=api_key,
-            dimensions=config.vector_store["embedding_dimensions"],
+        return CachedEmbeddings(
+            embeddings, cache, model=spec.model, dimensions=spec.dimensions
         )
 
-    @retry(
-        stop=stop_after_attempt(
-            lambda: config.vector_store["batch_processing"]["max_retries"]
-        ),
-        wait=wait_exponential(
-            multiplier=lambda: config.vector_store["batch_processing"]["retry_delay"],
-            min=1,
-            max=60,
-        ),
-        retry=lambda e: "rate limit" in str(e).lower() or "quota" in str(e).lower(),
-        before_sleep=lambda retry_state: logger.info(
-            "Rate limit error encountered. Using exponential backoff strategy:"
-            "\n  - Attempt: %d/%d"
-            "\n  - Next retry in: %.1f seconds"
-            "\n  - Base delay: %.1f seconds"
-            "\n  - Max delay: 60 seconds",
-            retry_state.attempt_number + 1,
-            config.vector_store["batch_processing"]["max_retries"],
-            retry_state.next_action.sleep,
-            config.vector_store["batch_processing"]["retry_delay"],
-        ),
-    )
+    @_retry_rate_limits
     def _process_batch(
         self, batch: List[Document], collection_name: Optional[str] = None
     ) -> bool:
-        """Process a single batch of documents with retry logic."""
+        """Embed and store a single batch of documents with retry logic.
+
+        Embedding runs outside the write lock so that several batches can be
+        in flight at once; only the Chroma write and metadata update are
+        serialized.
+        """
+        target_collection = collection_name or self.current_collection
         try:
-            collection = self._get_or_create_collection(
-                collection_name or self.current_collection
-            )
+            texts = [doc.page_content for doc in batch]
+            ids = [
+                doc.id or chunk_id(doc.metadata.get("source"), doc.page_content)
+                for doc in batch
+            ]
+            metadatas = [doc.metadata or None for doc in batch]
+            vectors = self.embeddings.embed_documents(texts)
+
             logger.info(
                 "Storing batch of %d chunks to collection '%s'...",
                 len(batch),
-                collection_name or self.current_collection,
+                target_collection,
             )
 
-            collection.add_documents(batch)
+            with self._write_lock, self._use_collection(
+                target_collection
+            ) as collection:
+                collection._collection.upsert(
+                    ids=ids,
+                    embeddings=vectors,
+                    documents=texts,
+                    metadatas=metadatas,
+                )
+                self.lexical_index.upsert(target_collection, ids, texts, metadatas)
 
-            # Update collection metadata
-            collection._collection_metadata.total_chunks += len(batch)
-            collection._collection_metadata.last_modified = datetime.now(
-                UTC
-            ).isoformat()
-            self._save_collection_metadata()
+                # Update collection metadata
+                self._apply_metadata(
+                    self.metadata_store.set_total_chunks(
+                        target_collection, collection._collection.count()
+                    )
+                )
 
             logger.info("Successfully stored batch to collection")
             return True
         except Exception as e:
-            if "rate limit" in str(e).lower() or "quota" in str(e).lower():
+            if _is_rate_limit_error(e):
                 logger.info("Rate limiting error details: %s", str(e))
             else:
                 logger.error("Error processing batch: %s", str(e))
             raise
 
+    def _get_source_chunk_ids(
+        self, collection_name: str, sources: List[str]
+    ) -> Dict[str, Set[str]]:
+        """Get the ids of chunks already stored for each source."""
+        if not sources:
+            return {}
+        with self._use_collection(collection_name) as collection:
+            return {
+                source: set(
+                    collection._collection.get(where={"source": source}, include=[])[
+                        "ids"
+                    ]
+                )
+                for source in sources
+            }
+
+    def _delete_stale_chunks(
+        self,
+        collection_name: str,
+        existing_ids: Dict[str, Set[str]],
+        new_ids: Dict[Optional[str], Set[str]],
+    ) -> int:
+        """Delete stored chunks of re-ingested sources that no longer exist."""
+        stale = [
+            id_
+            for source, ids in existing_ids.items()
+            for id_ in ids - new_ids.get(source, set())
+        ]
+        if not stale:
+            return 0
+
+        with self._write_lock, self._use_collection(collection_name) as collection:
+            collection._collection.delete(ids=stale)
+            self.lexical_index.delete(collection_name, stale)
+            self._apply_metadata(
+                self.metadata_store.set_total_chunks(
+                    collection_name, collection._collection.count()
+                )
+            )
+
+        logger.info("Deleted %d stale chunks from re-ingested sources", len(stale))
+        return len(stale)
+
+    def _refresh_chunk_metadata(
+        self, collection_name: str, chunks: List[Document]
+    ) -> int:
+        """Update the stored metadata of unchanged chunks where it differs.
+
+        A chunk whose text is unchanged keeps its id and embedding, but an
+        edit elsewhere in its source moves its ``start_index``,
+        ``chunk_index`` or ``document_index``. Those fields are rewritten
+        without re-embedding the chunk. ``ingested_at`` keeps the time the
+        chunk was first stored.
+
+        Returns:
+            Number of chunks whose metadata was updated
+        """
+        if not chunks:
+            return 0
+        by_id = {chunk.id: chunk for chunk in chunks}
+        with self._use_collection(collection_name) as collection:
+            stored = collection._collection.get(ids=list(by_id), include=["metadatas"])
+
+        ids, texts, metadatas = [], [], []
+        for id_, metadata in zip(stored["ids"], stored["metadatas"]):
+            metadata = metadata or {}
+            chunk = by_id[id_]
+            if all(
+                metadata.get(key) == value
+                for key, value in chunk.metadata.items()
+                if key != "ingested_at"
+            ):
+                continue
+            ids.append(id_)
+            texts.append(chunk.page_content)
+            metadatas.append(
+                {
+                    **metadata,
+                    **chunk.metadata,
+                    "ingested_at": metadata.get(
+                        "ingested_at", chunk.metadata.get("ingested_at")
+                    ),
+                }
+            )
+        if not ids:
+            return 0
+
+        with self._write_lock, self._use_collection(collection_name) as collection:
+            collection._collection.update(ids=ids, metadatas=metadatas)
+            self.lexical_index.upsert(collection_name, ids, texts, metadatas)
+            self._apply_metadata(
+                self.metadata_store.set_total_chunks(
+                    collection_name, collection._collection.count()
+                )
+            )
+        logger.debug("Refreshed the metadata of %d unchanged chunks", len(ids))
+        return len(ids)
+
+    def _iter_batches(
+        self,
+        documents: Iterator[Document],
+        collection_name: str,
+        text_splitter: RecursiveCharacterTextSplitter,
+        batch_size: int,
+        max_batch_tokens: int,
+        stats: Dict[str, int],
+        existing_ids: Dict[str, Set[str]],
+        new_ids: Dict[Optional[str], Set[str]],
+        job: Optional[IngestJob] = None,
+    ) -> Iterator[Tuple[List[Document], int]]:
+        """Split documents lazily and yield batches of chunks as they fill.
+
+        Batches are packed until they reach ``batch_size`` chunks or adding
+        the next chunk would exceed ``max_batch_tokens`` tokens, so short
+        chunks share a request and long ones don't overrun request limits.
+
+        Each chunk gets its deterministic id. Chunks already stored for their
+        source, or repeated within this ingestion, are counted but not yielded;
+        stored chunks whose offsets or other metadata changed have their
+        metadata updated in place.
+        Stored chunk ids are looked up the first time a source is seen, so
+        only one document and at most one partial batch are held at a time.
+
+        Every document is tagged with ``source_type`` and ``ingested_at``
+        (Unix seconds) metadata so searches can filter on them, and every
+        chunk records its ``chunk_index`` and character ``start_index``
+        within the document so search can merge neighbouring chunks. Loaders
+        such as PDF emit several documents per source, whose offsets all
+        start at 0, so each document also records its ``document_index``
+        among the documents of its source.
+
+        If a job is given, each document's extraction and split are recorded
+        in its journal.
+
+        Yields:
+            Tuples of (chunks, token count)
+        """
+        pending: List[Document] = []
+        pending_tokens = 0
+        ingested_at = int(time.time())
+        document_counts: Dict[Optional[str], int] = {}
+        for document in documents:
+            # Filterable fields, inherited by every chunk of the document
+            document.metadata["source_type"] = infer_source_type(document.metadata)
+            document.metadata.setdefault("ingested_at", ingested_at)
+            source = document.metadata.get("source")
+            document.metadata["document_index"] = document_counts.get(source, 0)
+            document_counts[source] = document.metadata["document_index"] + 1
+            stats["documents"] += 1
+            if job is not None:
+                job.document_loaded(source)
+            if source is None:
+                stats["new_documents"] += 1
+            elif source not in existing_ids:
+                existing_ids.update(
+                    self._get_source_chunk_ids(collection_name, [source])
+                )
+                if not existing_ids[source]:
+                    stats["new_documents"] += 1
+
+            chunks = text_splitter.split_documents([document])
+            stats["content_size"] += len(document.page_content)
+            stats["chunks"] += len(chunks)
+            stats["chunk_size"] += sum(len(chunk.page_content) for chunk in chunks)
+            queued = 0
+            stored: List[Document] = []
+            for index, chunk in enumerate(chunks):
+                chunk.metadata["chunk_index"] = index
+                source = chunk.metadata.get("source")
+                chunk.id = chunk_id(source, chunk.page_content)
+                seen = new_ids.setdefault(source, set())
+                tokens = self.token_counter.count(chunk.page_content)
+                stats["tokens"] += tokens
+                if chunk.id in seen or chunk.id in existing_ids.get(source, ()):
+                    if chunk.id not in seen:
+                        stored.append(chunk)
+                    stats["unchanged"] += 1
+                    stats["unchanged_tokens"] += tokens
+                else:
+                    if pending and pending_tokens + tokens > max_batch_tokens:
+                        yield pending, pending_tokens
+                        pending, pending_tokens = [], 0
+                    pending.append(chunk)
+                    pending_tokens += tokens
+                    queued += 1
+                    if len(pending) >= batch_size:
+                        yield pending, pending_tokens
+                        pending, pending_tokens = [], 0
+                seen.add(chunk.id)
+            stats["refreshed"] += self._refresh_chunk_metadata(collection_name, stored)
+            if job is not None:
+                job.document_split(source, len(chunks), queued)
+        if pending:
+            yield pending, pending_tokens
+
     def add_documents(
-        self, documents: List[Document], collection_name: Optional[str] = None
+        self,
+        documents: Union[Iterable[Document], AsyncIterable[Document]],
+        collection_name: Optional[str] = None,
+        job: Optional[IngestJob] = None,
     ) -> int:
-        """Add documents to the vector store using batch processing.
+        """Add documents to the vector store using pipelined batch processing.
+
+        Documents may be a list, any iterator (such as a loader's ``lazy_load``
+        generator) or an async iterator, and are consumed as a stream: each
+        document is split, batched, embedded and stored before the input is
+        exhausted, and up to ``max_concurrent_batches`` batches are embedded
+        concurrently. Peak memory depends on the batch settings rather than the
+        corpus size. A batch that still fails after its retries is logged and
+        skipped without stopping the remaining batches.
+
+        Chunk ids are derived from the document source and chunk content, so
+        re-ingesting a source only embeds new or changed chunks, and chunks
+        that no longer exist in the source are deleted once every batch has
+        been stored.
+
+        Async iterators are driven on a private event loop, so from a running
+        event loop use :meth:`aadd_documents` instead.
+
+        If an ingestion job is given, every source and batch is recorded in
+        the ingestion journal as it is extracted, split, embedded and stored,
+        and documents of sources stored by an earlier run of the job are
+        skipped.
 
         Args:
-            documents: List of documents to add
+            documents: Documents to add
             collection_name: Optional name of collection to add documents to
                            (defaults to current collection)
+            job: Optional ingestion job to record progress in
 
         Returns:
-            Number of chunks successfully processed
+            Number of chunks successfully processed (new or changed chunks stored,
+            plus unchanged chunks that were already stored)
 
         Raises:
-            ValueError: If documents list is empty or batch_size is invalid
+            ValueError: If documents is empty or batch_size is invalid
         """
-        if not documents:
+        documents = _iter_documents(documents)
+        first = next(documents, None)
+        if first is None:
             raise ValueError("Documents list cannot be empty")
+        documents = itertools.chain([first], documents)
+        if job is not None:
+            documents = job.skip_stored(documents)
 
         try:
             target_collection = collection_name or self.current_collection
@@ -371,24 +1352,13 @@ class VectorStore:
                 chunk_overlap=config.content["chunk_overlap"],
                 separators=config.content["separators"],
                 length_function=len,
+                add_start_index=True,
             )
             logger.debug(
                 "Splitting documents with chunk_size=%d, chunk_overlap=%d",
                 config.content["chunk_size"],
                 config.content["chunk_overlap"],
             )
-            splits = text_splitter.split_documents(documents)
-
-            total_content_size = sum(len(doc.page_content) for doc in documents)
-            total_chunk_size = sum(len(split.page_content) for split in splits)
-
-            logger.info(
-                "Processing %d documents (total size: %d chars) into %d chunks (total size: %d chars)",
-                len(documents),
-                total_content_size,
-                len(splits),
-                total_chunk_size,
-            )
 
             # Process in batches
             batch_settings = config.vector_store["batch_processing"]
@@ -397,66 +1367,166 @@ class VectorStore:
             # Validate batch size
             if batch_size <= 0:
                 raise ValueError("Batch size must be greater than 0")
-            if batch_size > len(splits):
-                logger.warning(
-                    f"Batch size ({batch_size}) is larger than number of chunks ({len(splits)}). "
-                    "Using chunk count as batch size."
-                )
-                batch_size = len(splits)
 
-            delay = batch_settings["delay_between_batches"]
+            max_batch_tokens = batch_settings.get("max_tokens_per_batch", 100000)
+            if max_batch_tokens <= 0:
+                raise ValueError("max_tokens_per_batch must be greater than 0")
 
-            successful_chunks = 0
-            total_batches = (len(splits) + batch_size - 1) // batch_size
-
-            # Update collection metadata for document count
-            collection = self._get_or_create_collection(target_collection)
-            collection._collection_metadata.document_count += len(documents)
-            collection._collection_metadata.last_modified = datetime.now(
-                UTC
-            ).isoformat()
-            self._save_collection_metadata()
+            max_in_flight = max(1, batch_settings.get("max_concurrent_batches", 4))
+            delay = batch_settings.get("delay_between_batches", 0.0)
+            tokens_sent_before = (
+                self._metered_embeddings.tokens_sent if self._metered_embeddings else 0
+            )
 
-            for i in range(0, len(splits), batch_size):
-                batch = splits[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
+            self._check_embedding_spec(target_collection, record=True)
+            # Chunk ids already stored and written by this ingestion, per source
+            existing_ids: Dict[str, Set[str]] = {}
+            new_ids: Dict[Optional[str], Set[str]] = {}
+
+            stats = {
+                "documents": 0,
+                "new_documents": 0,
+                "content_size": 0,
+                "chunks": 0,
+                "chunk_size": 0,
+                "unchanged": 0,
+                "refreshed": 0,
+                "tokens": 0,
+                "unchanged_tokens": 0,
+            }
+            successful_chunks = 0
+            successful_tokens = 0
+            failed_batches = 0
+            first_error: Optional[Exception] = None
+            in_flight: Dict[Future, Tuple[int, int, int]] = {}
+
+            def collect(done: Set[Future]) -> None:
+                nonlocal successful_chunks, successful_tokens, failed_batches, first_error
+                for future in done:
+                    batch_num, batch_len, batch_tokens = in_flight.pop(future)
+                    try:
+                        future.result()
+                        if job is not None:
+                            job.batch_finished(batch_num)
+                        successful_chunks += batch_len
+                        successful_tokens += batch_tokens
+                        logger.info(
+                            "Batch %d completed successfully (%d tokens in %d chunks processed)",
+                            batch_num,
+                            successful_tokens,
+                            successful_chunks,
+                        )
+                    except Exception as e:
+                        if job is not None:
+                            job.batch_finished(batch_num, e)
+                        failed_batches += 1
+                        first_error = first_error or e
+                        logger.error(
+                            "Batch %d failed (%d tokens in %d chunks processed): %s",
+                            batch_num,
+                            successful_tokens,
+                            successful_chunks,
+                            str(e),
+                        )
 
-                logger.info(
-                    "Processing batch %d/%d (%d chunks) for collection '%s'",
-                    batch_num,
-                    total_batches,
-                    len(batch),
+            with ThreadPoolExecutor(
+                max_workers=max_in_flight, thread_name_prefix="embed-batch"
+            ) as executor:
+                batches = self._iter_batches(
+                    documents,
                     target_collection,
+                    text_splitter,
+                    batch_size,
+                    max_batch_tokens,
+                    stats,
+                    existing_ids,
+                    new_ids,
+                    job,
                 )
+                for batch_num, (batch, batch_tokens) in enumerate(batches, 1):
+                    # Bound the number of batches held in memory and in flight
+                    if len(in_flight) >= max_in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+
+                    if delay and batch_num > 1:
+                        logger.debug("Waiting %.1f seconds before next batch", delay)
+                        time.sleep(delay)
 
-                if self._process_batch(batch, target_collection):
-                    successful_chunks += len(batch)
                     logger.info(
-                        "Batch %d/%d completed successfully (%d/%d chunks processed)",
+                        "Processing batch %d (%d chunks, %d tokens) for collection '%s'",
                         batch_num,
-                        total_batches,
-                        successful_chunks,
-                        len(splits),
+                        len(batch),
+                        batch_tokens,
+                        target_collection,
                     )
-                else:
-                    logger.error(
-                        "Batch %d/%d failed (%d/%d chunks processed)",
-                        batch_num,
-                        total_batches,
-                        successful_chunks,
-                        len(splits),
+                    if job is not None:
+                        job.batch_started(batch_num, batch, batch_tokens)
+                    future = executor.submit(
+                        self._process_batch, batch, target_collection
                     )
+                    in_flight[future] = (batch_num, len(batch), batch_tokens)
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            # Count sources ingested for the first time and unsourced documents
+            self._apply_metadata(
+                self.metadata_store.increment_counts(
+                    target_collection, documents=stats["new_documents"]
+                )
+            )
+
+            logger.info(
+                "Processed %d documents (total size: %d chars) into %d chunks (%d tokens)",
+                stats["documents"],
+                stats["content_size"],
+                stats["chunks"],
+                stats["tokens"],
+            )
+            self._report_ingest_tokens(
+                stats, successful_tokens, tokens_sent_before, failed_batches
+            )
+
+            if failed_batches and not successful_chunks:
+                raise first_error
 
-                if i + batch_size < len(splits):  # If not the last batch
-                    logger.debug("Waiting %.1f seconds before next batch", delay)
-                    time.sleep(delay)
+            if stats["unchanged"]:
+                logger.info(
+                    "Skipped %d chunks (%d tokens) that were already stored "
+                    "(metadata refreshed for %d)",
+                    stats["unchanged"],
+                    stats["unchanged_tokens"],
+                    stats["refreshed"],
+                )
+            successful_chunks += stats["unchanged"]
+
+            if failed_batches:
+                logger.warning(
+                    "Keeping previously stored chunks because %d batches failed",
+                    failed_batches,
+                )
+            else:
+                self.last_ingest_stats["deleted_chunks"] = self._delete_stale_chunks(
+                    target_collection, existing_ids, new_ids
+                )
+                self.metadata_store.record_sources(
+                    target_collection,
+                    {
+                        source: len(ids)
+                        for source, ids in new_ids.items()
+                        if source is not None
+                    },
+                )
 
-            if successful_chunks < len(splits):
+            if successful_chunks < stats["chunks"]:
                 logger.warning(
-                    "Partial success: %d/%d chunks successfully processed in collection '%s'",
+                    "Partial success: %d/%d chunks successfully processed in collection '%s' (%d failed batches)",
                     successful_chunks,
-                    len(splits),
+                    stats["chunks"],
                     target_collection,
+                    failed_batches,
                 )
             else:
                 logger.info(
@@ -471,24 +1541,474 @@ class VectorStore:
             logger.error("Error in document processing: %s", str(e))
             raise
 
-    def search(
+    def _report_ingest_tokens(
         self,
-        query: str,
-        limit: int = 5,
-        score_threshold: float = 0.2,
+        stats: Dict[str, int],
+        stored_tokens: int,
+        tokens_sent_before: int,
+        failed_batches: int,
+    ) -> None:
+        """Record and log token usage and estimated cost of an ingestion."""
+        sent = (
+            self._metered_embeddings.tokens_sent - tokens_sent_before
+            if self._metered_embeddings
+            else 0
+        )
+        price = config.vector_store["batch_processing"].get("cost_per_million_tokens")
+        if self.embedding_spec.provider == PROVIDER_LOCAL:
+            cost: Optional[float] = 0.0
+        elif self._metered_embeddings:
+            cost = estimate_cost(self.embedding_spec.model, sent, price)
+        else:
+            cost = None
+        self.last_ingest_stats = {
+            "documents": stats["documents"],
+            "chunks": stats["chunks"],
+            "unchanged_chunks": stats["unchanged"],
+            "deleted_chunks": 0,
+            "tokens": stats["tokens"],
+            "unchanged_tokens": stats["unchanged_tokens"],
+            "stored_tokens": stored_tokens,
+            "embedded_tokens": sent,
+            "estimated_cost_usd": cost,
+            "failed_batches": failed_batches,
+        }
+        if self._metered_embeddings is None:
+            logger.info("Stored %d tokens", stored_tokens)
+            return
+        logger.info(
+            "Stored %d tokens; %d tokens sent to the embedding API "
+            "(the rest served from the embedding cache)%s",
+            stored_tokens,
+            sent,
+            f", estimated cost ${cost:.4f}" if cost is not None else "",
+        )
+
+    async def aadd_documents(
+        self,
+        documents: Union[Iterable[Document], AsyncIterable[Document]],
         collection_name: Optional[str] = None,
-        search_all_collections: bool = False,
-    ) -> List[Tuple[Document, float]]:
-        """Search for documents similar to query.
+    ) -> int:
+        """Add documents from async code without blocking the event loop.
+
+        Ingestion runs in a worker thread. An async iterator keeps running on
+        the calling event loop and is pulled one document at a time, so a
+        crawler can feed pages while earlier ones are being embedded.
 
         Args:
-            query: Search query string
-            limit: Maximum number of results to return
-            score_threshold: Minimum similarity score threshold (0.0 to 1.0)
+            documents: Documents to add
+            collection_name: Optional name of collection to add documents to
+
+        Returns:
+            Number of chunks successfully processed (see add_documents)
+        """
+        if isinstance(documents, AsyncIterable):
+            documents = _pull_from_loop(documents, asyncio.get_running_loop())
+        return await asyncio.to_thread(self.add_documents, documents, collection_name)
+
+    def _embed_query(
+        self, query: str, spec: Optional[EmbeddingSpec] = None
+    ) -> List[float]:
+        """Embed a search query, reusing cached vectors for repeated queries.
+
+        Args:
+            query: Search query
+            spec: Embedding settings to embed with (defaults to the configured ones)
+        """
+        spec = spec or self.embedding_spec
+        if spec == self.embedding_spec:
+            embeddings = self.embeddings
+        else:
+            if spec not in self._query_embeddings:
+                self._query_embeddings[spec] = self._get_embeddings(spec)
+            embeddings = self._query_embeddings[spec]
+
+        if self.query_cache is None:
+            return embeddings.embed_query(query)
+
+        model = spec.model
+        dimensions = spec.dimensions
+        vector = self.query_cache.get(model, dimensions, query)
+        if vector is None:
+            vector = embeddings.embed_query(normalize_query(query))
+            self.query_cache.put(model, dimensions, query, vector)
+        else:
+            logger.debug("Query embedding served from cache")
+        return vector
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed search queries with the configured embeddings.
+
+        Queries are served from the query cache where possible and the rest
+        are embedded in a single request.
+        """
+        return self._embed_queries(queries)
+
+    def collection_generation(
+        self,
+        collection_name: Optional[str] = None,
+        search_all_collections: bool = False,
+    ) -> Optional[Tuple[Any, ...]]:
+        """Get a token that changes whenever searched collections are written.
+
+        The token is read from the metadata database, so writes by other
+        processes sharing the vector store are seen too.
+
+        Args:
+            collection_name: Collection to check (defaults to current collection)
+            search_all_collections: Whether to cover every collection
+
+        Returns:
+            Hashable generation token, or None if the collection is unknown
+        """
+        generations = self.metadata_store.get_generations()
+        if search_all_collections:
+            return tuple(sorted(generations.items()))
+        name = collection_name or self.current_collection
+        if name not in generations:
+            return None
+        return (name, *generations[name])
+
+    def _embed_queries(
+        self, queries: List[str], spec: Optional[EmbeddingSpec] = None
+    ) -> List[List[float]]:
+        """Embed several search queries with a single embeddings request.
+
+        Cached queries are served from the query cache, and the remaining
+        distinct queries are sent in one ``embed_documents`` call.
+
+        Args:
+            queries: Search queries
+            spec: Embedding settings to embed with (defaults to the configured ones)
+        """
+        spec = spec or self.embedding_spec
+        if spec == self.embedding_spec:
+            embeddings = self.embeddings
+        else:
+            if spec not in self._query_embeddings:
+                self._query_embeddings[spec] = self._get_embeddings(spec)
+            embeddings = self._query_embeddings[spec]
+        # Queries belong in the query cache, not the document embedding cache
+        if isinstance(embeddings, CachedEmbeddings):
+            embeddings = embeddings.embeddings
+
+        vectors: List[Optional[List[float]]] = [None] * len(queries)
+        missing: Dict[str, List[int]] = {}
+        for i, query in enumerate(queries):
+            if self.query_cache is not None:
+                vectors[i] = self.query_cache.get(spec.model, spec.dimensions, query)
+            if vectors[i] is None:
+                text = normalize_query(query) if self.query_cache else query
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            logger.debug(
+                f"Embedding {len(missing)} of {len(queries)} queries in one request"
+            )
+            texts = list(missing)
+            for text, vector in zip(texts, embeddings.embed_documents(texts)):
+                for i in missing[text]:
+                    vectors[i] = vector
+                    if self.query_cache is not None:
+                        self.query_cache.put(
+                            spec.model, spec.dimensions, queries[i], vector
+                        )
+        return vectors
+
+    def _search_collection_by_vector(
+        self,
+        name: str,
+        query_vector: List[float],
+        limit: int,
+        score_threshold: float,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        spec: Optional[EmbeddingSpec] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Search one collection with a precomputed query vector.
+
+        Args:
+            spec: Embedding settings the query vector was computed with
+                  (defaults to the configured ones)
+
+        Returns:
+            List of (document, relevance score) tuples above the threshold
+
+        Raises:
+            ValueError: If the collection was built with different embeddings
+        """
+        self._check_embedding_spec(name, spec=spec)
+        engine = self._get_search_engine(name)
+        if engine != ENGINE_HNSW:
+            return self._search_vector_index(
+                name, engine, query_vector, limit, score_threshold, where, where_document
+            )
+
+        filters: Dict[str, Any] = {}
+        if where:
+            filters["filter"] = where
+        if where_document:
+            filters["where_document"] = where_document
+        with self._use_collection(name) as collection:
+            results = collection.similarity_search_by_vector_with_relevance_scores(
+                query_vector, k=limit, **filters
+            )
+            relevance_fn = collection._select_relevance_score_fn()
+        scored = []
+        for doc, distance in results:
+            score = relevance_fn(distance)
+            if score >= score_threshold:
+                # Add collection name to metadata
+                doc.metadata["collection"] = name
+                scored.append((doc, score))
+        return scored
+
+    def _check_embedding_spec(
+        self, name: str, record: bool = False, spec: Optional[EmbeddingSpec] = None
+    ) -> None:
+        """Ensure a collection was built with the expected embedding provider.
+
+        Args:
+            name: Collection name
+            record: Whether to record the current provider for collections that
+                    have none recorded yet (done when writing to them)
+            spec: Expected embedding settings (defaults to the configured ones)
+
+        Raises:
+            ValueError: If the collection was built with a different provider,
+                        model or dimensions, including while it is being
+                        migrated to the expected ones
+        """
+        spec = spec or self.embedding_spec
+        metadata = self._register_collection(name)
+        built_with = metadata.embedding_spec
+        if built_with is None:
+            if record:
+                self._apply_metadata(
+                    self.metadata_store.set_embedding_spec(name, spec)
+                )
+            return
+        if built_with != spec and self.metadata_store.get_migration(name) is not None:
+            raise ValueError(
+                f"Collection '{name}' is being migrated from {built_with} to {spec} "
+                f"embeddings, and cannot be written until the migration completes. "
+                f"Searches keep working meanwhile. Run --migrate-collection {name} "
+                f"to finish it, then add the documents again."
+            )
+        if built_with != spec:
+            raise ValueError(
+                f"Collection '{name}' was built with {built_with} embeddings, but "
+                f"the configuration uses {spec}. Switch the embedding settings "
+                f"back or re-embed the collection with --migrate-collection {name}."
+            )
+
+    def _query_spec(self, name: str) -> EmbeddingSpec:
+        """Get the embedding settings to embed queries for a collection with.
+
+        While a collection is being migrated to the configured embeddings, it
+        is still searched with the embeddings it was built with. Changes to
+        the collection's storage made by another process, such as a finished
+        migration, are picked up here.
+        """
+        stored = self.metadata_store.get_collection(name)
+        if stored is not None:
+            cached = self._register_collection(name)
+            moved = (stored.storage_name, stored.shard_count) != (
+                cached.storage_name,
+                cached.shard_count,
+            )
+            if moved and name not in self._pinned:
+                self._close_collection(name)
+            self._apply_metadata(stored)
+
+        built_with = self._register_collection(name).embedding_spec
+        if (
+            built_with is not None
+            and built_with != self.embedding_spec
+            and self.metadata_store.get_migration(name) is not None
+        ):
+            return built_with
+        return self.embedding_spec
+
+    def _get_search_engine(self, name: str) -> str:
+        """Get the search engine configured for a collection.
+
+        ``auto`` resolves to exact search for collections of up to
+        ``search.engine.exact_max_chunks`` chunks and to HNSW above that.
+        Sharded collections always resolve to HNSW, which their shard
+        workers search in parallel.
+        """
+        settings = config.search.get("engine", {})
+        engine = settings.get("collections", {}).get(
+            name, settings.get("default", ENGINE_HNSW)
+        )
+        if engine not in SEARCH_ENGINES:
+            raise ValueError(
+                f"Invalid search engine '{engine}' for collection '{name}'. "
+                f"Expected one of: {', '.join(SEARCH_ENGINES)}"
+            )
+        if engine == ENGINE_AUTO:
+            max_chunks = settings.get("exact_max_chunks", DEFAULT_EXACT_MAX_CHUNKS)
+            metadata = self._register_collection(name)
+            exact = not metadata.shard_count and metadata.total_chunks <= max_chunks
+            engine = ENGINE_EXACT if exact else ENGINE_HNSW
+        return engine
+
+    def _get_vector_index(self, name: str, engine: str = ENGINE_EXACT) -> VectorIndex:
+        """Get the sidecar vector index of a collection, rebuilding it if stale.
+
+        The index is tagged with the collection's last_modified timestamp, so
+        writes from this or any other process trigger a rebuild on next use.
+        A rebuild only blocks searches of the same collection.
+
+        Reading the embeddings back loads Chroma's whole HNSW index, so the
+        collection handle is closed after a build (unless another thread is
+        using it). Searches through the sidecar then read only documents and
+        metadata from Chroma, which never loads the HNSW index again. In the
+        shared storage layout the index stays loaded with the shared client.
+        """
+        stored = self.metadata_store.get_collection(name)
+        version = stored.last_modified if stored else None
+        index_dir = Path(self.persist_directory) / INDEX_DIR / name
+
+        with self._index_lock:
+            build_lock = self._index_build_locks.setdefault(name, threading.Lock())
+        with build_lock:
+            with self._index_lock:
+                index = self._indexes.get(name)
+            if index is None or index.version != version:
+                index = VectorIndex.load(index_dir)
+            if index is None or index.version != version:
+                logger.info("Building vector index for collection '%s'", name)
+                ids, vectors = [], []
+                with self._use_collection(name) as collection:
+                    total = collection._collection.count()
+                    for offset in range(0, total, 5000):
+                        page = collection._collection.get(
+                            include=["embeddings"], limit=5000, offset=offset
+                        )
+                        ids.extend(page["ids"])
+                        vectors.extend(page["embeddings"])
+                index = VectorIndex.build(
+                    index_dir,
+                    ids,
+                    np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1),
+                    version=version,
+                    engine=engine,
+                )
+                with self._handles_lock:
+                    if name not in self._pinned:
+                        self._close_collection(name)
+            with self._index_lock:
+                self._indexes[name] = index
+            return index
+
+    def _search_vector_index(
+        self,
+        name: str,
+        engine: str,
+        query_vector: List[float],
+        limit: int,
+        score_threshold: float,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Search a collection through its sidecar vector index.
+
+        With filters, the matching ids are resolved by Chroma first and only
+        their vectors are scored.
+        """
+        settings = config.search.get("engine", {})
+        index = self._get_vector_index(name, engine)
+        rows = None
+        if where or where_document:
+            with self._use_collection(name) as collection:
+                ids = collection._collection.get(
+                    where=where, where_document=where_document, include=[]
+                )["ids"]
+            rows = index.rows_for_ids(ids)
+        matches = [
+            (id_, score)
+            for id_, score in index.search(
+                query_vector,
+                limit,
+                engine=engine,
+                rescore_factor=settings.get("rescore_factor", 4),
+                dimensions=settings.get(
+                    "truncated_dimensions", DEFAULT_TRUNCATED_DIMENSIONS
+                ),
+                rows=rows,
+            )
+            if score >= score_threshold
+        ]
+        if not matches:
+            return []
+
+        with self._use_collection(name) as collection:
+            records = collection._collection.get(
+                ids=[id_ for id_, _ in matches], include=["documents", "metadatas"]
+            )
+        by_id = {
+            id_: (text, metadata)
+            for id_, text, metadata in zip(
+                records["ids"], records["documents"], records["metadatas"]
+            )
+        }
+
+        results = []
+        for id_, score in matches:
+            if id_ not in by_id:
+                continue  # Deleted since the index was built
+            text, metadata = by_id[id_]
+            doc = Document(page_content=text, metadata=dict(metadata or {}), id=id_)
+            doc.metadata["collection"] = name
+            results.append((doc, score))
+        return results
+
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used to query collections concurrently."""
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(
+                max_workers=config.search.get("max_parallel_collections", 8),
+                thread_name_prefix="collection-search",
+            )
+        return self._search_executor
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        score_threshold: float = 0.2,
+        collection_name: Optional[str] = None,
+        search_all_collections: bool = False,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        query_vector: Optional[List[float]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Search for documents similar to query.
+
+        The query is embedded once and the vector is reused for every
+        collection searched. Collections being migrated to new embedding
+        settings are searched with their original embeddings until the
+        migration completes. Filters are applied by the search engine before
+        ranking, so ``limit`` results are returned when enough chunks match.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            score_threshold: Minimum similarity score threshold (0.0 to 1.0)
             collection_name: Optional name of collection to search in
                            (defaults to current collection)
             search_all_collections: If True, search across all collections
                                   (ignores collection_name)
+            where: Optional Chroma metadata filter, e.g.
+                   ``{"source_type": "pdf"}`` or
+                   ``{"$and": [{"branch": "main"}, {"ingested_at": {"$gte": 1700000000}}]}``
+            where_document: Optional Chroma document filter, e.g.
+                            ``{"$contains": "max_retries"}``
+            query_vector: Optional embedding of the query with the configured
+                          embeddings (see :meth:`embed_queries`), so it is
+                          not embedded again
 
         Returns:
             List of (document, score) tuples sorted by relevance
@@ -500,49 +2020,892 @@ class VectorStore:
         if not 0 <= score_threshold <= 1:
             raise ValueError("score_threshold must be between 0 and 1")
 
+        # Embed once per embedding spec in use (normally just the configured one)
+        query_vectors: Dict[EmbeddingSpec, List[float]] = {}
+        if query_vector is not None:
+            query_vectors[self.embedding_spec] = query_vector
+
+        def query_vector_for(name: str) -> Tuple[List[float], EmbeddingSpec]:
+            spec = self._query_spec(name)
+            if spec not in query_vectors:
+                query_vectors[spec] = self._embed_query(query, spec)
+            return query_vectors[spec], spec
+
+        return self._search_by_vectors(
+            query_vector_for,
+            limit,
+            score_threshold,
+            collection_name,
+            search_all_collections,
+            where,
+            where_document,
+        )
+
+    def search_many(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        score_threshold: float = 0.2,
+        collection_name: Optional[str] = None,
+        search_all_collections: bool = False,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        query_vectors: Optional[List[List[float]]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search for documents similar to each of several queries.
+
+        All queries are embedded in a single request per embedding spec in
+        use, and the searches then run concurrently on up to
+        search.max_parallel_queries threads. Arguments are as for
+        :meth:`search` and apply to every query, and ``query_vectors`` are
+        optional embeddings of the queries as returned by
+        :meth:`embed_queries`.
+
+        Returns:
+            One list of (document, score) tuples per query, in query order
+
+        Raises:
+            ValueError: If score_threshold is not between 0 and 1
+        """
+        if not 0 <= score_threshold <= 1:
+            raise ValueError("score_threshold must be between 0 and 1")
+        if not queries:
+            return []
+
+        if search_all_collections:
+            names = list(self._metadata)
+        else:
+            names = [collection_name or self.current_collection]
+        vectors_by_spec: Dict[EmbeddingSpec, List[List[float]]] = {}
+        if query_vectors is not None:
+            vectors_by_spec[self.embedding_spec] = query_vectors
+        for spec in {self._query_spec(name) for name in names}:
+            if spec not in vectors_by_spec:
+                vectors_by_spec[spec] = self._embed_queries(queries, spec)
+
+        def search_one(index: int) -> List[Tuple[Document, float]]:
+            def query_vector_for(name: str) -> Tuple[List[float], EmbeddingSpec]:
+                spec = self._query_spec(name)
+                if spec not in vectors_by_spec:
+                    # Spec changed by a migration finishing since embedding
+                    vectors_by_spec[spec] = self._embed_queries(queries, spec)
+                return vectors_by_spec[spec][index], spec
+
+            return self._search_by_vectors(
+                query_vector_for,
+                limit,
+                score_threshold,
+                collection_name,
+                search_all_collections,
+                where,
+                where_document,
+            )
+
+        max_workers = min(len(queries), config.search.get("max_parallel_queries", 8))
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="query-search"
+        ) as executor:
+            return list(executor.map(search_one, range(len(queries))))
+
+    def _search_by_vectors(
+        self,
+        query_vector_for: Callable[[str], Tuple[List[float], EmbeddingSpec]],
+        limit: int,
+        score_threshold: float,
+        collection_name: Optional[str],
+        search_all_collections: bool,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Document, float]]:
+        """Search one or all collections with the query vector for each.
+
+        Args:
+            query_vector_for: Returns the query vector for a collection and
+                              the embedding settings it was computed with
+        """
         if search_all_collections:
-            # Search across all collections and merge results
+            # Search all collections concurrently and merge into a global top-k
+            executor = self._get_search_executor()
+            futures = {}
+            for name in list(self._metadata):
+                try:
+                    query_vector, spec = query_vector_for(name)
+                except Exception as e:
+                    logger.error(f"Error embedding query for collection '{name}': {e}")
+                    continue
+                future = executor.submit(
+                    self._search_collection_by_vector,
+                    name,
+                    query_vector,
+                    limit,
+                    score_threshold,
+                    where,
+                    where_document,
+                    spec,
+                )
+                futures[future] = name
+
             all_results = []
-            for name in self._collections:
+            for future in as_completed(futures):
                 try:
-                    collection = self._collections[name]
-                    results = collection.similarity_search_with_relevance_scores(
-                        query,
-                        k=limit,
-                        score_threshold=score_threshold,
-                    )
-                    # Add collection name to metadata
-                    for doc, score in results:
-                        doc.metadata["collection"] = name
-                    all_results.extend(results)
+                    all_results.extend(future.result())
                 except Exception as e:
-                    logger.error(f"Error searching collection '{name}': {e}")
+                    logger.error(f"Error searching collection '{futures[future]}': {e}")
                     continue  # Continue with other collections on error
 
-            # Sort by score and limit results
-            all_results.sort(key=lambda x: x[1], reverse=True)
-            return all_results[:limit]
+            return heapq.nlargest(limit, all_results, key=lambda x: x[1])
         else:
             # Search in specific collection
-            collection = self._get_or_create_collection(
-                collection_name or self.current_collection
-            )
+            name = collection_name or self.current_collection
             try:
-                results = collection.similarity_search_with_relevance_scores(
-                    query,
-                    k=limit,
-                    score_threshold=score_threshold,
+                query_vector, spec = query_vector_for(name)
+                return self._search_collection_by_vector(
+                    name,
+                    query_vector,
+                    limit,
+                    score_threshold,
+                    where,
+                    where_document,
+                    spec,
                 )
-                # Add collection name to metadata
-                for doc, score in results:
-                    doc.metadata["collection"] = (
-                        collection_name or self.current_collection
-                    )
-                return results
             except Exception as e:
                 logger.error(f"Error searching collection: {e}")
                 raise
 
+    def _sync_lexical_index(self, name: str) -> None:
+        """Rebuild a collection's lexical index if it is out of sync with Chroma.
+
+        Collections indexed before the lexical index existed, or written by a
+        process that failed part way, are backfilled from stored chunks.
+        """
+        expected = self._register_collection(name).total_chunks
+        if self.lexical_index.count(name) == expected:
+            return
+
+        logger.info("Rebuilding lexical index for collection '%s'", name)
+        with self._write_lock, self._use_collection(name) as collection:
+            self.lexical_index.delete_collection(name)
+            total = collection._collection.count()
+            for offset in range(0, total, 5000):
+                page = collection._collection.get(
+                    include=["documents", "metadatas"], limit=5000, offset=offset
+                )
+                self.lexical_index.upsert(
+                    name, page["ids"], page["documents"], page["metadatas"]
+                )
+            self._apply_metadata(self.metadata_store.set_total_chunks(name, total))
+
+    def lexical_search(
+        self,
+        query: str,
+        limit: int = 5,
+        collection_name: Optional[str] = None,
+        search_all_collections: bool = False,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Search for chunks containing the query's keywords.
+
+        No embedding is computed, so this works without API calls. Scores are
+        BM25 relevance mapped into [0, 1) and are not comparable with vector
+        similarity scores.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            collection_name: Optional name of collection to search in
+                           (defaults to current collection)
+            search_all_collections: If True, search across all collections
+            where: Optional Chroma-style metadata filter (see search)
+            where_document: Optional Chroma-style document filter (see search)
+
+        Returns:
+            List of (document, score) tuples sorted by relevance
+        """
+        if search_all_collections:
+            collections = None
+            names = list(self._metadata)
+        else:
+            names = [collection_name or self.current_collection]
+            collections = names
+
+        for name in names:
+            try:
+                self._sync_lexical_index(name)
+            except Exception as e:
+                logger.error(f"Error syncing lexical index for '{name}': {e}")
+
+        results = []
+        for name, id_, text, metadata, score in self.lexical_index.search(
+            query, limit, collections, where=where, where_document=where_document
+        ):
+            metadata["collection"] = name
+            results.append((Document(page_content=text, metadata=metadata, id=id_), score))
+        return results
+
+    def export_collection(
+        self,
+        collection_name: str,
+        path: str,
+        batch_size: int = DEFAULT_SNAPSHOT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """Export a collection to a portable columnar snapshot.
+
+        Ids, texts and metadata are written to Parquet and embeddings to a
+        ``.npy`` file, page by page, so memory use does not grow with the
+        collection size.
+
+        Args:
+            collection_name: Collection to export
+            path: Snapshot directory to create
+            batch_size: Records read from Chroma per page
+
+        Returns:
+            The snapshot manifest
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        metadata = self.metadata_store.get_collection(collection_name)
+        if metadata is None:
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+
+        # Block writes from this process so pages stay consistent
+        with self._write_lock, self._use_collection(collection_name) as collection:
+            total = collection._collection.count()
+            first = collection._collection.get(include=["embeddings"], limit=1)
+            dimensions = (
+                len(first["embeddings"][0])
+                if total
+                else metadata.embedding_dimensions or self.embedding_spec.dimensions
+            )
+            writer = SnapshotWriter(path, total, dimensions)
+            for offset in range(0, total, batch_size):
+                page = collection._collection.get(
+                    include=["documents", "metadatas", "embeddings"],
+                    limit=batch_size,
+                    offset=offset,
+                )
+                writer.write(
+                    page["ids"], page["documents"], page["metadatas"], page["embeddings"]
+                )
+
+        spec = metadata.embedding_spec
+        manifest = writer.close(
+            {
+                "collection": collection_name,
+                "description": metadata.description,
+                "document_count": metadata.document_count,
+                "embedding": (
+                    {
+                        "provider": spec.provider,
+                        "model": spec.model,
+                        "dimensions": spec.dimensions,
+                    }
+                    if spec
+                    else None
+                ),
+                "exported_at": datetime.now(UTC).isoformat(),
+            }
+        )
+        logger.info(
+            "Exported %d chunks from collection '%s' to %s", total, collection_name, path
+        )
+        return manifest
+
+    def import_collection(
+        self,
+        path: str,
+        collection_name: Optional[str] = None,
+        batch_size: int = DEFAULT_SNAPSHOT_BATCH_SIZE,
+    ) -> int:
+        """Bulk-load a snapshot written by export_collection.
+
+        Stored embeddings are written directly, so no embedding calls are
+        made. Records with ids already in the collection are replaced.
+
+        Args:
+            path: Snapshot directory
+            collection_name: Collection to load into (defaults to the
+                             snapshot's original collection name)
+            batch_size: Records written per Chroma upsert
+
+        Returns:
+            Number of chunks imported
+
+        Raises:
+            ValueError: If the snapshot was built with different embedding
+                        settings than the configured ones or the target
+                        collection
+        """
+        reader = SnapshotReader(path)
+        manifest = reader.manifest
+        target = collection_name or manifest["collection"]
+
+        embedding = manifest.get("embedding")
+        if embedding:
+            snapshot_spec = EmbeddingSpec(
+                embedding["provider"], embedding["model"], embedding["dimensions"]
+            )
+            if snapshot_spec != self.embedding_spec:
+                raise ValueError(
+                    f"Snapshot was built with {snapshot_spec} embeddings, but the "
+                    f"configuration uses {self.embedding_spec}."
+                )
+        elif reader.count and manifest["dimensions"] != self.embedding_spec.dimensions:
+            raise ValueError(
+                f"Snapshot vectors have {manifest['dimensions']} dimensions, but the "
+                f"configuration uses {self.embedding_spec}."
+            )
+        self._check_embedding_spec(target, record=True)
+
+        known_sources = {
+            entry["source"] for entry in self.metadata_store.get_sources(target)
+        }
+        source_counts: Dict[str, int] = {}
+        imported = 0
+        with self._write_lock, self._use_collection(target) as collection:
+            for ids, texts, metadatas, vectors in reader.iter_batches(batch_size):
+                metadatas = [metadata or None for metadata in metadatas]
+                collection._collection.upsert(
+                    ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas
+                )
+                self.lexical_index.upsert(target, ids, texts, metadatas)
+                for metadata in metadatas:
+                    source = (metadata or {}).get("source")
+                    if source is not None:
+                        source_counts[source] = source_counts.get(source, 0) + 1
+                imported += len(ids)
+                logger.info("Imported %d/%d chunks", imported, reader.count)
+
+            self._apply_metadata(
+                self.metadata_store.set_total_chunks(
+                    target, collection._collection.count()
+                )
+            )
+
+        # Documents without a source can't be matched, so carry over their count
+        new_sources = [s for s in source_counts if s not in known_sources]
+        unsourced = max(0, manifest.get("document_count", 0) - len(source_counts))
+        self._apply_metadata(
+            self.metadata_store.increment_counts(
+                target, documents=len(new_sources) + unsourced
+            )
+        )
+        self.metadata_store.record_sources(target, source_counts)
+        if manifest.get("description") and not self._metadata[target].description:
+            self._metadata[target].description = manifest["description"]
+            self._save_collection_metadata()
+
+        logger.info(
+            "Imported %d chunks from %s into collection '%s'", imported, path, target
+        )
+        return imported
+
+    @_retry_rate_limits
+    def _reembed_records(
+        self,
+        destination: Any,
+        records: Dict[str, Any],
+        limiter: Optional[TokenRateLimiter] = None,
+    ) -> None:
+        """Embed stored records with the configured embeddings and upsert them."""
+        texts = records["documents"]
+        if limiter is not None:
+            limiter.acquire(self.token_counter.count_many(texts))
+        destination.upsert(
+            ids=records["ids"],
+            embeddings=self.embeddings.embed_documents(texts),
+            documents=texts,
+            metadatas=[metadata or None for metadata in records["metadatas"]],
+        )
+
+    def migrate_collection(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """Re-embed a collection with the configured embedding settings.
+
+        Stored chunk texts are re-embedded into a shadow Chroma collection,
+        so no source is fetched again. Progress is checkpointed in the
+        metadata store after every batch, and running the migration again
+        resumes from the last checkpoint. Embedding requests are limited to
+        ``vector_store.migration.tokens_per_minute`` tokens per minute.
+
+        Until the migration completes, searches keep using the collection's
+        existing vectors and original embeddings. Adding documents with the
+        new embeddings fails with a clear error until then, while deletes
+        still apply. Once every chunk has been re-embedded, chunks written or
+        deleted in the meantime are reconciled under the write lock, the
+        collection is switched to the shadow in a single metadata transaction,
+        and the old vectors are deleted once searches still using them finish.
+
+        Args:
+            collection_name: Collection to migrate
+            batch_size: Chunks re-embedded per request (defaults to
+                        vector_store.migration.batch_size)
+            stop_event: Optional event that pauses the migration after the
+                        current batch
+
+        Returns:
+            Dictionary with the collection name, status ("completed",
+            "paused" or "current" when no migration is needed) and the
+            processed and total chunk counts
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        settings = config.vector_store.get("migration", {})
+        batch_size = batch_size or settings.get(
+            "batch_size", DEFAULT_MIGRATION_BATCH_SIZE
+        )
+        tokens_per_minute = settings.get("tokens_per_minute", 0)
+        limiter = TokenRateLimiter(tokens_per_minute) if tokens_per_minute else None
+
+        stored = self.metadata_store.get_collection(collection_name)
+        if stored is None:
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+        self._apply_metadata(stored)
+        target = self.embedding_spec
+
+        migration = self.metadata_store.get_migration(collection_name)
+        if migration is not None and migration["embedding_spec"] != target:
+            logger.info(
+                "Embedding settings changed since the migration of '%s' started, "
+                "restarting it",
+                collection_name,
+            )
+            self._delete_storage(migration["shadow"], stored.shard_count)
+            migration = None
+        if migration is None:
+            if stored.embedding_spec == target:
+                logger.info(
+                    "Collection '%s' already uses %s embeddings", collection_name, target
+                )
+                return {
+                    "collection": collection_name,
+                    "status": "current",
+                    "processed": 0,
+                    "total": stored.total_chunks,
+                }
+            migration = self.metadata_store.start_migration(
+                collection_name,
+                f"{collection_name}-{uuid.uuid4().hex[:8]}",
+                target,
+                stored.total_chunks,
+            )
+            logger.info(
+                "Migrating collection '%s' from %s to %s embeddings",
+                collection_name,
+                stored.embedding_spec or "unrecorded",
+                target,
+            )
+
+        shadow = migration["shadow"]
+        processed = migration["processed"]
+        with self._use_collection(collection_name) as source, self._open_storage(
+            shadow, stored.shard_count
+        ) as destination:
+            total = source._collection.count()
+            while processed < total:
+                if stop_event is not None and stop_event.is_set():
+                    logger.info(
+                        "Migration of '%s' paused at %d/%d chunks",
+                        collection_name,
+                        processed,
+                        total,
+                    )
+                    return {
+                        "collection": collection_name,
+                        "status": "paused",
+                        "processed": processed,
+                        "total": total,
+                    }
+                page = source._collection.get(
+                    include=["documents", "metadatas"],
+                    limit=batch_size,
+                    offset=processed,
+                )
+                if not page["ids"]:
+                    break
+                self._reembed_records(destination, page, limiter)
+                processed += len(page["ids"])
+                self.metadata_store.set_migration_progress(collection_name, processed)
+                logger.info("Re-embedded %d/%d chunks", processed, total)
+
+        old_storage = self._register_collection(collection_name).storage_name
+        with self._write_lock:
+            with self._use_collection(collection_name) as source, self._open_storage(
+                shadow, stored.shard_count
+            ) as destination:
+                # Chunks written or deleted while the copy ran
+                source_ids = _get_all_ids(source._collection)
+                shadow_ids = set(_get_all_ids(destination))
+                missing = [id_ for id_ in source_ids if id_ not in shadow_ids]
+                for start in range(0, len(missing), batch_size):
+                    self._reembed_records(
+                        destination,
+                        source._collection.get(
+                            ids=missing[start : start + batch_size],
+                            include=["documents", "metadatas"],
+                        ),
+                        limiter,
+                    )
+                stale = list(shadow_ids.difference(source_ids))
+                if stale:
+                    destination.delete(ids=stale)
+                total = destination.count()
+                self._apply_metadata(
+                    self.metadata_store.finish_migration(collection_name, total)
+                )
+
+            # Reopen the collection on its new storage once no search uses the
+            # old one, which is deleted next
+            self._close_collection(collection_name, wait=True)
+            with self._index_lock:
+                self._indexes.pop(collection_name, None)
+
+        self._delete_storage(old_storage or collection_name, stored.shard_count)
+        logger.info(
+            "Migrated collection '%s' to %s embeddings (%d chunks, %d written "
+            "during the migration)",
+            collection_name,
+            target,
+            total,
+            len(missing),
+        )
+        return {
+            "collection": collection_name,
+            "status": "completed",
+            "processed": total,
+            "total": total,
+        }
+
+    def start_migration(
+        self, collection_name: str, stop_event: Optional[threading.Event] = None
+    ) -> threading.Thread:
+        """Run migrate_collection in a background thread.
+
+        Searches can continue on this store while the thread runs. Set
+        stop_event to pause the migration; it resumes when started again.
+        """
+
+        def run() -> None:
+            try:
+                self.migrate_collection(collection_name, stop_event=stop_event)
+            except Exception as e:
+                logger.error(f"Migration of collection '{collection_name}' failed: {e}")
+
+        thread = threading.Thread(
+            target=run, name=f"migrate-{collection_name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _copy_records(destination: Any, page: Dict[str, Any]) -> None:
+        """Write records read from one Chroma collection into another as they are."""
+        if page["ids"]:
+            destination.upsert(
+                ids=page["ids"],
+                embeddings=page["embeddings"],
+                documents=page["documents"],
+                metadatas=page["metadatas"],
+            )
+
+    def reshard_collection(
+        self,
+        collection_name: str,
+        shard_count: int,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Change the number of shards a collection is split across.
+
+        Stored vectors are copied, without re-embedding, into new storage
+        split across ``shard_count`` shards, each served by its own worker
+        process (a shard count of 0 or 1 turns sharding off). Searches keep
+        using the existing storage during the copy. Chunks written or deleted
+        in the meantime are reconciled under the write lock, the collection
+        is switched to the new storage in a single metadata update and the
+        old storage is deleted. A collection that does not exist yet is
+        created with the given number of shards.
+
+        Args:
+            collection_name: Collection to reshard
+            shard_count: Number of shards
+            batch_size: Chunks copied per batch (defaults to
+                        vector_store.sharding.rebalance_batch_size)
+
+        Returns:
+            Dictionary with the collection name, status ("created",
+            "completed" or "current"), previous and new shard counts and the
+            number of chunks
+
+        Raises:
+            ValueError: If shard_count is negative or the collection is
+                        being migrated to other embeddings
+        """
+        if shard_count < 0:
+            raise ValueError("Shard count cannot be negative")
+        shard_count = shard_count if shard_count > 1 else 0
+        batch_size = batch_size or config.vector_store.get("sharding", {}).get(
+            "rebalance_batch_size", DEFAULT_RESHARD_BATCH_SIZE
+        )
+
+        stored = self.metadata_store.get_collection(collection_name)
+        if stored is None:
+            metadata = CollectionMetadata(collection_name)
+            metadata.shard_count = shard_count
+            self._register_collection(collection_name, metadata)
+            logger.info(
+                "Created collection '%s' with %d shards", collection_name, shard_count
+            )
+            return {
+                "collection": collection_name,
+                "status": "created",
+                "previous_shards": 0,
+                "shards": shard_count,
+                "chunks": 0,
+            }
+        self._apply_metadata(stored)
+        previous = stored.shard_count
+        if shard_count == previous:
+            return {
+                "collection": collection_name,
+                "status": "current",
+                "previous_shards": previous,
+                "shards": shard_count,
+                "chunks": stored.total_chunks,
+            }
+        if self.metadata_store.get_migration(collection_name) is not None:
+            raise ValueError(
+                f"Collection '{collection_name}' is being migrated to other "
+                "embeddings; finish the migration before resharding it"
+            )
+
+        target = f"{collection_name}-{uuid.uuid4().hex[:8]}"
+        include = ["embeddings", "documents", "metadatas"]
+        logger.info(
+            "Resharding collection '%s' from %d to %d shards",
+            collection_name,
+            previous,
+            shard_count,
+        )
+        with self._open_storage(target, shard_count) as destination:
+            with self._use_collection(collection_name) as source:
+                total = source._collection.count()
+                for offset in range(0, total, batch_size):
+                    self._copy_records(
+                        destination,
+                        source._collection.get(
+                            include=include, limit=batch_size, offset=offset
+                        ),
+                    )
+                    logger.info(
+                        "Copied %d/%d chunks", min(offset + batch_size, total), total
+                    )
+
+            with self._write_lock:
+                with self._use_collection(collection_name) as source:
+                    # Chunks written or deleted while the copy ran
+                    source_ids = _get_all_ids(source._collection)
+                    target_ids = set(_get_all_ids(destination))
+                    missing = [id_ for id_ in source_ids if id_ not in target_ids]
+                    for start in range(0, len(missing), batch_size):
+                        self._copy_records(
+                            destination,
+                            source._collection.get(
+                                ids=missing[start : start + batch_size],
+                                include=include,
+                            ),
+                        )
+                    stale = list(target_ids.difference(source_ids))
+                    if stale:
+                        destination.delete(ids=stale)
+                    total = destination.count()
+                    self._apply_metadata(
+                        self.metadata_store.set_storage(
+                            collection_name, target, shard_count, total
+                        )
+                    )
+
+                # Reopen the collection on its new storage once no search uses
+                # the old one, which is deleted next
+                self._close_collection(collection_name, wait=True)
+                with self._index_lock:
+                    self._indexes.pop(collection_name, None)
+
+        self._delete_storage(stored.storage_name or collection_name, previous)
+        logger.info(
+            "Resharded collection '%s' to %d shards (%d chunks)",
+            collection_name,
+            shard_count,
+            total,
+        )
+        return {
+            "collection": collection_name,
+            "status": "completed",
+            "previous_shards": previous,
+            "shards": shard_count,
+            "chunks": total,
+        }
+
+    def get_shard_stats(self, collection_name: str) -> List[Dict[str, Any]]:
+        """Get the chunk count, disk size and worker process id of each shard.
+
+        Raises:
+            ValueError: If the collection does not exist or is not sharded
+        """
+        stored = self.metadata_store.get_collection(collection_name)
+        if stored is None or not stored.shard_count:
+            raise ValueError(f"Collection '{collection_name}' is not sharded")
+        self._query_spec(collection_name)
+        with self._use_collection(collection_name) as collection:
+            return collection._client.stats()
+
+    def _match_sources(self, collection_name: str, pattern: str, match: str) -> List[str]:
+        """Find the stored sources of a collection matching a prefix or glob.
+
+        Sources come from the metadata store. If it records fewer chunks than
+        the collection holds (for collections ingested before sources were
+        recorded), the sources are read from the stored chunk metadata instead.
+        """
+        recorded = self.metadata_store.get_sources(collection_name)
+        sources = {entry["source"] for entry in recorded}
+        total = self._register_collection(collection_name).total_chunks
+        if sum(entry["chunk_count"] for entry in recorded) < total:
+            with self._use_collection(collection_name) as collection:
+                for offset in range(0, collection._collection.count(), 5000):
+                    page = collection._collection.get(
+                        include=["metadatas"], limit=5000, offset=offset
+                    )
+                    sources.update(
+                        metadata["source"]
+                        for metadata in page["metadatas"]
+                        if metadata and metadata.get("source") is not None
+                    )
+
+        if match == SOURCE_MATCH_PREFIX:
+            return sorted(source for source in sources if source.startswith(pattern))
+        return sorted(
+            source for source in sources if fnmatch.fnmatchcase(source, pattern)
+        )
+
+    def delete_source(
+        self,
+        source: str,
+        collection_name: Optional[str] = None,
+        match: str = SOURCE_MATCH_EXACT,
+    ) -> Dict[str, int]:
+        """Delete the chunks of one or more sources from a collection.
+
+        Chunks are deleted by their ``source`` metadata in batches, along with
+        their lexical index entries and source records, and the collection's
+        document and chunk counts are updated. Other sources are untouched.
+
+        Args:
+            source: Source to delete, or a prefix or glob pattern
+            collection_name: Optional collection (defaults to current collection)
+            match: "exact" (the source itself), "prefix" (every source starting
+                   with it, e.g. a site or directory) or "glob" (shell-style
+                   pattern such as ``https://docs.example.com/v1/*``)
+
+        Returns:
+            Dictionary with the number of sources and chunks deleted
+
+        Raises:
+            ValueError: If match is not a supported mode
+        """
+        if match not in SOURCE_MATCH_MODES:
+            raise ValueError(
+                f"Invalid source match '{match}'. "
+                f"Expected one of: {', '.join(SOURCE_MATCH_MODES)}"
+            )
+        name = collection_name or self.current_collection
+        sources = (
+            [source]
+            if match == SOURCE_MATCH_EXACT
+            else self._match_sources(name, source, match)
+        )
+
+        deleted_sources: Set[str] = set()
+        deleted_chunks = 0
+        with self._write_lock, self._use_collection(name) as collection:
+            for start in range(0, len(sources), DELETE_SOURCES_BATCH_SIZE):
+                batch = sources[start : start + DELETE_SOURCES_BATCH_SIZE]
+                found = collection._collection.get(
+                    where={"source": {"$in": batch}}, include=["metadatas"]
+                )
+                if not found["ids"]:
+                    continue
+                collection._collection.delete(ids=found["ids"])
+                self.lexical_index.delete(name, found["ids"])
+                deleted_sources.update(
+                    metadata["source"] for metadata in found["metadatas"] if metadata
+                )
+                deleted_chunks += len(found["ids"])
+
+            if deleted_chunks:
+                self._apply_metadata(
+                    self.metadata_store.set_total_chunks(
+                        name, collection._collection.count()
+                    )
+                )
+
+        if deleted_sources:
+            self.metadata_store.delete_sources(name, sorted(deleted_sources))
+            self._apply_metadata(
+                self.metadata_store.increment_counts(
+                    name, documents=-len(deleted_sources)
+                )
+            )
+        logger.info(
+            "Deleted %d chunks of %d sources from collection '%s'",
+            deleted_chunks,
+            len(deleted_sources),
+            name,
+        )
+        return {"sources": len(deleted_sources), "chunks": deleted_chunks}
+
+    def refresh_source(
+        self,
+        source: str,
+        documents: Iterable[Document],
+        collection_name: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Replace the stored content of a source with freshly loaded documents.
+
+        Only new or changed chunks are embedded, and chunks the source no
+        longer produces are deleted. If no documents are given the source is
+        deleted.
+
+        Args:
+            source: Source to refresh
+            documents: Documents just loaded from the source; their ``source``
+                       metadata is set to ``source``
+            collection_name: Optional collection (defaults to current collection)
+
+        Returns:
+            Dictionary with the number of chunks stored, embedded and deleted
+        """
+        name = collection_name or self.current_collection
+        documents = list(documents)
+        if not documents:
+            deleted = self.delete_source(source, name)
+            return {"chunks": 0, "embedded": 0, "deleted": deleted["chunks"]}
+
+        for document in documents:
+            document.metadata["source"] = source
+        chunks = self.add_documents(documents, name)
+        stats = self.last_ingest_stats
+        return {
+            "chunks": chunks,
+            "embedded": chunks - stats.get("unchanged_chunks", 0),
+            "deleted": stats.get("deleted_chunks", 0),
+        }
+
     def clean_collection(self, collection_name: str) -> None:
         """Delete a specific collection.
 
@@ -552,12 +2915,30 @@ class VectorStore:
         if collection_name == DEFAULT_COLLECTION:
             raise ValueError("Cannot delete the default collection")
 
-        _delete_collection_files(collection_name)
-
-        # Remove from internal collections dict if present
-        if collection_name in self._collections:
-            del self._collections[collection_name]
-            logger.debug(f"Removed collection '{collection_name}' from memory")
+        # Close the handle before its files are removed
+        self._close_collection(collection_name, wait=True)
+        if self.storage_layout == STORAGE_LAYOUT_SHARED:
+            storage_names, shard_count = _get_storage_names(
+                Path(self.persist_directory), collection_name
+            )
+            for storage_name in storage_names:
+                self._delete_storage(storage_name, shard_count)
+        else:
+            _delete_collection_files(collection_name)
+
+        # Drop the sidecar vector index
+        with self._index_lock:
+            self._indexes.pop(collection_name, None)
+        index_dir = Path(self.persist_directory) / INDEX_DIR / collection_name
+        if index_dir.exists():
+            shutil.rmtree(index_dir)
+
+        # Forget the collection's metadata and lexical index entries
+        self.metadata_store.delete_collection(collection_name)
+        self.lexical_index.delete_collection(collection_name)
+        with self._handles_lock:
+            if self._metadata.pop(collection_name, None) is not None:
+                logger.debug(f"Removed collection '{collection_name}' from memory")
 
         # If current collection was deleted, switch to default
         if self.current_collection == collection_name:
@@ -0,0 +1,192 @@
+"""Token counting, rate limiting and cost estimates for embedding requests."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from rag_retriever.vectorstore.embedding_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_ENCODING = "cl100k_base"
+DEFAULT_TOKEN_CACHE_ENTRIES = 100000
+# Rough size of a token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+# USD per million input tokens
+EMBEDDING_PRICES = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+
+def estimate_cost(
+    model: str, tokens: int, price_per_million: Optional[float] = None
+) -> Optional[float]:
+    """Estimate the USD cost of embedding a number of tokens.
+
+    Returns None when the model's price is unknown and no price is given.
+    """
+    if price_per_million is None:
+        price_per_million = EMBEDDING_PRICES.get(model)
+    if price_per_million is None:
+        return None
+    return tokens * price_per_million / 1_000_000
+
+
+class TokenCounter:
+    """Count tokens with the model's tiktoken encoding, caching counts per chunk.
+
+    If the encoding cannot be loaded (for example when tiktoken cannot
+    download it) counts are estimated from the text length.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_entries: int = DEFAULT_TOKEN_CACHE_ENTRIES,
+        encoding: Any = None,
+    ):
+        """Initialize the counter.
+
+        Args:
+            model: Embedding model name used to pick the encoding
+            max_entries: Maximum number of cached counts
+            encoding: Optional tiktoken encoding to use instead of the model's
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self._encoding = encoding
+        self._encoding_loaded = encoding is not None
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_encoding(self) -> Any:
+        """Load the tiktoken encoding on first use."""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                import tiktoken
+
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+            except Exception as e:
+                logger.warning(
+                    f"Tokenizer unavailable, estimating token counts from length: {e}"
+                )
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text."""
+        key = content_hash(text)
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                return self._counts[key]
+            encoding = self._get_encoding()
+
+        if encoding is not None:
+            tokens = len(encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+        with self._lock:
+            self._counts[key] = tokens
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def count_many(self, texts: List[str]) -> int:
+        """Count the total tokens in several texts."""
+        return sum(self.count(text) for text in texts)
+
+
+class TokenRateLimiter:
+    """Block callers so that at most tokens_per_minute tokens are sent per minute.
+
+    Uses a sliding one-minute window shared by every thread. A request larger
+    than the whole budget is let through once the window is empty.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        """Initialize the limiter.
+
+        Args:
+            tokens_per_minute: Token budget per minute (0 disables limiting)
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> float:
+        """Wait until tokens fit in the budget and record them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.tokens_per_minute <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._used -= self._window.popleft()[1]
+                if not self._window or self._used + tokens <= self.tokens_per_minute:
+                    self._window.append((now, tokens))
+                    self._used += tokens
+                    return waited
+                delay = 60 - (now - self._window[0][0])
+
+            logger.debug("Token budget reached, waiting %.1f seconds", delay)
+            time.sleep(delay)
+            waited += delay
+
+
+class MeteredEmbeddings(Embeddings):
+    """Embeddings wrapper that rate limits and counts tokens sent to a provider."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        counter: TokenCounter,
+        limiter: Optional[TokenRateLimiter] = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            embeddings: Underlying embeddings provider
+            counter: Token counter for the provider's model
+            limiter: Optional tokens-per-minute limiter
+        """
+        self.embeddings = embeddings
+        self.counter = counter
+        self.limiter = limiter
+        self.tokens_sent = 0
+        self._lock = threading.Lock()
+
+    def _meter(self, tokens: int) -> None:
+        """Wait for budget and record tokens about to be sent."""
+        if self.limiter is not None:
+            self.limiter.acquire(tokens)
+        with self._lock:
+            self.tokens_sent += tokens
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts once the token budget allows."""
+        self._meter(self.counter.count_many(texts))
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query once the token budget allows."""
+        self._meter(self.counter.count(text))
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,384 @@
+"""Memory-mapped sidecar vector index for alternative first-pass search engines."""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import hnswlib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Constants
+INDEX_DIR = "_indexes"
+ENGINE_HNSW = "hnsw"
+ENGINE_INT8 = "int8"
+ENGINE_BINARY = "binary"
+ENGINE_TRUNCATED = "truncated"
+ENGINE_EXACT = "exact"
+# Picks exact search for small collections and HNSW for large ones
+ENGINE_AUTO = "auto"
+QUANTIZED_ENGINES = (ENGINE_INT8, ENGINE_BINARY)
+SIDECAR_ENGINES = (ENGINE_EXACT, *QUANTIZED_ENGINES, ENGINE_TRUNCATED)
+SEARCH_ENGINES = (ENGINE_AUTO, ENGINE_HNSW, *SIDECAR_ENGINES)
+DEFAULT_EXACT_MAX_CHUNKS = 100000
+DEFAULT_TRUNCATED_DIMENSIONS = 256
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+IDS_FILE = "ids.json"
+# Rows scored at a time, which bounds temporary memory during a scan
+SCAN_BLOCK_ROWS = 16384
+# HNSW graph parameters for the truncated-dimension index
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_MIN_EF = 64
+
+# Number of set bits for every byte value, used for Hamming distances
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _quantize(
+    vectors: np.ndarray, engine: str
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Quantize normalized vectors into an engine's codes (and int8 scales)."""
+    code_blocks, scale_blocks = [], []
+    for start in range(0, len(vectors), SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start : start + SCAN_BLOCK_ROWS])
+        if engine == ENGINE_INT8:
+            peak = np.abs(block).max(axis=1, keepdims=True)
+            peak[peak == 0] = 1.0
+            code_blocks.append(np.round(block / peak * 127).astype(np.int8))
+            scale_blocks.append((peak[:, 0] / 127).astype(np.float32))
+        else:
+            code_blocks.append(np.packbits(block > 0, axis=1))
+    codes = np.concatenate(code_blocks) if code_blocks else np.empty((0, 0))
+    scales = np.concatenate(scale_blocks) if scale_blocks else None
+    return codes, scales
+
+
+class VectorIndex:
+    """Read-only copy of a collection's vectors used for first-pass search.
+
+    Full-precision vectors are stored normalized in a float32 ``.npy`` file
+    that is memory-mapped, so only the pages touched while rescoring are read.
+    The ``exact`` engine scores every vector against the query in blocks
+    and needs no other structure. Other engines build their first-pass
+    structure on first use and cache it next to the vectors:
+
+    - ``int8``: each vector scaled to [-127, 127] with a per-vector scale
+    - ``binary``: one sign bit per dimension, compared by Hamming distance
+    - ``truncated``: an HNSW graph over the first N dimensions of each vector,
+      renormalized (Matryoshka-style, for models such as text-embedding-3)
+
+    Their first pass selects ``k * rescore_factor`` candidates that are then
+    rescored exactly against the full-precision vectors.
+
+    Only the codes are held in memory. Rescoring reads the candidate rows
+    from the memory-mapped vectors, so a search touches a few pages of the
+    file rather than loading the collection's full-precision vectors (as
+    fetching them from Chroma would, since Chroma loads its whole HNSW
+    index to serve embeddings).
+    """
+
+    def __init__(self, directory: Path):
+        """Open an existing index.
+
+        Args:
+            directory: Directory holding the index files
+        """
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST_FILE, "r") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+        with open(self.directory / IDS_FILE, "r") as f:
+            self.ids: List[str] = json.load(f)
+        self.vectors = np.load(self.directory / VECTORS_FILE, mmap_mode="r")
+        self._codes: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+        self._graphs: Dict[int, hnswlib.Index] = {}
+        self._rows: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the collection the index was built from."""
+        return self.manifest.get("version")
+
+    @property
+    def count(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.ids)
+
+    @property
+    def dimensions(self) -> int:
+        """Dimensions of the indexed vectors."""
+        return self.manifest["dimensions"]
+
+    @classmethod
+    def build(
+        cls,
+        directory: Path,
+        ids: List[str],
+        vectors: np.ndarray,
+        version: Optional[str] = None,
+        engine: str = ENGINE_EXACT,
+    ) -> "VectorIndex":
+        """Write a new index, replacing any existing one.
+
+        The index is written to a directory of its own and renamed into
+        place, so concurrent builds in other threads or processes never
+        write to the same files and readers never see a partial index.
+
+        Args:
+            directory: Directory to write the index files to
+            ids: Chunk ids aligned with vectors
+            vectors: Full-precision vectors, one row per id
+            version: Opaque version of the source collection used to detect staleness
+            engine: Engine the index is built for. The codes of a quantized
+                    engine are written with the vectors, so its first search
+                    does not have to compute them.
+
+        Returns:
+            The opened index
+        """
+        directory = Path(directory)
+        staging = directory.with_name(f"{directory.name}.building-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+
+        matrix = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        np.save(staging / VECTORS_FILE, matrix)
+        if engine in QUANTIZED_ENGINES:
+            codes, scales = _quantize(matrix, engine)
+            np.save(staging / f"codes_{engine}.npy", codes)
+            if scales is not None:
+                np.save(staging / f"scales_{engine}.npy", scales)
+        with open(staging / IDS_FILE, "w") as f:
+            json.dump(list(ids), f)
+        with open(staging / MANIFEST_FILE, "w") as f:
+            json.dump(
+                {"version": version, "count": len(ids), "dimensions": matrix.shape[1]},
+                f,
+            )
+
+        # Move the old index aside and swap the finished one into place
+        retired = directory.with_name(f"{directory.name}.old-{uuid.uuid4().hex}")
+        try:
+            directory.rename(retired)
+        except FileNotFoundError:
+            pass
+        try:
+            staging.rename(directory)
+        except OSError:
+            # Another build was swapped in first; it is just as current
+            logger.debug("Vector index at %s was replaced concurrently", directory)
+            shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(retired, ignore_errors=True)
+        logger.debug("Built vector index with %d vectors at %s", len(ids), directory)
+        return cls(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["VectorIndex"]:
+        """Open the index in a directory, or return None if there is none."""
+        try:
+            return cls(directory)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"No usable vector index at {directory}: {e}")
+            return None
+
+    def _get_codes(self, engine: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Load or build the quantized codes (and scales) for an engine."""
+        if engine in self._codes:
+            return self._codes[engine]
+
+        codes_path = self.directory / f"codes_{engine}.npy"
+        scales_path = self.directory / f"scales_{engine}.npy"
+        codes = np.load(codes_path) if codes_path.exists() else None
+        if codes is not None and len(codes) == self.count:
+            scales = np.load(scales_path) if scales_path.exists() else None
+        else:
+            codes, scales = _quantize(self.vectors, engine)
+            np.save(codes_path, codes)
+            if scales is not None:
+                np.save(scales_path, scales)
+
+        self._codes[engine] = (codes, scales)
+        return self._codes[engine]
+
+    def _first_pass_scores(self, query: np.ndarray, engine: str) -> np.ndarray:
+        """Approximate similarity of the query to every indexed vector."""
+        codes, scales = self._get_codes(engine)
+        scores = np.empty(self.count, dtype=np.float32)
+        if engine == ENGINE_INT8:
+            for start in range(0, self.count, SCAN_BLOCK_ROWS):
+                block = codes[start : start + SCAN_BLOCK_ROWS].astype(np.float32)
+                stop = start + len(block)
+                scores[start:stop] = (block @ query) * scales[start:stop]
+        else:
+            query_bits = np.packbits(query > 0)
+            for start in range(0, self.count, SCAN_BLOCK_ROWS):
+                block = codes[start : start + SCAN_BLOCK_ROWS]
+                hamming = _POPCOUNT[np.bitwise_xor(block, query_bits)].sum(
+                    axis=1, dtype=np.int32
+                )
+                scores[start : start + len(block)] = -hamming
+        return scores
+
+    def _get_graph(self, dimensions: int) -> hnswlib.Index:
+        """Load or build the HNSW graph over the leading dimensions."""
+        with self._lock:
+            if dimensions in self._graphs:
+                return self._graphs[dimensions]
+
+            graph = hnswlib.Index(space="ip", dim=dimensions)
+            graph_path = self.directory / f"hnsw_{ENGINE_TRUNCATED}_{dimensions}.bin"
+            if graph_path.exists():
+                graph.load_index(str(graph_path), max_elements=self.count)
+            else:
+                graph.init_index(
+                    max_elements=self.count,
+                    M=HNSW_M,
+                    ef_construction=HNSW_EF_CONSTRUCTION,
+                )
+                for start in range(0, self.count, SCAN_BLOCK_ROWS):
+                    block = np.asarray(self.vectors[start : start + SCAN_BLOCK_ROWS])
+                    graph.add_items(
+                        _normalize(block[:, :dimensions]),
+                        np.arange(start, start + len(block)),
+                    )
+                graph.save_index(str(graph_path))
+            graph.set_ef(HNSW_MIN_EF)
+            self._graphs[dimensions] = graph
+            return graph
+
+    def _truncated_candidates(
+        self, query: np.ndarray, num_candidates: int, dimensions: int
+    ) -> np.ndarray:
+        """Select candidates by approximate search over truncated vectors."""
+        if dimensions <= 0:
+            raise ValueError(f"Truncated dimensions must be positive, got {dimensions}")
+        dimensions = min(dimensions, self.dimensions)
+        graph = self._get_graph(dimensions)
+        num_candidates = min(num_candidates, self.count)
+        with self._lock:
+            if graph.ef < num_candidates:
+                graph.set_ef(num_candidates)
+        labels, _ = graph.knn_query(
+            _normalize(query[:dimensions]).reshape(1, -1), k=num_candidates
+        )
+        return labels[0].astype(np.int64)
+
+    def rows_for_ids(self, ids: List[str]) -> np.ndarray:
+        """Row numbers of the given ids, skipping ids not in the index."""
+        if self._rows is None:
+            self._rows = {id_: row for row, id_ in enumerate(self.ids)}
+        return np.array(
+            sorted(self._rows[id_] for id_ in ids if id_ in self._rows), dtype=np.int64
+        )
+
+    def _all_exact_scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query to every indexed vector."""
+        scores = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, SCAN_BLOCK_ROWS):
+            block = np.asarray(self.vectors[start : start + SCAN_BLOCK_ROWS])
+            scores[start : start + len(block)] = block @ query
+        return scores
+
+    def exact_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query to the given rows at full precision."""
+        order = np.argsort(rows)
+        scores = np.empty(len(rows), dtype=np.float32)
+        # Read rows in file order so the memory map is accessed sequentially
+        scores[order] = np.asarray(self.vectors[rows[order]]) @ query
+        return scores
+
+    def search(
+        self,
+        query_vector: List[float],
+        k: int,
+        engine: str = ENGINE_INT8,
+        rescore_factor: int = 4,
+        dimensions: int = DEFAULT_TRUNCATED_DIMENSIONS,
+        rows: Optional[np.ndarray] = None,
+    ) -> List[Tuple[str, float]]:
+        """Find the k most similar vectors.
+
+        When ``rows`` is given (the rows matching a metadata filter) only
+        those rows are scored, exactly, whatever the engine.
+
+        Args:
+            query_vector: Query embedding
+            k: Number of results to return
+            engine: Search engine ("exact", "int8", "binary" or "truncated")
+            rescore_factor: Candidates rescored exactly per requested result
+            dimensions: Leading dimensions searched by the truncated engine
+            rows: Optional row numbers to restrict the search to
+
+        Returns:
+            List of (id, cosine similarity) tuples, best first
+        """
+        if engine not in SIDECAR_ENGINES:
+            raise ValueError(f"Unsupported vector index engine: {engine}")
+        if not self.count or k <= 0:
+            return []
+
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        if rows is not None:
+            scores = self.exact_scores(query, rows)
+            return [(self.ids[rows[i]], float(scores[i])) for i in _top_k(scores, k)]
+        if engine == ENGINE_EXACT:
+            scores = self._all_exact_scores(query)
+            return [(self.ids[i], float(scores[i])) for i in _top_k(scores, k)]
+
+        num_candidates = k * max(1, rescore_factor)
+        if engine == ENGINE_TRUNCATED:
+            candidates = self._truncated_candidates(query, num_candidates, dimensions)
+        else:
+            candidates = _top_k(self._first_pass_scores(query, engine), num_candidates)
+        exact = self.exact_scores(query, candidates)
+        best = _top_k(exact, k)
+        return [(self.ids[candidates[i]], float(exact[i])) for i in best]
+
+    def memory_bytes(
+        self,
+        engine: str,
+        dimensions: int = DEFAULT_TRUNCATED_DIMENSIONS,
+        candidates: int = 0,
+    ) -> int:
+        """Bytes an engine reads into memory to answer a query.
+
+        This is the engine's first-pass structure plus the full-precision
+        rows of ``candidates`` rescored candidates, which are paged in from
+        the memory-mapped vectors. The exact engine reads every vector.
+        """
+        rescored = min(candidates, self.count) * self.dimensions * 4
+        if engine == ENGINE_TRUNCATED:
+            # Vector data plus the base layer links of the graph
+            dimensions = min(dimensions, self.dimensions)
+            return self.count * (dimensions * 4 + HNSW_M * 2 * 4) + rescored
+        if engine in QUANTIZED_ENGINES:
+            codes, scales = self._get_codes(engine)
+            first_pass = codes.nbytes + (scales.nbytes if scales is not None else 0)
+            return first_pass + rescored
+        return self.count * self.dimensions * 4
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark first-pass search engines on a collection.
+
+Compares Chroma's HNSW index and the sidecar engines (exact brute force,
+quantized and truncated-dimension) against exact search over the
+full-precision vectors, reporting recall@k, latency and the memory each
+engine reads per query (its first-pass structure plus the rescored rows).
+Queries are sampled from stored chunk vectors (with a little noise), so no
+embedding calls are made.
+
+Example:
+    python scripts/benchmark_search.py --collection docs --queries 200 --limit 10
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from rag_retriever.vectorstore.store import VectorStore
+from rag_retriever.vectorstore.vector_index import (
+    ENGINE_HNSW,
+    SIDECAR_ENGINES,
+    VectorIndex,
+    _normalize,
+    _top_k,
+)
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def sample_queries(index: VectorIndex, count: int, noise: float, seed: int) -> np.ndarray:
+    """Sample query vectors near stored vectors."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(index.count, size=min(count, index.count), replace=False)
+    queries = np.asarray(index.vectors[np.sort(rows)], dtype=np.float32)
+    queries += rng.normal(scale=noise, size=queries.shape).astype(np.float32)
+    return _normalize(queries)
+
+
+def exact_ids(index: VectorIndex, query: np.ndarray, k: int) -> List[str]:
+    """Ground-truth top-k ids by brute-force cosine similarity."""
+    scores = np.asarray(index.vectors) @ query
+    return [index.ids[i] for i in _top_k(scores, k)]
+
+
+def summarize(latencies: List[float], recalls: List[float], memory: int) -> Dict:
+    """Summarize benchmark measurements for one engine."""
+    return {
+        "recall": float(np.mean(recalls)),
+        "latency_ms_mean": float(np.mean(latencies) * 1000),
+        "latency_ms_p95": float(np.percentile(latencies, 95) * 1000),
+        "memory_mb": memory / (1024 * 1024),
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Dict]:
+    """Run every engine over the sampled queries."""
+    store = VectorStore(collection_name=args.collection)
+    index = store._get_vector_index(args.collection)
+    if not index.count:
+        raise SystemExit(f"Collection '{args.collection}' is empty")
+
+    queries = sample_queries(index, args.queries, args.noise, args.seed)
+    truth = [set(exact_ids(index, q, args.limit)) for q in queries]
+    results = {}
+
+    # Chroma HNSW
+    latencies, recalls = [], []
+    with store._use_collection(args.collection) as collection:
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            found = collection._collection.query(
+                query_embeddings=[query.tolist()], n_results=args.limit, include=[]
+            )["ids"][0]
+            latencies.append(time.perf_counter() - start)
+            recalls.append(len(expected.intersection(found)) / len(expected))
+    results[ENGINE_HNSW] = summarize(
+        latencies, recalls, index.memory_bytes(ENGINE_HNSW)
+    )
+
+    # Sidecar engines with exact rescoring
+    for engine in SIDECAR_ENGINES:
+        # Build codes or graph before timing
+        index.search(queries[0], args.limit, engine=engine, dimensions=args.dimensions)
+        latencies, recalls = [], []
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            found = index.search(
+                query,
+                args.limit,
+                engine=engine,
+                rescore_factor=args.rescore_factor,
+                dimensions=args.dimensions,
+            )
+            latencies.append(time.perf_counter() - start)
+            recalls.append(
+                len(expected.intersection(id_ for id_, _ in found)) / len(expected)
+            )
+        results[engine] = summarize(
+            latencies,
+            recalls,
+            index.memory_bytes(
+                engine,
+                dimensions=args.dimensions,
+                candidates=args.limit * args.rescore_factor,
+            ),
+        )
+
+    store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector search engines")
+    parser.add_argument("--collection", default="default", help="Collection to benchmark")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--limit", type=int, default=10, help="Results per query (k)")
+    parser.add_argument(
+        "--rescore-factor",
+        type=int,
+        default=4,
+        help="Candidates rescored exactly per result for sidecar engines",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        default=256,
+        help="Leading dimensions indexed by the truncated engine",
+    )
+    parser.add_argument(
+        "--noise", type=float, default=0.01, help="Noise added to sampled query vectors"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\nCollection: {args.collection} (k={args.limit}, {args.queries} queries)")
+    print(f"{'Engine':<11}{'Recall':>10}{'Mean ms':>12}{'p95 ms':>12}{'Memory MB':>12}")
+    for engine, stats in results.items():
+        print(
+            f"{engine:<11}{stats['recall']:>10.3f}{stats['latency_ms_mean']:>12.2f}"
+            f"{stats['latency_ms_p95']:>12.2f}{stats['memory_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
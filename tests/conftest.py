@@ -9,3 +9,21 @@ def pytest_configure(config):
         "markers",
         "integration: mark tests that require external services or network access",
     )
+
+
+@pytest.fixture(autouse=True)
+def reset_query_cache():
+    """Keep cached query embeddings from leaking between tests."""
+    from rag_retriever.vectorstore import store
+
+    store._query_cache = None
+    yield
+    store._query_cache = None
+
+
+@pytest.fixture(autouse=True)
+def isolate_embedding_cache(tmp_path, monkeypatch):
+    """Keep tests from writing to the user's real embedding cache."""
+    monkeypatch.setenv(
+        "EMBEDDING_CACHE_PATH", str(tmp_path / "cache" / "embedding_cache.sqlite3")
+    )
@@ -0,0 +1,129 @@
+"""Unit tests for the embedding cache."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from rag_retriever.vectorstore.embedding_cache import (
+    EmbeddingCache,
+    CachedEmbeddings,
+    QueryEmbeddingCache,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an embedding cache backed by a temporary database."""
+    cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite3"), max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_put_and_get(cache):
+    """Test that stored vectors are returned for matching model and dimensions."""
+    cache.put_many("model-a", 2, ["hello", "world"], [[0.1, 0.2], [0.3, 0.4]])
+
+    results = cache.get_many("model-a", 2, ["hello", "missing", "world"])
+
+    assert results[0] == pytest.approx([0.1, 0.2])
+    assert results[1] is None
+    assert results[2] == pytest.approx([0.3, 0.4])
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+def test_key_includes_model_and_dimensions(cache):
+    """Test that vectors are not shared across models or dimensions."""
+    cache.put_many("model-a", 2, ["hello"], [[0.1, 0.2]])
+
+    assert cache.get_many("model-b", 2, ["hello"]) == [None]
+    assert cache.get_many("model-a", 3, ["hello"]) == [None]
+
+
+def test_lru_eviction(cache):
+    """Test that the least recently used entries are evicted past max_entries."""
+    cache.put_many("m", 1, ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache.get_many("m", 1, ["a"])  # Touch "a" so "b" is the oldest
+    cache.put_many("m", 1, ["d"], [[4.0]])
+
+    results = cache.get_many("m", 1, ["a", "b", "c", "d"])
+    assert results[1] is None
+    assert all(r is not None for i, r in enumerate(results) if i != 1)
+    assert cache.stats()["entries"] == 3
+
+
+def test_prune(cache):
+    """Test pruning the cache down to a given size."""
+    cache.put_many("m", 1, ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+
+    assert cache.prune(1) == 2
+    assert cache.stats()["entries"] == 1
+    assert cache.prune(0) == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_stats_persist_across_instances(tmp_path):
+    """Test that hit/miss counters accumulate on disk."""
+    path = str(tmp_path / "cache.sqlite3")
+    first = EmbeddingCache(path=path)
+    first.put_many("m", 1, ["a"], [[1.0]])
+    first.get_many("m", 1, ["a", "b"])
+    first.close()
+
+    second = EmbeddingCache(path=path)
+    stats = second.stats()
+    second.close()
+
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["session_hits"] == 0
+
+
+def test_cached_embeddings_only_embeds_misses(cache):
+    """Test that the wrapper sends only uncached texts to the provider."""
+    provider = MagicMock()
+    provider.embed_documents.side_effect = lambda texts: [
+        [float(len(t))] for t in texts
+    ]
+    embeddings = CachedEmbeddings(provider, cache, model="m", dimensions=1)
+
+    first = embeddings.embed_documents(["aa", "bbb", "aa"])
+    provider.embed_documents.assert_called_once_with(["aa", "bbb"])
+    assert first == [[2.0], [3.0], [2.0]]
+
+    provider.embed_documents.reset_mock()
+    second = embeddings.embed_documents(["bbb", "cccc"])
+    provider.embed_documents.assert_called_once_with(["cccc"])
+    assert second == [[3.0], [4.0]]
+
+
+def test_query_cache_normalizes_queries():
+    """Test that whitespace variants of a query share one entry."""
+    query_cache = QueryEmbeddingCache(max_entries=2)
+    query_cache.put("m", 2, "hello   world", [0.1, 0.2])
+
+    assert query_cache.get("m", 2, " hello world ") == [0.1, 0.2]
+    assert query_cache.get("other", 2, "hello world") is None
+    assert query_cache.stats()["hit_rate"] == 0.5
+
+
+def test_query_cache_ttl_and_lru():
+    """Test that entries expire after the TTL and the oldest is evicted."""
+    query_cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=10)
+    with patch("rag_retriever.vectorstore.embedding_cache.time.monotonic", return_value=0):
+        query_cache.put("m", 1, "a", [1.0])
+        query_cache.put("m", 1, "b", [2.0])
+        query_cache.put("m", 1, "c", [3.0])
+        assert query_cache.get("m", 1, "a") is None  # Evicted
+
+    with patch("rag_retriever.vectorstore.embedding_cache.time.monotonic", return_value=11):
+        assert query_cache.get("m", 1, "c") is None  # Expired
+
+
+def test_query_cache_persists(cache):
+    """Test that persisted query embeddings survive a new in-memory cache."""
+    QueryEmbeddingCache(persistent=cache).put("m", 2, "query", [0.5, 0.25])
+
+    restarted = QueryEmbeddingCache(persistent=cache)
+    assert restarted.get("m", 2, "query") == pytest.approx([0.5, 0.25])
+    assert restarted.stats()["hits"] == 1
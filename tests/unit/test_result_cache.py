@@ -0,0 +1,96 @@
+"""Unit tests for the semantic search result cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from rag_retriever.search.result_cache import SemanticResultCache
+from rag_retriever.search.searcher import Searcher
+
+
+def test_similar_query_hits_and_distant_query_misses():
+    """Test that only queries within max_distance share cached results."""
+    cache = SemanticResultCache(max_distance=0.05)
+    cache.put("key", 1, [1.0, 0.0], ["result"], search_ms=50.0)
+
+    assert cache.get("key", 1, [1.0, 0.1]) == ["result"]  # distance ~0.005
+    assert cache.get("key", 1, [1.0, 1.0]) is None  # distance ~0.29
+    assert cache.get("other", 1, [1.0, 0.0]) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert 0 < stats["saved_ms"] <= 50.0
+
+
+def test_new_generation_invalidates_entries():
+    """Test that entries stored before a write are dropped."""
+    cache = SemanticResultCache(max_entries=2)
+    cache.put("key", 1, [1.0, 0.0], ["old"], search_ms=10.0)
+
+    assert cache.get("key", 2, [1.0, 0.0]) is None
+    assert cache.stats()["invalidated"] == 1
+    assert cache.stats()["entries"] == 0
+
+    for i in range(3):
+        cache.put("key", 2, [1.0, float(i)], [i], search_ms=10.0)
+    assert cache.stats()["entries"] == 2
+
+
+def test_searcher_serves_paraphrase_from_cache():
+    """Test that a paraphrased query is answered without searching again."""
+    store = MagicMock()
+    store.search.return_value = [
+        (Document(page_content="chunk_size: 500", metadata={"source": "c.md"}), 0.9)
+    ]
+    vectors = {
+        "how to configure chunk size": [1.0, 0.2],
+        "configure chunk_size": [1.0, 0.25],
+    }
+    store.embed_queries.side_effect = lambda queries: [vectors[q] for q in queries]
+    store.collection_generation.return_value = ("default", "created", 1)
+    with patch("rag_retriever.search.searcher.VectorStore", return_value=store), patch(
+        "rag_retriever.search.searcher.get_result_cache",
+        return_value=SemanticResultCache(max_distance=0.01),
+    ):
+        searcher = Searcher()
+
+    first = searcher.search("how to configure chunk size", mode="vector")
+    second = searcher.search("configure chunk_size", mode="vector")
+
+    assert store.search.call_count == 1
+    assert store.search.call_args.kwargs["query_vector"] == [1.0, 0.2]
+    assert [r.source for r in second] == [r.source for r in first] == ["c.md"]
+
+    store.collection_generation.return_value = ("default", "created", 2)
+    searcher.search("configure chunk_size", mode="vector")
+    assert store.search.call_count == 2
+    assert searcher.result_cache_stats()["hits"] == 1
+
+
+def test_hybrid_search_only_reuses_results_for_the_same_query():
+    """Test that close embeddings do not share hybrid results, and copies."""
+    store = MagicMock()
+    store.search.return_value = [
+        (Document(page_content="E1234 raised", metadata={"source": "e.md"}), 0.9)
+    ]
+    store.lexical_search.return_value = []
+    store.embed_queries.side_effect = lambda queries: [
+        [1.0, 0.2 if q.endswith("4") else 0.21] for q in queries
+    ]
+    store.collection_generation.return_value = ("default", "created", 1)
+    with patch("rag_retriever.search.searcher.VectorStore", return_value=store), patch(
+        "rag_retriever.search.searcher.get_result_cache",
+        return_value=SemanticResultCache(max_distance=0.05),
+    ):
+        searcher = Searcher()
+
+    first = searcher.search("error E1234", mode="hybrid")
+    searcher.search("error E1235", mode="hybrid")
+    assert store.search.call_count == 2
+
+    first[0].metadata["source"] = "changed"
+    repeat = searcher.search("error E1234", mode="hybrid")
+    assert store.search.call_count == 2
+    assert repeat[0].metadata["source"] == "e.md"
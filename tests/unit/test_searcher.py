@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import MagicMock, patch
-from rag_retriever.search.searcher import Searcher, SearchResult
+from rag_retriever.search.searcher import Searcher, SearchResult, merge_adjacent_chunks
 from langchain_core.documents import Document
 
 
@@ -121,3 +121,136 @@ def test_format_result_json(searcher):
     assert json_result["source"] == "test.txt"
     assert json_result["score"] == 0.95
     assert json_result["metadata"]["type"] == "text"
+
+
+def test_search_lexical_mode(searcher, mock_vectorstore):
+    """Test that lexical mode skips vector search."""
+    mock_vectorstore.lexical_search.return_value = [
+        (Document(page_content="max_retries: 3", metadata={"source": "c.yaml"}), 0.7)
+    ]
+
+    results = searcher.search("max_retries", mode="lexical")
+
+    mock_vectorstore.search.assert_not_called()
+    assert results[0].source == "c.yaml"
+
+
+def test_search_hybrid_mode_fuses_rankings(searcher, mock_vectorstore):
+    """Test that hybrid mode ranks documents found by both searches first."""
+    mock_vectorstore.lexical_search.return_value = [
+        (Document(page_content="Test content 2", metadata={"source": "test2.txt"}), 0.9),
+        (Document(page_content="Keyword only", metadata={"source": "test3.txt"}), 0.5),
+    ]
+
+    results = searcher.search("test", limit=3, mode="hybrid")
+
+    assert [r.source for r in results] == ["test2.txt", "test1.txt", "test3.txt"]
+    assert results[0].score > results[1].score
+
+
+def test_search_invalid_mode(searcher):
+    """Test that unknown search modes are rejected."""
+    with pytest.raises(ValueError):
+        searcher.search("test", mode="fuzzy")
+
+
+def test_search_rerank_reorders_candidates(searcher, mock_vectorstore):
+    """Test that reranking fetches extra candidates and reorders them."""
+    searcher._reranker = MagicMock()
+    searcher._reranker.score.return_value = [0.1, 0.95]
+
+    results = searcher.search("test", limit=1, rerank=True)
+
+    assert mock_vectorstore.search.call_args.kwargs["limit"] == 30
+    assert [r.source for r in results] == ["test2.txt"]
+    assert results[0].score == 0.95
+    assert results[0].metadata["retrieval_score"] == 0.8
+    assert set(searcher.last_timings) == {"retrieval_ms", "rerank_ms", "total_ms"}
+
+
+def test_search_passes_filters_to_store(searcher, mock_vectorstore):
+    """Test that metadata filters reach both retrieval paths."""
+    where = {"source_type": "pdf"}
+
+    searcher.search("test", mode="hybrid", where=where)
+
+    assert mock_vectorstore.search.call_args.kwargs["where"] == where
+    assert mock_vectorstore.lexical_search.call_args.kwargs["where"] == where
+    assert "where_document" not in mock_vectorstore.search.call_args.kwargs
+
+
+def test_search_many_uses_one_batch_vector_search(searcher, mock_vectorstore):
+    """Test that batch searches retrieve vectors for all queries at once."""
+    mock_vectorstore.search_many.return_value = [
+        [(Document(page_content="First", metadata={"source": "a.md"}), 0.9)],
+        [(Document(page_content="Second", metadata={"source": "b.md"}), 0.8)],
+    ]
+    mock_vectorstore.lexical_search.return_value = []
+
+    results = searcher.search_many(["first", "second"], limit=2, mode="hybrid")
+
+    mock_vectorstore.search.assert_not_called()
+    mock_vectorstore.search_many.assert_called_once()
+    assert mock_vectorstore.search_many.call_args.args == (["first", "second"],)
+    assert mock_vectorstore.lexical_search.call_count == 2
+    assert [[r.source for r in found] for found in results] == [["a.md"], ["b.md"]]
+
+
+def _chunk(text, start, source="page.md"):
+    """Build a chunk with a recorded span."""
+    return Document(
+        page_content=text[start : start + 10],
+        metadata={"source": source, "start_index": start},
+    )
+
+
+def test_merge_adjacent_chunks_removes_overlap():
+    """Test that overlapping chunks of a source become one de-overlapped passage."""
+    text = "abcdefghijklmnopqrstuvwxyz0123456789" * 2
+    results = [
+        (_chunk(text, 8), 0.9),
+        (Document(page_content="other", metadata={"source": "x.md"}), 0.8),
+        (_chunk(text, 0), 0.7),
+        (_chunk(text, 62), 0.6),
+        (_chunk(text, 4, source="elsewhere.md"), 0.5),
+    ]
+
+    merged = merge_adjacent_chunks(results)
+
+    assert [doc.page_content for doc, _ in merged] == [
+        text[:18],
+        "other",
+        text[62:],
+        text[4:14],
+    ]
+    assert merged[0][1] == 0.9
+    assert merged[0][0].metadata["merged_chunks"] == 2
+    assert merged[0][0].metadata["end_index"] == 18
+
+    # Overlaps whose text disagrees come from different versions of a source
+    stale = Document(
+        page_content="XXcdefghijkl", metadata={"source": "page.md", "start_index": 2}
+    )
+    assert len(merge_adjacent_chunks([(_chunk(text, 0), 0.9), (stale, 0.8)])) == 2
+
+    # Offsets restart on every page, so chunks of other pages never continue
+    first_page, second_page = _chunk(text, 0), _chunk(text, 10)
+    first_page.metadata["document_index"] = 0
+    second_page.metadata["document_index"] = 1
+    assert len(merge_adjacent_chunks([(first_page, 0.9), (second_page, 0.8)])) == 2
+
+
+def test_search_merge_applies_budget(searcher, mock_vectorstore):
+    """Test that merged searches over-fetch and trim to the character budget."""
+    text = "abcdefghijklmnopqrstuvwxyz0123456789"
+    mock_vectorstore.search.return_value = [
+        (_chunk(text, 0), 0.9),
+        (_chunk(text, 5), 0.8),
+        (Document(page_content="x" * 20, metadata={"source": "b.md"}), 0.7),
+    ]
+    searcher.merge_settings = {"candidates": 20, "max_chars": 20}
+
+    results = searcher.search("test", limit=2, merge=True)
+
+    assert mock_vectorstore.search.call_args.kwargs["limit"] == 20
+    assert [r.content for r in results] == [text[:15]]
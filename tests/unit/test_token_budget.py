@@ -0,0 +1,66 @@
+"""Unit tests for token counting and rate limiting."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rag_retriever.vectorstore.token_budget import (
+    MeteredEmbeddings,
+    TokenCounter,
+    TokenRateLimiter,
+    estimate_cost,
+)
+
+
+@pytest.fixture
+def encoding():
+    """Fake tiktoken encoding with one token per word."""
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text, **kwargs: text.split()
+    return encoding
+
+
+def test_token_counts_are_cached(encoding):
+    """Test that each distinct chunk is tokenized once."""
+    counter = TokenCounter("text-embedding-3-small", encoding=encoding)
+
+    assert counter.count("one two three") == 3
+    assert counter.count("one two three") == 3
+    assert counter.count_many(["a b", "one two three"]) == 5
+    assert encoding.encode.call_count == 2
+
+
+def test_token_count_estimate_without_tokenizer():
+    """Test the length-based fallback when no encoding can be loaded."""
+    counter = TokenCounter("text-embedding-3-small")
+
+    with patch("tiktoken.encoding_for_model", side_effect=OSError("offline")):
+        assert counter.count("x" * 10) == 3
+
+
+def test_rate_limiter_waits_for_budget():
+    """Test that requests beyond the per-minute budget wait for the window."""
+    limiter = TokenRateLimiter(tokens_per_minute=100)
+
+    with patch("rag_retriever.vectorstore.token_budget.time") as mock_time:
+        mock_time.monotonic.side_effect = [0.0, 1.0, 61.0]
+        assert limiter.acquire(80) == 0.0
+        assert limiter.acquire(30) == 59.0
+
+    mock_time.sleep.assert_called_once_with(59.0)
+
+
+def test_metered_embeddings_counts_tokens(encoding):
+    """Test that tokens sent to the provider are counted and priced."""
+    provider = MagicMock()
+    provider.embed_documents.return_value = [[0.1], [0.2]]
+    metered = MeteredEmbeddings(
+        provider, TokenCounter("text-embedding-3-small", encoding=encoding)
+    )
+
+    metered.embed_documents(["a b", "c"])
+
+    assert metered.tokens_sent == 3
+    assert estimate_cost("text-embedding-3-small", 1_000_000) == pytest.approx(0.02)
+    assert estimate_cost("unknown-model", 1000) is None
+    assert estimate_cost("unknown-model", 1_000_000, price_per_million=1.5) == 1.5
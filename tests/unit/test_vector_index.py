@@ -0,0 +1,118 @@
+"""Unit tests for the sidecar vector index."""
+
+import numpy as np
+import pytest
+
+from rag_retriever.vectorstore.vector_index import VectorIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Build an index over clustered random vectors."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(50, 256))
+    vectors = (centers[rng.integers(50, size=500)] + rng.normal(size=(500, 256))).astype(
+        np.float32
+    )
+    ids = [f"id-{i}" for i in range(len(vectors))]
+    return VectorIndex.build(tmp_path / "index", ids, vectors, version="v1")
+
+
+def test_build_and_load(index, tmp_path):
+    """Test that a built index can be reopened."""
+    loaded = VectorIndex.load(tmp_path / "index")
+
+    assert loaded.count == 500
+    assert loaded.dimensions == 256
+    assert loaded.version == "v1"
+    assert VectorIndex.load(tmp_path / "missing") is None
+
+
+def test_rebuild_swaps_in_a_new_directory(index, tmp_path):
+    """Test that a rebuild replaces the index without disturbing open readers."""
+    rebuilt = VectorIndex.build(
+        tmp_path / "index", ["a"], np.ones((1, 4), dtype=np.float32), version="v2"
+    )
+
+    assert VectorIndex.load(tmp_path / "index").version == "v2"
+    assert rebuilt.search([1.0, 1.0, 1.0, 1.0], 1, engine="exact")[0][0] == "a"
+    # The earlier index keeps reading its memory-mapped vectors
+    assert index.search(np.asarray(index.vectors[0]), 1, engine="exact")[0][0] == "id-0"
+    assert [path.name for path in tmp_path.iterdir()] == ["index"]
+
+
+@pytest.mark.parametrize("engine", ["exact", "int8", "binary", "truncated"])
+def test_sidecar_search_matches_exact(index, engine):
+    """Test that rescored sidecar search finds the exact nearest neighbours."""
+    rng = np.random.default_rng(1)
+    recalls = []
+    for row in rng.choice(index.count, size=20, replace=False):
+        query = np.asarray(index.vectors[row]) + rng.normal(scale=0.05, size=256)
+        exact = np.asarray(index.vectors) @ (query / np.linalg.norm(query))
+        expected = {index.ids[i] for i in np.argsort(-exact)[:5]}
+
+        found = index.search(query, 5, engine=engine, rescore_factor=10, dimensions=64)
+        recalls.append(len(expected.intersection(id_ for id_, _ in found)) / 5)
+
+        # Scores are exact cosine similarities, best first
+        scores = [score for _, score in found]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == pytest.approx(exact.max(), abs=1e-5)
+
+    assert np.mean(recalls) >= 0.9
+
+
+@pytest.mark.parametrize("engine", ["int8", "binary"])
+def test_quantized_index_rescores_from_mapped_vectors(index, tmp_path, engine):
+    """Test that quantized indexes read only candidate rows of the mapped vectors."""
+    vectors = np.asarray(index.vectors)
+    quantized = VectorIndex.build(
+        tmp_path / engine, index.ids, vectors, version="v1", engine=engine
+    )
+
+    # Codes are written at build time, vectors stay on disk
+    assert (tmp_path / engine / f"codes_{engine}.npy").exists()
+    assert isinstance(quantized.vectors, np.memmap)
+
+    class RecordingRows:
+        def __init__(self, mapped):
+            self.mapped = mapped
+            self.read = []
+
+        def __getitem__(self, rows):
+            self.read.append(len(rows))
+            return self.mapped[rows]
+
+    quantized.vectors = RecordingRows(quantized.vectors)
+    query = vectors[7] + 0.01
+    found = quantized.search(query, 3, engine=engine, rescore_factor=10)
+    expected = index.search(query, 3, engine="exact")
+
+    assert found[0][0] == expected[0][0]
+    assert found[0][1] == pytest.approx(expected[0][1], abs=1e-5)
+    assert quantized.vectors.read == [30]
+
+
+def test_quantized_codes_use_less_memory(index):
+    """Test that first-pass codes are smaller than float32 vectors."""
+    full = index.memory_bytes("hnsw")
+
+    assert index.memory_bytes("int8") < full / 3
+    assert index.memory_bytes("binary") < full / 16
+    # Rescored rows are read from the memory-mapped vectors
+    row = index.dimensions * 4
+    rescored = index.memory_bytes("int8", candidates=40)
+    assert rescored == index.memory_bytes("int8") + 40 * row
+
+
+def test_truncated_graph_is_persisted(index, tmp_path):
+    """Test that the truncated-dimension graph is reused after reopening."""
+    index.search(np.ones(256), 5, engine="truncated", dimensions=64)
+    assert (tmp_path / "index" / "hnsw_truncated_64.bin").exists()
+
+    reopened = VectorIndex.load(tmp_path / "index")
+    found = reopened.search(index.vectors[3], 1, engine="truncated", dimensions=64)
+
+    assert found[0][0] == "id-3"
+    full = index.memory_bytes("hnsw")
+    assert reopened.memory_bytes("truncated", dimensions=64) < full / 2
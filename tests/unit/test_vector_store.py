@@ -4,14 +4,29 @@ from rag_retriever.vectorstore.store import (
     VectorStore,
     CollectionMetadata,
     clean_vectorstore,
+    migrate_to_shared_store,
+    remove_per_collection_dirs,
+    _get_all_ids,
+    _open_shared_client,
+    infer_source_type,
+    SHARED_STORE_DIR,
 )
+from rag_retriever.vectorstore.lexical_index import LexicalIndex
+from rag_retriever.vectorstore.token_budget import TokenCounter
+from rag_retriever.utils.config import config
+from rag_retriever.search.searcher import merge_adjacent_chunks
 from langchain_core.documents import Document
+from chromadb.api.models.Collection import Collection
 
 
 @pytest.fixture
-def mock_vectorstore():
-    """Fixture to create a VectorStore instance with mocked dependencies."""
-    store = VectorStore()
+def mock_vectorstore(tmp_path):
+    """Fixture to create a VectorStore instance with mocked dependencies.
+
+    The store is created under tmp_path, never in the user's real vector
+    store (the embedding cache is redirected by conftest.py).
+    """
+    store = VectorStore(persist_directory=str(tmp_path / "store"))
     store._get_or_create_db = MagicMock()  # Mock the database retrieval method
     store._get_or_create_db.return_value.add_documents = MagicMock()
     return store
@@ -57,27 +72,111 @@ def test_get_or_create_collection(mock_vectorstore):
         assert mock_vectorstore._collections[collection_name] == collection
 
 
-def test_list_collections(mock_vectorstore):
-    """Test listing all collections."""
-    # Create mock collections with metadata
-    collection1 = MagicMock()
-    collection1._collection_metadata = CollectionMetadata("collection1")
-    collection2 = MagicMock()
-    collection2._collection_metadata = CollectionMetadata("collection2")
+def test_list_collections(tmp_path):
+    """Test listing all collections from the metadata store."""
+    store = VectorStore(persist_directory=str(tmp_path))
+    store.metadata_store.ensure_collection(CollectionMetadata("collection1"))
+    store.metadata_store.set_total_chunks("collection1", 3)
+    store.metadata_store.ensure_collection(CollectionMetadata("collection2"))
 
-    # Set up collections in the store
-    mock_vectorstore._collections = {
-        "collection1": collection1,
-        "collection2": collection2,
-    }
+    with patch("rag_retriever.vectorstore.store.Chroma") as mock_chroma:
+        collections = store.list_collections()
+
+    # Verify results come from metadata without opening any collection
+    mock_chroma.assert_not_called()
+    assert [c["name"] for c in collections] == ["default", "collection1", "collection2"]
+    assert collections[1]["count"] == 3
+
+
+def test_metadata_store_imports_legacy_json(tmp_path):
+    """Test that collection_metadata.json is migrated into the metadata store."""
+    import json
+
+    legacy = CollectionMetadata("docs")
+    legacy.document_count = 2
+    legacy.total_chunks = 5
+    (tmp_path / "collection_metadata.json").write_text(
+        json.dumps({"docs": legacy.to_dict()})
+    )
+
+    store = VectorStore(persist_directory=str(tmp_path))
+
+    assert store.get_collection_metadata("docs")["total_chunks"] == 5
+    assert not (tmp_path / "collection_metadata.json").exists()
+    assert (tmp_path / "collection_metadata.json.bak").exists()
+
+
+def test_metadata_counters_are_shared_between_stores(tmp_path):
+    """Test that counters written by one store are not lost by another."""
+    first = VectorStore(persist_directory=str(tmp_path))
+    second = VectorStore(persist_directory=str(tmp_path))
+
+    first.metadata_store.increment_counts("default", documents=1)
+    second.metadata_store.increment_counts("default", documents=2)
+    # Saving a description from a store with stale cached counts keeps counters
+    second._metadata["default"].description = "Edited"
+    second._save_collection_metadata()
+
+    metadata = first.get_collection_metadata("default")
+    assert metadata["document_count"] == 3
+    assert metadata["description"] == "Edited"
+
+
+def test_collections_are_opened_lazily(tmp_path):
+    """Test that initialization does not open any collection handles."""
+    with patch("rag_retriever.vectorstore.store.Chroma") as mock_chroma:
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    mock_chroma.assert_not_called()
+    assert store._collections == {}
+    assert "default" in store._metadata
+
+
+def test_collection_handles_are_lru_bounded(mock_vectorstore):
+    """Test that the least recently used handle is closed past the limit."""
+    mock_vectorstore.max_open_collections = 2
+
+    with patch("rag_retriever.vectorstore.store.Chroma", side_effect=lambda **_: MagicMock()):
+        mock_vectorstore._get_or_create_collection("collection1")
+        mock_vectorstore._get_or_create_collection("collection2")
+        mock_vectorstore._get_or_create_collection("collection1")  # Mark as recently used
+        mock_vectorstore._get_or_create_collection("collection3")
+
+    assert list(mock_vectorstore._collections) == ["collection1", "collection3"]
+    # Metadata is kept for closed collections
+    assert "collection2" in mock_vectorstore._metadata
+
+
+def test_migrate_to_shared_store(tmp_path):
+    """Test copying a per-directory collection into the shared store."""
+    import chromadb
+
+    source = chromadb.PersistentClient(path=str(tmp_path / "docs"))
+    source.create_collection("docs", metadata={"hnsw:space": "cosine"}).add(
+        ids=["a", "b", "c"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]],
+        documents=["first", "second", "third"],
+        metadatas=[{"source": "x"}, None, {"source": "y"}],
+    )
 
-    # Get collections
-    collections = mock_vectorstore.list_collections()
+    migrated = migrate_to_shared_store(str(tmp_path), batch_size=2)
 
-    # Verify results
-    assert len(collections) == 2
-    assert collections[0]["name"] == "collection1"
-    assert collections[1]["name"] == "collection2"
+    assert migrated == {"docs": 3}
+    shared = _open_shared_client(tmp_path).get_collection("docs")
+    records = shared.get(ids=["a"], include=["embeddings", "documents", "metadatas"])
+    assert list(records["embeddings"][0]) == [1.0, 0.0]
+    assert records["documents"] == ["first"]
+    assert records["metadatas"] == [{"source": "x"}]
+
+    # The shared layout discovers migrated collections
+    with patch.dict(config.vector_store, {"storage_layout": "shared"}):
+        store = VectorStore(persist_directory=str(tmp_path))
+        assert "docs" in [c["name"] for c in store.list_collections()]
+        store.close()
+
+    remove_per_collection_dirs(["docs"], str(tmp_path))
+    assert not (tmp_path / "docs").exists()
+    assert (tmp_path / SHARED_STORE_DIR).exists()
 
 
 def test_clean_vectorstore():
@@ -108,29 +207,814 @@ def test_clean_vectorstore():
 def test_search_all_collections(mock_vectorstore):
     """Test searching across all collections."""
     query = "test query"
+    mock_vectorstore.embeddings = MagicMock()
+    mock_vectorstore.embeddings.embed_query.return_value = [0.1, 0.2]
 
-    # Create mock collections with search results
+    # Create mock collections returning cosine distances
     collection1 = MagicMock()
-    collection1.similarity_search_with_relevance_scores.return_value = [
-        (Document(page_content="result1"), 0.9)
+    collection1.similarity_search_by_vector_with_relevance_scores.return_value = [
+        (Document(page_content="result1"), 0.1)
     ]
+    collection1._select_relevance_score_fn.return_value = lambda d: 1.0 - d
     collection2 = MagicMock()
-    collection2.similarity_search_with_relevance_scores.return_value = [
-        (Document(page_content="result2"), 0.8)
+    collection2.similarity_search_by_vector_with_relevance_scores.return_value = [
+        (Document(page_content="result2"), 0.2),
+        (Document(page_content="result3"), 0.9),
     ]
+    collection2._select_relevance_score_fn.return_value = lambda d: 1.0 - d
 
     # Set up collections in the store
-    mock_vectorstore._collections = {
-        "collection1": collection1,
-        "collection2": collection2,
+    mock_vectorstore._metadata = {
+        "collection1": CollectionMetadata("collection1"),
+        "collection2": CollectionMetadata("collection2"),
     }
+    mock_vectorstore._collections.clear()
+    mock_vectorstore._collections.update(
+        {"collection1": collection1, "collection2": collection2}
+    )
 
     # Search all collections
     results = mock_vectorstore.search(query, search_all_collections=True)
 
-    # Verify search was called for each collection
-    collection1.similarity_search_with_relevance_scores.assert_called_once()
-    collection2.similarity_search_with_relevance_scores.assert_called_once()
-    assert len(results) == 2
-    assert results[0][1] == 0.9  # Check scores are preserved
-    assert results[1][1] == 0.8
+    # Verify the query was embedded once and reused for each collection
+    mock_vectorstore.embeddings.embed_query.assert_called_once_with(query)
+    collection1.similarity_search_by_vector_with_relevance_scores.assert_called_once_with(
+        [0.1, 0.2], k=5
+    )
+    collection2.similarity_search_by_vector_with_relevance_scores.assert_called_once_with(
+        [0.1, 0.2], k=5
+    )
+    assert len(results) == 2  # result3 is below the default score threshold
+    assert results[0][1] == pytest.approx(0.9)  # Check scores are preserved
+    assert results[1][1] == pytest.approx(0.8)
+    assert results[0][0].metadata["collection"] == "collection1"
+    assert results[1][0].metadata["collection"] == "collection2"
+
+
+def test_repeated_query_is_embedded_once(mock_vectorstore):
+    """Test that repeated queries reuse the cached query embedding."""
+    mock_vectorstore.embeddings.embed_query = MagicMock(return_value=[0.1, 0.2])
+
+    assert mock_vectorstore._embed_query("what is rag?") == [0.1, 0.2]
+    assert mock_vectorstore._embed_query("what  is rag?") == [0.1, 0.2]
+
+    mock_vectorstore.embeddings.embed_query.assert_called_once_with("what is rag?")
+    assert mock_vectorstore.query_cache.stats()["hits"] == 1
+
+
+def test_search_many_embeds_queries_in_one_request(mock_vectorstore):
+    """Test that batch search embeds distinct queries in a single call."""
+    mock_vectorstore.embeddings = MagicMock()
+    mock_vectorstore.embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(text)), 1.0] for text in texts
+    ]
+    mock_vectorstore._search_collection_by_vector = MagicMock(
+        side_effect=lambda name, vector, *args: [
+            (Document(page_content=name), vector[0])
+        ]
+    )
+    queries = ["batch query", "another batch query", "batch query"]
+
+    results = mock_vectorstore.search_many(queries, score_threshold=0.0)
+
+    mock_vectorstore.embeddings.embed_documents.assert_called_once_with(
+        ["batch query", "another batch query"]
+    )
+    assert [found[0][1] for found in results] == [11.0, 19.0, 11.0]
+
+
+def test_collection_generation_changes_on_write(tmp_path):
+    """Test that writes to a collection change its generation token."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[1.0, 0.5] for _ in texts]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    before = store.collection_generation()
+    store.add_documents([Document(page_content="Doc", metadata={"source": "a"})])
+    after = store.collection_generation()
+
+    assert before is not None and after != before
+    assert store.collection_generation() == after
+    assert store.collection_generation("missing") is None
+    store.delete_source("a")
+    assert store.collection_generation() != after
+    store.close()
+
+
+def test_add_documents_continues_after_failed_batch(mock_vectorstore):
+    """Test that one failed batch does not stop the remaining batches."""
+    documents = [Document(page_content=f"Test content {i}") for i in range(3)]
+
+    def process_batch(batch, collection_name=None):
+        if batch[0].page_content == "Test content 1":
+            raise RuntimeError("boom")
+        return True
+
+    mock_vectorstore._process_batch = MagicMock(side_effect=process_batch)
+
+    with patch.dict(
+        config.vector_store["batch_processing"],
+        {"batch_size": 1, "max_concurrent_batches": 2, "delay_between_batches": 0},
+    ):
+        added_chunks = mock_vectorstore.add_documents(documents)
+
+    assert mock_vectorstore._process_batch.call_count == 3
+    assert added_chunks == 2
+
+
+def test_add_documents_raises_when_all_batches_fail(mock_vectorstore):
+    """Test that the error is surfaced when no batch succeeds."""
+    documents = [Document(page_content="Test content")]
+    mock_vectorstore._process_batch = MagicMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        mock_vectorstore.add_documents(documents)
+
+
+def test_process_batch_retries_rate_limit_errors(mock_vectorstore):
+    """Test that a rate-limited batch is retried and then stored."""
+    batch = [Document(page_content="Test content", metadata={"source": "test"})]
+    mock_vectorstore.embeddings = MagicMock()
+    mock_vectorstore.embeddings.embed_documents.side_effect = [
+        RuntimeError("Rate limit reached"),
+        [[0.1, 0.2]],
+    ]
+    collection = MagicMock()
+    collection._collection.count.return_value = 1
+    mock_vectorstore._register_collection("test_collection")
+    mock_vectorstore._get_or_create_collection = MagicMock(return_value=collection)
+
+    with patch.object(VectorStore._process_batch.retry, "sleep"):
+        assert mock_vectorstore._process_batch(batch, "test_collection")
+
+    assert mock_vectorstore.embeddings.embed_documents.call_count == 2
+    collection._collection.upsert.assert_called_once()
+    assert mock_vectorstore.get_collection_metadata("test_collection")["total_chunks"] == 1
+
+
+def test_reingesting_source_upserts_and_removes_stale_chunks(tmp_path):
+    """Test that re-ingesting a source updates chunks in place."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    with patch.dict(config.content, {"chunk_size": 20, "chunk_overlap": 0}):
+        original = Document(
+            page_content="First paragraph.\n\nSecond paragraph.",
+            metadata={"source": "doc.md"},
+        )
+        assert store.add_documents([original]) == 2
+        assert store.add_documents([original]) == 2  # Nothing new to embed
+        assert embeddings.embed_documents.call_count == 1
+
+        updated = Document(
+            page_content="First paragraph.\n\nThird paragraph.",
+            metadata={"source": "doc.md"},
+        )
+        store.add_documents([updated])
+
+    with store._use_collection("default") as collection:
+        stored = collection._collection.get()["documents"]
+    assert sorted(stored) == ["First paragraph.", "Third paragraph."]
+    metadata = store.get_collection_metadata("default")
+    assert metadata["total_chunks"] == 2
+    assert metadata["document_count"] == 1
+    store.close()
+
+
+def test_reingesting_edited_source_refreshes_unchanged_chunk_metadata(tmp_path):
+    """Test that unchanged chunks get their new offsets without re-embedding."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    with patch.dict(config.content, {"chunk_size": 20, "chunk_overlap": 0}):
+        text = "First paragraph.\n\nSecond paragraph."
+        store.add_documents([Document(page_content=text, metadata={"source": "a.md"})])
+        with store._use_collection("default") as collection:
+            ingested_at = collection._collection.get()["metadatas"][0]["ingested_at"]
+
+        edited = "New intro.\n\n" + text
+        store.add_documents(
+            [Document(page_content=edited, metadata={"source": "a.md"})]
+        )
+
+    # Only the new chunk was embedded
+    assert embeddings.embed_documents.call_args_list[-1].args[0] == ["New intro."]
+    with store._use_collection("default") as collection:
+        stored = collection._collection.get(include=["documents", "metadatas"])
+    for text, metadata in zip(stored["documents"], stored["metadatas"]):
+        assert edited[metadata["start_index"] :].startswith(text)
+        assert metadata["ingested_at"] >= ingested_at
+    by_text = dict(zip(stored["documents"], stored["metadatas"]))
+    assert by_text["Second paragraph."]["chunk_index"] == 2
+    assert by_text["First paragraph."]["ingested_at"] == ingested_at
+    store.close()
+
+
+def test_merged_passage_matches_source_after_edit(tmp_path):
+    """Test that merged chunks match the source after it is edited and re-ingested."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[1.0, 0.5] for _ in texts]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    # One line per chunk, so lines below the edit keep their ids
+    text = "First line here.\nSecond line here.\nThird line here."
+    edited = "A new first line.\n" + text
+    settings = {"chunk_size": 20, "chunk_overlap": 0, "separators": ["\n"]}
+    with patch.dict(config.content, settings):
+        store.add_documents([Document(page_content=text, metadata={"source": "a.md"})])
+        store.add_documents(
+            [Document(page_content=edited, metadata={"source": "a.md"})]
+        )
+
+    results = store._search_collection_by_vector("default", [1.0, 0.5], 20, 0.0)
+    assert len(results) == 4
+    assert embeddings.embed_documents.call_args_list[-1].args[0] == [
+        "A new first line."
+    ]
+    merged = merge_adjacent_chunks(results)
+
+    assert len(merged) == 1
+    passage = merged[0][0]
+    assert passage.page_content == edited
+    assert passage.metadata["merged_chunks"] == len(results)
+    store.close()
+
+
+def test_delete_and_refresh_source(tmp_path):
+    """Test that sources are deleted and refreshed without touching others."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    sources = [
+        "https://x.io/v1/a",
+        "https://x.io/v1/b",
+        "https://x.io/v2/a",
+        "docs/setup.md",
+        "docs/notes.txt",
+    ]
+    store.add_documents(
+        [Document(page_content=f"Page {s}", metadata={"source": s}) for s in sources]
+    )
+
+    assert store.delete_source("docs/setup.md") == {"sources": 1, "chunks": 1}
+    assert store.delete_source("https://x.io/v1/", match="prefix") == {
+        "sources": 2,
+        "chunks": 2,
+    }
+    assert store.delete_source("*.txt", match="glob")["chunks"] == 1
+    assert store.delete_source("missing") == {"sources": 0, "chunks": 0}
+    with pytest.raises(ValueError):
+        store.delete_source("x", match="regex")
+
+    assert [s["source"] for s in store.get_collection_sources("default")] == [
+        "https://x.io/v2/a"
+    ]
+    metadata = store.get_collection_metadata("default")
+    assert metadata["total_chunks"] == 1
+    assert metadata["document_count"] == 1
+    assert store.lexical_search("Page") != []
+    assert store.lexical_search("setup") == []
+
+    with patch.dict(config.content, {"chunk_size": 20, "chunk_overlap": 0}):
+        stats = store.refresh_source(
+            "https://x.io/v2/a",
+            [Document(page_content="Page one.\n\nPage two updated.", metadata={})],
+        )
+    assert stats == {"chunks": 2, "embedded": 2, "deleted": 1}
+    assert store.get_source_metadata("https://x.io/v2/a")["source_type"] == "web"
+
+    assert store.refresh_source("https://x.io/v2/a", []) == {
+        "chunks": 0,
+        "embedded": 0,
+        "deleted": 2,
+    }
+    assert store.get_collection_metadata("default")["total_chunks"] == 0
+    store.close()
+
+
+def test_collection_rejects_mismatched_embeddings(mock_vectorstore):
+    """Test that a collection built with other embeddings cannot be searched."""
+    from rag_retriever.vectorstore.embeddings import EmbeddingSpec
+
+    mock_vectorstore._register_collection("mismatched")
+    mock_vectorstore.metadata_store.set_embedding_spec(
+        "mismatched", EmbeddingSpec("local", "all-MiniLM-L6-v2", 384)
+    )
+    mock_vectorstore._apply_metadata(
+        mock_vectorstore.metadata_store.get_collection("mismatched")
+    )
+
+    with pytest.raises(ValueError, match="was built with local/all-MiniLM-L6-v2"):
+        mock_vectorstore._search_collection_by_vector("mismatched", [0.1], 5, 0.0)
+
+
+def test_local_embedding_provider(tmp_path):
+    """Test that the local provider is used when configured."""
+    from rag_retriever.vectorstore.embeddings import LocalEmbeddings
+
+    settings = {
+        "embedding_provider": "local",
+        "local_embeddings": {"model": "local-model", "dimensions": 8},
+        "embedding_cache": {"enabled": False},
+    }
+    with patch.dict(config.vector_store, settings):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    assert isinstance(store.embeddings, LocalEmbeddings)
+    assert store.embeddings.model_name == "local-model"
+    assert str(store.embedding_spec) == "local/local-model (8 dims)"
+
+
+def test_quantized_engine_search(tmp_path):
+    """Test searching a collection through the int8 sidecar index."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [1.0, float(i), 0.5] for i, _ in enumerate(texts)
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    docs = [
+        Document(page_content=f"Chunk {i}", metadata={"source": f"doc{i}"})
+        for i in range(3)
+    ]
+    store.add_documents(docs)
+
+    engine_settings = {"default": "int8", "rescore_factor": 2}
+    with patch.dict(config.search, {"engine": engine_settings}):
+        results = store._search_collection_by_vector("default", [1.0, 0.0, 0.5], 2, 0.0)
+
+    assert [doc.page_content for doc, _ in results] == ["Chunk 0", "Chunk 1"]
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert results[0][0].metadata["source"] == "doc0"
+    assert results[0][0].metadata["collection"] == "default"
+
+    # Once the index is built, searches never read embeddings from Chroma
+    get = Collection.get
+    with patch.object(Collection, "get", autospec=True, side_effect=get) as spy:
+        with patch.dict(config.search, {"engine": engine_settings}):
+            store._search_collection_by_vector("default", [1.0, 0.0, 0.5], 2, 0.0)
+    includes = [call.kwargs["include"] for call in spy.call_args_list]
+    assert includes and all("embeddings" not in include for include in includes)
+
+    # A write makes the index stale and it is rebuilt on the next search
+    version = store._indexes["default"].version
+    store.add_documents([Document(page_content="Chunk 3", metadata={"source": "doc3"})])
+    with patch.dict(config.search, {"engine": engine_settings}):
+        store._search_collection_by_vector("default", [1.0, 0.0, 0.5], 2, 0.0)
+    assert store._indexes["default"].version != version
+    assert store._indexes["default"].count == 4
+    store.close()
+
+
+def test_auto_engine_switches_by_collection_size(mock_vectorstore):
+    """Test that the auto engine searches small collections exactly."""
+    mock_vectorstore._register_collection("small").total_chunks = 10
+    mock_vectorstore._register_collection("large").total_chunks = 500
+
+    settings = {"default": "auto", "exact_max_chunks": 100, "collections": {}}
+    with patch.dict(config.search, {"engine": settings}):
+        assert mock_vectorstore._get_search_engine("small") == "exact"
+        assert mock_vectorstore._get_search_engine("large") == "hnsw"
+
+        settings["collections"] = {"large": "exact"}
+        assert mock_vectorstore._get_search_engine("large") == "exact"
+
+
+def test_lexical_search_matches_identifiers(tmp_path):
+    """Test that the lexical index is kept in sync with ingested chunks."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[1.0, 0.0]] * len(texts)
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    store.add_documents(
+        [
+            Document(page_content="Set max_retries to 3.", metadata={"source": "a"}),
+            Document(page_content="Error E1234 means retry.", metadata={"source": "b"}),
+        ]
+    )
+
+    results = store.lexical_search("E1234")
+    assert [doc.metadata["source"] for doc, _ in results] == ["b"]
+    assert results[0][0].metadata["collection"] == "default"
+    assert 0 < results[0][1] < 1
+    assert store.lexical_search("max_retries")[0][0].metadata["source"] == "a"
+    assert store.lexical_search("(((") == []
+
+    # Removing the collection's entries triggers a backfill from Chroma
+    store.lexical_index.delete_collection("default")
+    assert len(store.lexical_search("retry OR max_retries", limit=5)) == 2
+    store.close()
+
+
+def test_lexical_index_tracks_rows_and_counts(tmp_path):
+    """Test that replacing, deleting and upgrading keep ids and counts exact."""
+    index = LexicalIndex(str(tmp_path))
+    index.upsert("a", ["1", "2", "2"], ["one", "two", "deux"], [None] * 3)
+    index.upsert("b", ["1"], ["one"], [None])
+    index.upsert("a", ["1"], ["uno"], [None])
+    assert (index.count("a"), index.count("b")) == (2, 1)
+    assert [hit[2] for hit in index.search("uno deux one", 5, ["a"])] == [
+        "uno",
+        "deux",
+    ]
+    index.delete("a", ["2", "missing"])
+    assert index.count("a") == 1
+
+    # Databases written before the row table existed are indexed on open
+    with index._conn:
+        index._conn.execute("DROP TABLE chunk_rows")
+        index._conn.execute("DROP TABLE collection_counts")
+        index._conn.execute(
+            "INSERT INTO chunks (content, chunk_id, collection, metadata) "
+            "VALUES ('uno', '1', 'a', '{}')"
+        )
+    index.close()
+    index = LexicalIndex(str(tmp_path))
+    assert (index.count("a"), index.count("b")) == (1, 1)
+    index.delete_collection("a")
+    assert index.search("uno one", 5) == [("b", "1", "one", {}, ANY)]
+    index.close()
+
+
+def test_search_filters_by_metadata(tmp_path):
+    """Test that where filters narrow vector and lexical results before ranking."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [1.0, float(i), 0.5] for i, _ in enumerate(texts)
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    store.add_documents(
+        [
+            Document(page_content="Retry policy notes", metadata={"source": "notes.md"}),
+            Document(page_content="Retry policy spec", metadata={"source": "spec.pdf"}),
+            Document(page_content="Retry policy page", metadata={"source": "https://x.io"}),
+        ]
+    )
+    assert infer_source_type({"source": "spec.pdf"}) == "pdf"
+
+    for engine in ("hnsw", "exact", "int8"):
+        with patch.dict(config.search, {"engine": {"default": engine}}):
+            results = store._search_collection_by_vector(
+                "default", [1.0, 0.0, 0.5], 3, 0.0, where={"source_type": "pdf"}
+            )
+        assert [doc.metadata["source"] for doc, _ in results] == ["spec.pdf"]
+        assert results[0][0].metadata["ingested_at"] > 0
+        assert results[0][0].metadata["chunk_index"] == 0
+        assert results[0][0].metadata["start_index"] == 0
+        assert results[0][0].metadata["document_index"] == 0
+
+    results = store.lexical_search(
+        "retry",
+        where={"$or": [{"source_type": "web"}, {"source_type": "markdown"}]},
+        where_document={"$not_contains": "notes"},
+    )
+    assert [doc.metadata["source"] for doc, _ in results] == ["https://x.io"]
+    store.close()
+
+
+def test_migrate_collection_reembeds_and_swaps(tmp_path):
+    """Test that a paused migration keeps serving old vectors, then swaps."""
+    import threading
+    from rag_retriever.vectorstore.embeddings import EmbeddingSpec
+
+    old = MagicMock()
+    old.embed_documents.side_effect = lambda texts: [[1.0, 0.0, 0.0]] * len(texts)
+    old.embed_query.return_value = [1.0, 0.0, 0.0]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=old,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+    store.add_documents(
+        [Document(page_content=f"Chunk {i}", metadata={"source": f"d{i}"}) for i in range(5)]
+    )
+    old_spec = store.embedding_spec
+
+    # Switch to new embedding settings
+    new = MagicMock()
+    new.embed_documents.side_effect = lambda texts: [[0.0, 1.0]] * len(texts)
+    new.embed_query.return_value = [0.0, 1.0]
+    store.embedding_spec = EmbeddingSpec("local", "new-model", 2)
+    store.embeddings = new
+    store._query_embeddings[old_spec] = old
+
+    stop = threading.Event()
+    new.embed_documents.side_effect = lambda texts: stop.set() or [[0.0, 1.0]] * len(texts)
+    result = store.migrate_collection("default", batch_size=2, stop_event=stop)
+    assert result == {"collection": "default", "status": "paused", "processed": 2, "total": 5}
+
+    # Searches keep using the old vectors and embeddings meanwhile
+    assert len(store.search("chunk", limit=10, score_threshold=0.5)) == 5
+    assert store.list_collections()[0]["name"] == "default"
+    assert len(store.list_collections()) == 1
+
+    # A chunk written by an old-settings process during the migration
+    with store._use_collection("default") as collection:
+        collection._collection.upsert(
+            ids=["late"], embeddings=[[1.0, 0.0, 0.0]], documents=["Late chunk"]
+        )
+
+    # New documents are rejected with an explanation until the swap
+    with pytest.raises(ValueError, match="being migrated"):
+        store.add_documents([Document(page_content="New", metadata={"source": "n"})])
+
+    # The swap waits for a search still reading the old vectors
+    in_search, release, counts = threading.Event(), threading.Event(), []
+
+    def slow_search():
+        with store._use_collection("default") as collection:
+            in_search.set()
+            release.wait(5)
+            counts.append(collection._collection.count())
+
+    search_thread = threading.Thread(target=slow_search)
+    search_thread.start()
+    in_search.wait(5)
+    threading.Timer(0.2, release.set).start()
+    result = store.migrate_collection("default", batch_size=2)
+    search_thread.join()
+    assert counts == [6]
+    assert result["status"] == "completed"
+    assert result["total"] == 6
+    metadata = store.get_collection_metadata("default")
+    assert metadata["embedding_model"] == "new-model"
+    assert metadata["storage_name"].startswith("default-")
+    assert store.metadata_store.get_migration("default") is None
+    assert not (tmp_path / "default").exists()
+
+    results = store.search("chunk", limit=10, score_threshold=0.5)
+    assert len(results) == 6
+    new.embed_query.assert_called()
+    assert store.migrate_collection("default")["status"] == "current"
+    store.close()
+
+
+def test_sharded_collection_scatter_gather(tmp_path):
+    """Test that a resharded collection returns the same results from its shards."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [1.0, float(len(t) % 7), 0.5] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    store.add_documents(
+        [
+            Document(page_content=f"Doc {i} " + "x" * i, metadata={"source": f"s{i}"})
+            for i in range(30)
+        ]
+    )
+    query = [1.0, 3.0, 0.5]
+    expected = store._search_collection_by_vector("default", query, 5, 0.0)
+
+    result = store.reshard_collection("default", 3)
+    assert (result["status"], result["chunks"]) == ("completed", 30)
+    assert store.reshard_collection("default", 3)["status"] == "current"
+    found = store._search_collection_by_vector("default", query, 5, 0.0)
+    assert [score for _, score in found] == pytest.approx(
+        [score for _, score in expected]
+    )
+
+    stats = store.get_shard_stats("default")
+    assert len(stats) == 3
+    assert sum(shard["chunks"] for shard in stats) == 30
+    assert len({shard["pid"] for shard in stats}) == 3
+
+    # Other stores in the process reuse the running workers
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        other = VectorStore(persist_directory=str(tmp_path))
+    other_stats = other.get_shard_stats("default")
+    assert [shard["pid"] for shard in other_stats] == [s["pid"] for s in stats]
+    other.close()
+    assert len(store.get_shard_stats("default")) == 3
+    with store._use_collection("default") as collection:
+        ids = _get_all_ids(collection._collection, page_size=7)
+    assert len(ids) == len(set(ids)) == 30
+
+    # Writes and deletes are routed to the shards holding each chunk
+    assert store.delete_source("s3")["chunks"] == 1
+    store.add_documents([Document(page_content="new", metadata={"source": "n"})])
+    assert store.get_collection_metadata("default")["total_chunks"] == 30
+    with store._use_collection("default") as collection:
+        ids = _get_all_ids(collection._collection)[:4]
+        collection._collection.update(ids=ids, metadatas=[{"tag": "x"}] * 4)
+        updated = collection._collection.get(where={"tag": "x"}, include=[])["ids"]
+    assert sorted(updated) == sorted(ids)
+
+    assert store.reshard_collection("default", 0)["chunks"] == 30
+    assert store.list_collections()[0]["shard_count"] == 0
+    assert not any((tmp_path / "_shards").iterdir())
+    with pytest.raises(ValueError):
+        store.get_shard_stats("default")
+    store.close()
+
+
+def test_add_documents_streams_iterators(tmp_path):
+    """Test that generators and async iterators are ingested incrementally."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+
+    consumed = []
+
+    def documents():
+        for i in range(5):
+            consumed.append(i)
+            yield Document(page_content=f"Document {i}", metadata={"source": f"d{i}"})
+
+    async def async_documents():
+        for i in range(5, 8):
+            yield Document(page_content=f"Document {i}", metadata={"source": f"d{i}"})
+
+    batch_settings = {**config.vector_store["batch_processing"], "batch_size": 2}
+    with patch.dict(config.vector_store, {"batch_processing": batch_settings}):
+        assert store.add_documents(documents()) == 5
+        assert store.add_documents(async_documents()) == 3
+        with pytest.raises(ValueError):
+            store.add_documents(iter([]))
+
+    assert consumed == [0, 1, 2, 3, 4]
+    assert embeddings.embed_documents.call_count == 5  # 3 + 2 batches
+    metadata = store.get_collection_metadata("default")
+    assert metadata["document_count"] == 8
+    assert metadata["total_chunks"] == 8
+    store.close()
+
+
+def test_add_documents_packs_batches_by_tokens(tmp_path):
+    """Test that batches are packed up to the token budget."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[1.0, 0.5] for _ in texts]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text, **kwargs: text.split()
+    store.token_counter = TokenCounter("text-embedding-3-small", encoding=encoding)
+
+    docs = [
+        Document(page_content=f"word {i} " + "x " * 3, metadata={"source": f"d{i}"})
+        for i in range(4)
+    ]
+    batch_settings = {
+        **config.vector_store["batch_processing"],
+        "max_tokens_per_batch": 10,
+    }
+    with patch.dict(config.vector_store, {"batch_processing": batch_settings}):
+        assert store.add_documents(docs) == 4
+
+    assert [len(c.args[0]) for c in embeddings.embed_documents.call_args_list] == [2, 2]
+    assert store.last_ingest_stats["tokens"] == 20
+    assert store.last_ingest_stats["stored_tokens"] == 20
+    store.close()
+
+
+def test_export_import_collection_roundtrip(tmp_path):
+    """Test that a snapshot restores a collection without embedding calls."""
+    pytest.importorskip("pyarrow")
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0] for t in texts
+    ]
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ), patch.dict(config.vector_store, {"embedding_dimensions": 2}):
+        store = VectorStore(persist_directory=str(tmp_path / "source"))
+        target = VectorStore(persist_directory=str(tmp_path / "target"))
+
+    store.add_documents(
+        [
+            Document(page_content="Chunk one", metadata={"source": "a.md"}),
+            Document(page_content="Chunk two", metadata={"source": "b.md"}),
+        ],
+        collection_name="docs",
+    )
+    manifest = store.export_collection("docs", str(tmp_path / "snapshot"))
+    assert manifest["count"] == 2
+    assert manifest["dimensions"] == 2
+
+    embeddings.embed_documents.reset_mock()
+    assert target.import_collection(str(tmp_path / "snapshot"), "restored") == 2
+
+    embeddings.embed_documents.assert_not_called()
+    with target._use_collection("restored") as collection:
+        records = collection._collection.get(include=["documents", "embeddings"])
+    assert sorted(records["documents"]) == ["Chunk one", "Chunk two"]
+    assert sorted(float(v[0]) for v in records["embeddings"]) == [9.0, 9.0]
+    metadata = target.get_collection_metadata("restored")
+    assert metadata["total_chunks"] == 2
+    assert metadata["document_count"] == 2
+    lexical = target.lexical_search("one", collection_name="restored")
+    assert [doc.page_content for doc, _ in lexical] == ["Chunk one"]
+
+    with pytest.raises(FileExistsError):
+        store.export_collection("docs", str(tmp_path / "snapshot"))
+    store.close()
+    target.close()
+
+
+def test_resumed_ingest_job_skips_stored_sources(tmp_path):
+    """Test that a resumed ingestion job only embeds sources it did not store."""
+    failing = {"Doc b"}
+    embeddings = MagicMock()
+
+    def embed(texts):
+        if failing.intersection(texts):
+            raise RuntimeError("boom")
+        return [[1.0, float(len(t)), 0.5] for t in texts]
+
+    embeddings.embed_documents.side_effect = embed
+    with patch(
+        "rag_retriever.vectorstore.store.VectorStore._get_embeddings",
+        return_value=embeddings,
+    ):
+        store = VectorStore(persist_directory=str(tmp_path))
+    documents = [
+        Document(page_content=f"Doc {source}", metadata={"source": source})
+        for source in "abc"
+    ]
+    journal = store.ingest_journal
+
+    with patch.dict(
+        config.vector_store["batch_processing"],
+        {"batch_size": 1, "max_concurrent_batches": 1, "delay_between_batches": 0},
+    ):
+        with journal.start_job("directory", "docs", "default") as job:
+            assert store.add_documents(documents, job=job) == 2
+
+        assert journal.get_job(job.id)["status"] == "failed"
+        assert journal.get_sources(job.id, "stored") == {"a", "c"}
+        assert [b["state"] for b in journal.get_batches(job.id)] == [
+            "stored",
+            "failed",
+            "stored",
+        ]
+
+        failing.clear()
+        embeddings.embed_documents.reset_mock()
+        with journal.resume_job(job.id) as resumed:
+            assert store.add_documents(documents, job=resumed) == 1
+
+    embeddings.embed_documents.assert_called_once_with(["Doc b"])
+    assert journal.get_job(job.id)["status"] == "completed"
+    assert journal.get_sources(job.id, "stored") == {"a", "b", "c"}
+    with pytest.raises(ValueError, match="already completed"):
+        journal.resume_job(job.id)
+    store.close()